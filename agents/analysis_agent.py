@@ -0,0 +1,349 @@
+import json
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from config.settings import load_settings
+from utils.transcript import count_tokens, chunk_transcript, anchor_chunks
+from utils.chunk_memo import ChunkMemo
+from utils.action_items import merge_action_items
+from utils.clients import get_client_registry
+from utils.cache import StageCache, request_key
+from utils.metrics import bind_current_span
+
+# Structured output schema: the model must answer with exactly these fields
+ANALYSIS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "summary": {"type": "string"},
+        "action_items": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "task": {"type": "string"},
+                    "owner": {"type": "string"},
+                    "deadline": {"type": "string"},
+                    "priority": {"type": "string", "enum": ["High", "Medium", "Low"]},
+                    "context": {"type": "string"}
+                },
+                "required": ["task", "owner", "deadline", "priority", "context"],
+                "additionalProperties": False
+            }
+        }
+    },
+    "required": ["summary", "action_items"],
+    "additionalProperties": False
+}
+
+RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {"name": "meeting_analysis", "strict": True, "schema": ANALYSIS_SCHEMA}
+}
+
+class AnalysisAgent:
+    """
+    Agent that writes the meeting summary and extracts the action items in a
+    single structured-output request, so the transcript is sent (and paid
+    for) once instead of once per agent
+    """
+    
+    def __init__(self, summarizer, cache=None, clients=None, settings=None):
+        """
+        Args:
+            summarizer (SummarizerAgent): Merges per-chunk notes of long transcripts into the final summary
+            cache (StageCache): Stage output cache (disabled when omitted)
+            clients (ClientRegistry): API clients and rate limiter (defaults to the process-wide registry)
+            settings (Settings): Typed configuration (defaults to load_settings())
+        """
+        settings = settings or load_settings()
+        # API clients and the rate limiter are shared process-wide
+        self.clients = clients or get_client_registry()
+        self.mock_mode = settings.mock_mode
+        self.cache = cache or StageCache(enabled=False)
+        self.summarizer = summarizer
+        
+        # Model and generation limits come from agents.analyst (falling back to openai.*)
+        agent_settings = settings.agent("analyst")
+        self.model = agent_settings.model
+        self.max_tokens = agent_settings.max_tokens
+        self.temperature = agent_settings.temperature
+        
+        # Long transcripts are analyzed chunk by chunk; the notes are merged by the
+        # summarizer and the action items de-duplicated locally
+        self.map_reduce_threshold, self.chunk_tokens = settings.input_budget("analysis")
+        self.chunk_max_tokens = settings.map_reduce.chunk_summary_max_tokens
+        self.max_parallel_chunks = settings.map_reduce.max_parallel_chunks
+    
+    def analyze_meeting(self, transcript, memo=None):
+        """
+        Summarize the meeting and extract its action items in one request
+
+        Args:
+            transcript (str): The meeting transcript text
+            memo (ChunkMemo): Map outputs of the previous transcript version; unchanged
+                chunks are taken from it and new ones recorded
+
+        Returns:
+            dict: {"summary": markdown summary, "action_items": list of action items}
+        """
+        if self.mock_mode:
+            return self._get_mock_analysis()
+        
+        try:
+            memo = memo or ChunkMemo(enabled=False)
+            chunks = self._split_transcript(transcript, memo)
+            if len(chunks) > 1:
+                def analyze_chunk(numbered_chunk):
+                    index, chunk = numbered_chunk
+                    messages = self._build_chunk_messages(chunk, index, len(chunks))
+                    return memo.get_or_compute(
+                        "analysis_chunk", chunk,
+                        lambda: self._analyze("analysis_chunk", messages, self._chunk_max_tokens(len(chunks))),
+                        model=self.model, temperature=self.temperature
+                    )
+                
+                with ThreadPoolExecutor(max_workers=max(1, self.max_parallel_chunks)) as executor:
+                    parts = list(executor.map(bind_current_span(analyze_chunk), enumerate(chunks, 1)))
+                return {
+                    "summary": self.summarizer.summarize_notes([part["summary"] for part in parts]),
+                    "action_items": merge_action_items([part["action_items"] for part in parts])
+                }
+            
+            return self._analyze("analysis", self._build_messages(transcript))
+        
+        except Exception as e:
+            raise Exception(f"Failed to analyze meeting: {str(e)}")
+    
+    async def aanalyze_meeting(self, transcript, memo=None):
+        """
+        Async variant of analyze_meeting
+
+        Args:
+            transcript (str): The meeting transcript text
+            memo (ChunkMemo): Map outputs of the previous transcript version; unchanged
+                chunks are taken from it and new ones recorded
+
+        Returns:
+            dict: {"summary": markdown summary, "action_items": list of action items}
+        """
+        if self.mock_mode:
+            return self._get_mock_analysis()
+        
+        try:
+            memo = memo or ChunkMemo(enabled=False)
+            chunks = self._split_transcript(transcript, memo)
+            if len(chunks) > 1:
+                semaphore = asyncio.Semaphore(max(1, self.max_parallel_chunks))
+                
+                async def analyze_chunk(index, chunk):
+                    async with semaphore:
+                        messages = self._build_chunk_messages(chunk, index, len(chunks))
+                        return await memo.aget_or_compute(
+                            "analysis_chunk", chunk,
+                            lambda: self._aanalyze("analysis_chunk", messages, self._chunk_max_tokens(len(chunks))),
+                            model=self.model, temperature=self.temperature
+                        )
+                
+                parts = await asyncio.gather(*(analyze_chunk(index, chunk) for index, chunk in enumerate(chunks, 1)))
+                return {
+                    "summary": await self.summarizer.asummarize_notes([part["summary"] for part in parts]),
+                    "action_items": merge_action_items([part["action_items"] for part in parts])
+                }
+            
+            return await self._aanalyze("analysis", self._build_messages(transcript))
+        
+        except Exception as e:
+            raise Exception(f"Failed to analyze meeting: {str(e)}")
+    
+    def _split_transcript(self, transcript, memo):
+        """
+        Return the transcript as a single chunk, or as speaker-turn chunks when it is too long;
+        a corrected transcript is chunked along the boundaries its previous version used
+        """
+        if count_tokens(transcript) <= self.map_reduce_threshold:
+            chunks = [transcript]
+        else:
+            previous_chunks = memo.previous_chunks("analysis")
+            if previous_chunks:
+                chunks = anchor_chunks(previous_chunks, transcript, self.chunk_tokens)
+            else:
+                chunks = chunk_transcript(transcript, self.chunk_tokens)
+        memo.record_chunks("analysis", chunks)
+        return chunks
+    
+    def _chunk_max_tokens(self, total_chunks):
+        """Completion cap for one chunk: room for its notes plus its share of the action items"""
+        return self.chunk_max_tokens + max(200, self.max_tokens // total_chunks)
+    
+    def _analyze(self, stage, messages, max_tokens=None):
+        """Run one analysis request through the stage cache"""
+        max_tokens = max_tokens or self.max_tokens
+        return self.cache.get_or_compute(
+            stage,
+            request_key(messages, RESPONSE_FORMAT, model=self.model, temperature=self.temperature, max_tokens=max_tokens),
+            lambda: self._request_analysis(messages, max_tokens)
+        )
+    
+    async def _aanalyze(self, stage, messages, max_tokens=None):
+        """Async variant of _analyze"""
+        max_tokens = max_tokens or self.max_tokens
+        return await self.cache.aget_or_compute(
+            stage,
+            request_key(messages, RESPONSE_FORMAT, model=self.model, temperature=self.temperature, max_tokens=max_tokens),
+            lambda: self._arequest_analysis(messages, max_tokens)
+        )
+    
+    def _build_messages(self, transcript):
+        """Build the chat messages for the combined summary and action-item request"""
+        prompt = f"""Analyze the following meeting transcript and produce two things.
+
+        1. "summary": a comprehensive meeting summary in markdown format with the following sections:
+
+        ## Meeting Overview
+        Brief description of the meeting purpose and attendees
+
+        ## Key Discussion Points
+        Main topics that were discussed
+
+        ## Decisions Made
+        Any decisions or agreements reached during the meeting
+
+        ## Next Steps
+        General next steps or follow-up items mentioned
+
+        2. "action_items": every action item, task and commitment, each with:
+        - "task": Clear description of what needs to be done
+        - "owner": Person responsible for the task
+        - "deadline": Deadline or timeframe (use "Not specified" if not mentioned)
+        - "priority": Estimated priority level (High/Medium/Low based on context)
+        - "context": Any additional relevant information or dependencies
+
+        Here's the transcript to analyze:
+
+        {transcript}"""
+        
+        return [
+            {
+                "role": "system",
+                "content": "You are an expert meeting summarizer and project coordinator. Write clear, well-structured "
+                           "markdown summaries and extract precise action items with owners and deadlines."
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ]
+    
+    def _build_chunk_messages(self, chunk, index, total):
+        """Build the map-step messages that take notes and extract action items from one part of a long transcript"""
+        prompt = f"""The following is part {index} of {total} of a long meeting transcript.
+        Considering this part only, produce:
+
+        1. "summary": concise markdown notes covering who spoke and the topics discussed,
+        decisions or agreements reached, and next steps or follow-up items mentioned
+
+        2. "action_items": every action item, task and commitment in this part, each with
+        "task", "owner", "deadline" (use "Not specified" if not mentioned), "priority"
+        (High/Medium/Low) and "context"
+
+        Transcript part {index} of {total}:
+
+        {chunk}"""
+        
+        return [
+            {
+                "role": "system",
+                "content": "You are an expert meeting note-taker and project coordinator. Capture the key points and "
+                           "action items of each transcript part accurately and concisely."
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ]
+    
+    def _request_analysis(self, messages, max_tokens=None):
+        """Send the structured-output request to the OpenAI API"""
+        response = self.clients.create_chat_completion(
+            model=self.model,
+            messages=messages,
+            response_format=RESPONSE_FORMAT,
+            max_tokens=max_tokens or self.max_tokens,
+            temperature=self.temperature
+        )
+        
+        return self._parse_analysis(response.choices[0])
+    
+    async def _arequest_analysis(self, messages, max_tokens=None):
+        """Send the structured-output request to the OpenAI API without blocking the event loop"""
+        response = await self.clients.acreate_chat_completion(
+            model=self.model,
+            messages=messages,
+            response_format=RESPONSE_FORMAT,
+            max_tokens=max_tokens or self.max_tokens,
+            temperature=self.temperature
+        )
+        
+        return self._parse_analysis(response.choices[0])
+    
+    def _parse_analysis(self, choice):
+        """Parse the model's schema-constrained JSON into the summary and action items"""
+        if getattr(choice, "finish_reason", None) == "length":
+            raise ValueError("Response was cut off by max_tokens; raise agents.analyst.max_tokens")
+        if getattr(choice.message, "refusal", None):
+            raise ValueError(f"Model refused the request: {choice.message.refusal}")
+        
+        result = json.loads(choice.message.content)
+        return {
+            "summary": result.get("summary") or "",
+            "action_items": result.get("action_items") or []
+        }
+    
+    def _get_mock_analysis(self):
+        """Return a mock analysis for testing purposes"""
+        return {
+            "summary": """## Meeting Overview
+Sprint planning meeting led by Sarah (Project Manager) with John (Development), Lisa (Design), and Mike (QA).
+
+## Key Discussion Points
+- **API Development Progress**: The user authentication API is 70% complete
+- **Database Schema Issues**: The user profile structure needs design input
+- **Testing Preparation**: Test cases are ready to run once the API lands
+
+## Decisions Made
+- John and Lisa will resolve the database schema issues together
+- The staging environment will be updated by Thursday
+
+## Next Steps
+- Finish the authentication API and begin testing
+- Review progress next Monday""",
+            "action_items": [
+                {
+                    "task": "Complete user authentication API development",
+                    "owner": "John",
+                    "deadline": "Friday",
+                    "priority": "High",
+                    "context": "70% complete, final 30% remaining"
+                },
+                {
+                    "task": "Resolve database schema issues for user profile structure",
+                    "owner": "Lisa",
+                    "deadline": "Wednesday",
+                    "priority": "High",
+                    "context": "Requires collaboration with John on database schema"
+                },
+                {
+                    "task": "Update staging environment for testing",
+                    "owner": "Not specified",
+                    "deadline": "Thursday",
+                    "priority": "Medium",
+                    "context": "Required for Mike to run full test suite"
+                },
+                {
+                    "task": "Begin comprehensive testing of authentication flow",
+                    "owner": "Mike",
+                    "deadline": "After API completion",
+                    "priority": "Medium",
+                    "context": "Test cases already prepared, waiting for API completion"
+                }
+            ]
+        }
@@ -1,17 +1,46 @@
-import os
 import json
-from crewai import Agent
-from openai import OpenAI
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from config.settings import load_settings
+from utils.transcript import count_tokens, chunk_transcript, anchor_chunks
+from utils.chunk_memo import ChunkMemo
+from utils.action_items import merge_action_items
+from utils.clients import get_client_registry
+from utils.cache import StageCache, request_key
+from utils.metrics import bind_current_span
 
 class ExtractorAgent:
     """Agent responsible for extracting action items from meeting transcripts"""
     
-    def __init__(self):
-        self.openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-        self.mock_mode = os.getenv("MOCK_MODE", "false").lower() == "true"
+    def __init__(self, cache=None, clients=None, settings=None):
+        """
+        Args:
+            cache (StageCache): Stage output cache (disabled when omitted)
+            clients (ClientRegistry): API clients and rate limiter (defaults to the process-wide registry)
+            settings (Settings): Typed configuration (defaults to load_settings())
+        """
+        settings = settings or load_settings()
+        # API clients and the rate limiter are shared process-wide
+        self.clients = clients or get_client_registry()
+        self.mock_mode = settings.mock_mode
+        self.cache = cache or StageCache(enabled=False)
+        
+        # Model and generation limits come from agents.extractor (falling back to openai.*)
+        agent_settings = settings.agent("extractor")
+        self.model = agent_settings.model
+        self.max_tokens = agent_settings.max_tokens
+        self.temperature = agent_settings.temperature
+        
+        # Long transcripts are mined chunk by chunk (map) and the per-chunk lists
+        # merged and de-duplicated locally (reduce)
+        self.map_reduce_threshold, self.chunk_tokens = settings.input_budget("action_items")
+        self.max_parallel_chunks = settings.map_reduce.max_parallel_chunks
         
     def create_agent(self):
         """Create and return the extractor agent"""
+        # crewai is heavy to import and only needed for the CrewAI task flow
+        from crewai import Agent
+        
         return Agent(
             role="Action Item Extractor",
             goal="Identify and extract specific action items, tasks, and deliverables with clear ownership and deadlines",
@@ -23,12 +52,48 @@ class ExtractorAgent:
             allow_delegation=False
         )
     
-    def extract_action_items(self, transcript):
+    def extract_action_items(self, transcript, memo=None):
         """
         Extract action items from meeting transcript
         
         Args:
             transcript (str): The meeting transcript text
+            memo (ChunkMemo): Map outputs of the previous transcript version; unchanged
+                chunks are taken from it and new ones recorded
+            
+        Returns:
+            list: List of action items with task, owner, and deadline
+        """
+        if self.mock_mode:
+            return self._get_mock_action_items()
+        
+        try:
+            memo = memo or ChunkMemo(enabled=False)
+            chunks = self._split_transcript(transcript, memo)
+            if len(chunks) > 1:
+                def extract_chunk(chunk):
+                    return memo.get_or_compute(
+                        "action_items_chunk", chunk, lambda: self._extract("action_items_chunk", chunk),
+                        model=self.model, temperature=self.temperature
+                    )
+                
+                with ThreadPoolExecutor(max_workers=max(1, self.max_parallel_chunks)) as executor:
+                    item_lists = list(executor.map(bind_current_span(extract_chunk), chunks))
+                return merge_action_items(item_lists)
+            
+            return self._extract("action_items", transcript)
+            
+        except Exception as e:
+            raise Exception(f"Failed to extract action items: {str(e)}")
+    
+    async def aextract_action_items(self, transcript, memo=None):
+        """
+        Async variant of extract_action_items
+        
+        Args:
+            transcript (str): The meeting transcript text
+            memo (ChunkMemo): Map outputs of the previous transcript version; unchanged
+                chunks are taken from it and new ones recorded
             
         Returns:
             list: List of action items with task, owner, and deadline
@@ -37,58 +102,129 @@ class ExtractorAgent:
             return self._get_mock_action_items()
         
         try:
-            # the newest OpenAI model is "gpt-4o" which was released May 13, 2024.
-            # do not change this unless explicitly requested by the user
-            prompt = f"""Analyze the following meeting transcript and extract all action items, 
-            tasks, and commitments. For each action item, identify:
+            memo = memo or ChunkMemo(enabled=False)
+            chunks = self._split_transcript(transcript, memo)
+            if len(chunks) > 1:
+                semaphore = asyncio.Semaphore(max(1, self.max_parallel_chunks))
+                
+                async def extract_chunk(chunk):
+                    async with semaphore:
+                        return await memo.aget_or_compute(
+                            "action_items_chunk", chunk, lambda: self._aextract("action_items_chunk", chunk),
+                            model=self.model, temperature=self.temperature
+                        )
+                
+                item_lists = await asyncio.gather(*(extract_chunk(chunk) for chunk in chunks))
+                return merge_action_items(item_lists)
+            
+            return await self._aextract("action_items", transcript)
+            
+        except Exception as e:
+            raise Exception(f"Failed to extract action items: {str(e)}")
+    
+    def _split_transcript(self, transcript, memo):
+        """
+        Return the transcript as a single chunk, or as speaker-turn chunks when it is too long;
+        a corrected transcript is chunked along the boundaries its previous version used
+        """
+        if count_tokens(transcript) <= self.map_reduce_threshold:
+            chunks = [transcript]
+        else:
+            previous_chunks = memo.previous_chunks("action_items")
+            if previous_chunks:
+                chunks = anchor_chunks(previous_chunks, transcript, self.chunk_tokens)
+            else:
+                chunks = chunk_transcript(transcript, self.chunk_tokens)
+        memo.record_chunks("action_items", chunks)
+        return chunks
+    
+    def _extract(self, stage, transcript):
+        """Run one extraction request through the stage cache"""
+        messages = self._build_messages(transcript)
+        return self.cache.get_or_compute(
+            stage,
+            request_key(messages, model=self.model, temperature=self.temperature, max_tokens=self.max_tokens),
+            lambda: self._request_action_items(messages)
+        )
+    
+    async def _aextract(self, stage, transcript):
+        """Async variant of _extract"""
+        messages = self._build_messages(transcript)
+        return await self.cache.aget_or_compute(
+            stage,
+            request_key(messages, model=self.model, temperature=self.temperature, max_tokens=self.max_tokens),
+            lambda: self._arequest_action_items(messages)
+        )
+    
+    def _build_messages(self, transcript):
+        """Build the chat messages for the extraction request"""
+        prompt = f"""Analyze the following meeting transcript and extract all action items, 
+        tasks, and commitments. For each action item, identify:
 
-            1. The specific task or action to be completed
-            2. The person responsible (owner)
-            3. The deadline or timeframe (if mentioned)
-            4. Any additional context or dependencies
+        1. The specific task or action to be completed
+        2. The person responsible (owner)
+        3. The deadline or timeframe (if mentioned)
+        4. Any additional context or dependencies
 
-            Format your response as a JSON array where each action item is an object with these fields:
-            - "task": Clear description of what needs to be done
-            - "owner": Person responsible for the task
-            - "deadline": Deadline or timeframe (use "Not specified" if not mentioned)
-            - "priority": Estimated priority level (High/Medium/Low based on context)
-            - "context": Any additional relevant information or dependencies
+        Format your response as a JSON array where each action item is an object with these fields:
+        - "task": Clear description of what needs to be done
+        - "owner": Person responsible for the task
+        - "deadline": Deadline or timeframe (use "Not specified" if not mentioned)
+        - "priority": Estimated priority level (High/Medium/Low based on context)
+        - "context": Any additional relevant information or dependencies
 
-            Here's the transcript to analyze:
+        Here's the transcript to analyze:
 
-            {transcript}
+        {transcript}
 
-            Respond with only valid JSON format."""
+        Respond with only valid JSON format."""
 
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert at extracting action items from meeting transcripts. Respond only with valid JSON format."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                response_format={"type": "json_object"},
-                max_tokens=800,
-                temperature=0.1
-            )
-            
-            result = json.loads(response.choices[0].message.content)
-            
-            # Ensure the result is a list of action items
-            if isinstance(result, dict) and "action_items" in result:
-                return result["action_items"]
-            elif isinstance(result, list):
-                return result
-            else:
-                return []
-            
-        except Exception as e:
-            raise Exception(f"Failed to extract action items: {str(e)}")
+        return [
+            {
+                "role": "system",
+                "content": "You are an expert at extracting action items from meeting transcripts. Respond only with valid JSON format."
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ]
+    
+    def _request_action_items(self, messages):
+        """Send the extraction request to the OpenAI API"""
+        response = self.clients.create_chat_completion(
+            model=self.model,
+            messages=messages,
+            response_format={"type": "json_object"},
+            max_tokens=self.max_tokens,
+            temperature=self.temperature
+        )
+        
+        return self._parse_action_items(response.choices[0].message.content)
+    
+    async def _arequest_action_items(self, messages):
+        """Send the extraction request to the OpenAI API without blocking the event loop"""
+        response = await self.clients.acreate_chat_completion(
+            model=self.model,
+            messages=messages,
+            response_format={"type": "json_object"},
+            max_tokens=self.max_tokens,
+            temperature=self.temperature
+        )
+        
+        return self._parse_action_items(response.choices[0].message.content)
+    
+    def _parse_action_items(self, content):
+        """Parse the model's JSON response into a list of action items"""
+        result = json.loads(content)
+        
+        # Ensure the result is a list of action items
+        if isinstance(result, dict) and "action_items" in result:
+            return result["action_items"]
+        elif isinstance(result, list):
+            return result
+        else:
+            return []
     
     def _get_mock_action_items(self):
         """Return mock action items for testing purposes"""
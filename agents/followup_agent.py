@@ -1,18 +1,45 @@
-import os
-import json
-from crewai import Agent
-from openai import OpenAI
+from config.settings import load_settings
+from utils.clients import get_client_registry
+from utils.cache import StageCache, request_key
+from utils.followup_templates import FollowupRenderer
 from datetime import datetime
 
 class FollowupAgent:
     """Agent responsible for creating follow-up messages and communications"""
     
-    def __init__(self):
-        self.openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-        self.mock_mode = os.getenv("MOCK_MODE", "false").lower() == "true"
+    def __init__(self, cache=None, clients=None, settings=None):
+        """
+        Args:
+            cache (StageCache): Stage output cache (disabled when omitted)
+            clients (ClientRegistry): API clients and rate limiter (defaults to the process-wide registry)
+            settings (Settings): Typed configuration (defaults to load_settings())
+        """
+        settings = settings or load_settings()
+        # API clients and the rate limiter are shared process-wide
+        self.clients = clients or get_client_registry()
+        self.mock_mode = settings.mock_mode
+        self.cache = cache or StageCache(enabled=False)
+        
+        # Model and generation limits come from agents.followup (falling back to openai.*)
+        agent_settings = settings.agent("followup")
+        self.model = agent_settings.model
+        self.max_tokens = agent_settings.max_tokens
+        self.temperature = agent_settings.temperature
+        
+        # The email is rendered locally from a template unless followup.mode is "llm"
+        self.mode = settings.followup.mode
+        self.renderer = FollowupRenderer(
+            templates_dir=settings.followup.templates_dir,
+            team=settings.followup.team,
+            sender=settings.followup.sender,
+            recipients=settings.followup.recipients
+        )
         
     def create_agent(self):
         """Create and return the follow-up agent"""
+        # crewai is heavy to import and only needed for the CrewAI task flow
+        from crewai import Agent
+        
         return Agent(
             role="Follow-up Coordinator",
             goal="Create professional follow-up communications that clearly outline meeting outcomes and next steps",
@@ -24,7 +51,7 @@ class FollowupAgent:
             allow_delegation=False
         )
     
-    def create_followup_message(self, summary, action_items, attendees=None):
+    def create_followup_message(self, summary, action_items, attendees=None, stream=None, title=None):
         """
         Create a follow-up message based on meeting summary and action items
         
@@ -32,56 +59,153 @@ class FollowupAgent:
             summary (str): Meeting summary
             action_items (list): List of action items
             attendees (list): List of meeting attendees (optional)
+            stream (TokenStream): Optional sink for the message tokens as they are generated
+            title (str): Meeting name used in the template subject (optional)
             
         Returns:
             str: Professional follow-up message
         """
+        if self.mode == "template":
+            return self._render(summary, action_items, stream, title)
+        
         if self.mock_mode:
-            return self._get_mock_followup_message()
+            message = self._get_mock_followup_message()
+            if stream:
+                stream.replay(message)
+            return message
         
         try:
-            # Prepare action items text
-            action_items_text = self._format_action_items(action_items)
-            
-            # the newest OpenAI model is "gpt-4o" which was released May 13, 2024.
-            # do not change this unless explicitly requested by the user
-            prompt = f"""Create a professional follow-up email based on the meeting summary and action items below. 
-            The email should be well-structured, clear, and actionable. Include:
-
-            1. A brief greeting and meeting reference
-            2. Key meeting highlights
-            3. Clearly formatted action items with owners and deadlines
-            4. Professional closing
-
-            Meeting Summary:
-            {summary}
-
-            Action Items:
-            {action_items_text}
-
-            Format the email professionally with proper structure and clear sections."""
-
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a professional executive assistant creating follow-up communications. Write clear, actionable, and well-structured emails."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                max_tokens=1000,
-                temperature=0.3
+            messages = self._build_messages(summary, action_items)
+            return self.cache.get_or_compute(
+                "followup_message",
+                request_key(messages, model=self.model, temperature=self.temperature, max_tokens=self.max_tokens),
+                lambda: self._request_followup(messages, stream),
+                on_hit=stream.replay if stream else None
             )
             
-            return response.choices[0].message.content
+        except Exception as e:
+            raise Exception(f"Failed to create follow-up message: {str(e)}")
+    
+    async def acreate_followup_message(self, summary, action_items, attendees=None, stream=None, title=None):
+        """
+        Async variant of create_followup_message
+        
+        Args:
+            summary (str): Meeting summary
+            action_items (list): List of action items
+            attendees (list): List of meeting attendees (optional)
+            stream (TokenStream): Optional sink for the message tokens as they are generated
+            title (str): Meeting name used in the template subject (optional)
+            
+        Returns:
+            str: Professional follow-up message
+        """
+        if self.mode == "template":
+            # Rendering takes milliseconds, so it runs inline on the event loop
+            return self._render(summary, action_items, stream, title)
+        
+        if self.mock_mode:
+            message = self._get_mock_followup_message()
+            if stream:
+                stream.replay(message)
+            return message
+        
+        try:
+            messages = self._build_messages(summary, action_items)
+            return await self.cache.aget_or_compute(
+                "followup_message",
+                request_key(messages, model=self.model, temperature=self.temperature, max_tokens=self.max_tokens),
+                lambda: self._arequest_followup(messages, stream),
+                on_hit=stream.replay if stream else None
+            )
             
         except Exception as e:
             raise Exception(f"Failed to create follow-up message: {str(e)}")
     
+    def _render(self, summary, action_items, stream=None, title=None):
+        """Build the follow-up from the summary sections and action items without an API call"""
+        extra = {"title": title} if title else {}
+        try:
+            message = self.renderer.render(summary, action_items, self._format_action_items(action_items), **extra)
+        except Exception as e:
+            raise Exception(f"Failed to render follow-up message: {str(e)}")
+        
+        if stream:
+            stream.replay(message)
+        return message
+    
+    def _build_messages(self, summary, action_items):
+        """Build the chat messages for the follow-up request"""
+        # Prepare action items text
+        action_items_text = self._format_action_items(action_items)
+        
+        prompt = f"""Create a professional follow-up email based on the meeting summary and action items below. 
+        The email should be well-structured, clear, and actionable. Include:
+
+        1. A brief greeting and meeting reference
+        2. Key meeting highlights
+        3. Clearly formatted action items with owners and deadlines
+        4. Professional closing
+
+        Meeting Summary:
+        {summary}
+
+        Action Items:
+        {action_items_text}
+
+        Format the email professionally with proper structure and clear sections."""
+
+        return [
+            {
+                "role": "system",
+                "content": "You are a professional executive assistant creating follow-up communications. Write clear, actionable, and well-structured emails."
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ]
+    
+    def _request_followup(self, messages, stream=None):
+        """Send the follow-up request to the OpenAI API, streaming tokens when a stream is given"""
+        if stream:
+            return self.clients.stream_chat_completion(
+                stream,
+                model=self.model,
+                messages=messages,
+                max_tokens=self.max_tokens,
+                temperature=self.temperature
+            )
+        
+        response = self.clients.create_chat_completion(
+            model=self.model,
+            messages=messages,
+            max_tokens=self.max_tokens,
+            temperature=self.temperature
+        )
+        
+        return response.choices[0].message.content
+    
+    async def _arequest_followup(self, messages, stream=None):
+        """Send the follow-up request to the OpenAI API without blocking the event loop"""
+        if stream:
+            return await self.clients.astream_chat_completion(
+                stream,
+                model=self.model,
+                messages=messages,
+                max_tokens=self.max_tokens,
+                temperature=self.temperature
+            )
+        
+        response = await self.clients.acreate_chat_completion(
+            model=self.model,
+            messages=messages,
+            max_tokens=self.max_tokens,
+            temperature=self.temperature
+        )
+        
+        return response.choices[0].message.content
+    
     def _format_action_items(self, action_items):
         """Format action items for inclusion in follow-up message"""
         if not action_items:
@@ -1,17 +1,45 @@
-import os
-import json
-from crewai import Agent
-from openai import OpenAI
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from config.settings import load_settings
+from utils.transcript import count_tokens, chunk_transcript, anchor_chunks
+from utils.chunk_memo import ChunkMemo
+from utils.clients import get_client_registry
+from utils.cache import StageCache, request_key
+from utils.metrics import bind_current_span
 
 class SummarizerAgent:
     """Agent responsible for creating concise summaries of meeting transcriptions"""
     
-    def __init__(self):
-        self.openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-        self.mock_mode = os.getenv("MOCK_MODE", "false").lower() == "true"
+    def __init__(self, cache=None, clients=None, settings=None):
+        """
+        Args:
+            cache (StageCache): Stage output cache (disabled when omitted)
+            clients (ClientRegistry): API clients and rate limiter (defaults to the process-wide registry)
+            settings (Settings): Typed configuration (defaults to load_settings())
+        """
+        settings = settings or load_settings()
+        # API clients and the rate limiter are shared process-wide
+        self.clients = clients or get_client_registry()
+        self.mock_mode = settings.mock_mode
+        self.cache = cache or StageCache(enabled=False)
+        
+        # Model and generation limits come from agents.summarizer (falling back to openai.*)
+        agent_settings = settings.agent("summarizer")
+        self.model = agent_settings.model
+        self.max_tokens = agent_settings.max_tokens
+        self.temperature = agent_settings.temperature
+        
+        # Transcripts over the threshold are summarized chunk by chunk (map) and
+        # the partial notes merged into one summary (reduce)
+        self.map_reduce_threshold, self.chunk_tokens = settings.input_budget("summary")
+        self.chunk_max_tokens = settings.map_reduce.chunk_summary_max_tokens
+        self.max_parallel_chunks = settings.map_reduce.max_parallel_chunks
         
     def create_agent(self):
         """Create and return the summarizer agent"""
+        # crewai is heavy to import and only needed for the CrewAI task flow
+        from crewai import Agent
+        
         return Agent(
             role="Meeting Summarizer",
             goal="Create clear, concise summaries of meeting discussions that capture key points and decisions",
@@ -23,63 +51,344 @@ class SummarizerAgent:
             allow_delegation=False
         )
     
-    def summarize_meeting(self, transcript):
+    def summarize_meeting(self, transcript, stream=None, memo=None):
         """
         Generate a summary of the meeting transcript
         
         Args:
             transcript (str): The meeting transcript text
+            stream (TokenStream): Optional sink for the summary tokens as they are generated
+            memo (ChunkMemo): Map outputs of the previous transcript version; unchanged
+                chunks are taken from it and new ones recorded
+            
+        Returns:
+            str: Meeting summary in markdown format
+        """
+        if self.mock_mode:
+            return self._replay(self._get_mock_summary(), stream)
+        
+        try:
+            memo = memo or ChunkMemo(enabled=False)
+            chunks = self._split_transcript(transcript, memo)
+            if len(chunks) > 1:
+                return self._summarize_chunks(chunks, stream, memo)
+            
+            return self._complete("summary", self._build_messages(transcript), stream=stream)
+            
+        except Exception as e:
+            raise Exception(f"Failed to generate meeting summary: {str(e)}")
+    
+    async def asummarize_meeting(self, transcript, stream=None, memo=None):
+        """
+        Async variant of summarize_meeting
+        
+        Args:
+            transcript (str): The meeting transcript text
+            stream (TokenStream): Optional sink for the summary tokens as they are generated
+            memo (ChunkMemo): Map outputs of the previous transcript version; unchanged
+                chunks are taken from it and new ones recorded
+            
+        Returns:
+            str: Meeting summary in markdown format
+        """
+        if self.mock_mode:
+            return self._replay(self._get_mock_summary(), stream)
+        
+        try:
+            memo = memo or ChunkMemo(enabled=False)
+            chunks = self._split_transcript(transcript, memo)
+            if len(chunks) > 1:
+                return await self._asummarize_chunks(chunks, stream, memo)
+            
+            return await self._acomplete("summary", self._build_messages(transcript), stream=stream)
+            
+        except Exception as e:
+            raise Exception(f"Failed to generate meeting summary: {str(e)}")
+    
+    def summarize_notes(self, notes, stream=None):
+        """
+        Merge notes taken on consecutive parts of one meeting into the final summary
+        
+        Args:
+            notes (list): Markdown notes, one per transcript part, in order
+            stream (TokenStream): Optional sink for the summary tokens as they are generated
             
         Returns:
             str: Meeting summary in markdown format
         """
+        if self.mock_mode:
+            return self._replay(self._get_mock_summary(), stream)
+        
+        return self._complete("summary", self._build_reduce_messages(notes), stream=stream)
+    
+    async def asummarize_notes(self, notes, stream=None):
+        """Async variant of summarize_notes"""
+        if self.mock_mode:
+            return self._replay(self._get_mock_summary(), stream)
+        
+        return await self._acomplete("summary", self._build_reduce_messages(notes), stream=stream)
+    
+    def update_summary(self, current_summary, new_transcript):
+        """
+        Fold a new transcript excerpt into a running summary (used by live meetings)
+        
+        Args:
+            current_summary (str): Summary so far (empty for the first excerpt)
+            new_transcript (str): Transcript text not yet reflected in the summary
+            
+        Returns:
+            str: Updated meeting summary in markdown format
+        """
         if self.mock_mode:
             return self._get_mock_summary()
         
         try:
-            # the newest OpenAI model is "gpt-4o" which was released May 13, 2024.
-            # do not change this unless explicitly requested by the user
-            prompt = f"""Please create a comprehensive meeting summary from the following transcript. 
-            Structure your response in markdown format with the following sections:
+            return self._complete("summary_update", self._build_update_messages(current_summary, new_transcript))
+            
+        except Exception as e:
+            raise Exception(f"Failed to update meeting summary: {str(e)}")
+    
+    def _split_transcript(self, transcript, memo):
+        """
+        Return the transcript as a single chunk, or as speaker-turn chunks when it is too long;
+        a corrected transcript is chunked along the boundaries its previous version used
+        """
+        if count_tokens(transcript) <= self.map_reduce_threshold:
+            chunks = [transcript]
+        else:
+            previous_chunks = memo.previous_chunks("summary")
+            if previous_chunks:
+                chunks = anchor_chunks(previous_chunks, transcript, self.chunk_tokens)
+            else:
+                chunks = chunk_transcript(transcript, self.chunk_tokens)
+        memo.record_chunks("summary", chunks)
+        return chunks
+    
+    def _summarize_chunks(self, chunks, stream, memo):
+        """Summarize each chunk in parallel, then merge the partial notes (only the merge is streamed)"""
+        def summarize_chunk(numbered_chunk):
+            index, chunk = numbered_chunk
+            messages = self._build_chunk_messages(chunk, index, len(chunks))
+            return memo.get_or_compute(
+                "summary_chunk", chunk, lambda: self._complete("summary_chunk", messages, self.chunk_max_tokens),
+                model=self.model, temperature=self.temperature
+            )
+        
+        with ThreadPoolExecutor(max_workers=max(1, self.max_parallel_chunks)) as executor:
+            notes = list(executor.map(bind_current_span(summarize_chunk), enumerate(chunks, 1)))
+        
+        return self.summarize_notes(notes, stream)
+    
+    async def _asummarize_chunks(self, chunks, stream, memo):
+        """Async variant of _summarize_chunks"""
+        semaphore = asyncio.Semaphore(max(1, self.max_parallel_chunks))
+        
+        async def summarize_chunk(index, chunk):
+            async with semaphore:
+                messages = self._build_chunk_messages(chunk, index, len(chunks))
+                return await memo.aget_or_compute(
+                    "summary_chunk", chunk, lambda: self._acomplete("summary_chunk", messages, self.chunk_max_tokens),
+                    model=self.model, temperature=self.temperature
+                )
+        
+        notes = await asyncio.gather(*(summarize_chunk(index, chunk) for index, chunk in enumerate(chunks, 1)))
+        
+        return await self.asummarize_notes(notes, stream)
+    
+    def _complete(self, stage, messages, max_tokens=None, stream=None):
+        """Run a summary request through the stage cache, replaying cached text into the stream"""
+        max_tokens = max_tokens or self.max_tokens
+        return self.cache.get_or_compute(
+            stage,
+            request_key(messages, model=self.model, temperature=self.temperature, max_tokens=max_tokens),
+            lambda: self._request_summary(messages, max_tokens, stream),
+            on_hit=stream.replay if stream else None
+        )
+    
+    async def _acomplete(self, stage, messages, max_tokens=None, stream=None):
+        """Async variant of _complete"""
+        max_tokens = max_tokens or self.max_tokens
+        return await self.cache.aget_or_compute(
+            stage,
+            request_key(messages, model=self.model, temperature=self.temperature, max_tokens=max_tokens),
+            lambda: self._arequest_summary(messages, max_tokens, stream),
+            on_hit=stream.replay if stream else None
+        )
+    
+    def _replay(self, text, stream):
+        """Push a complete text into the stream, if any, and return it"""
+        if stream:
+            stream.replay(text)
+        return text
+    
+    def _build_messages(self, transcript):
+        """Build the chat messages for the summary request"""
+        prompt = f"""Please create a comprehensive meeting summary from the following transcript. 
+        Structure your response in markdown format with the following sections:
 
-            ## Meeting Overview
-            Brief description of the meeting purpose and attendees
+        ## Meeting Overview
+        Brief description of the meeting purpose and attendees
 
-            ## Key Discussion Points
-            Main topics that were discussed
+        ## Key Discussion Points
+        Main topics that were discussed
 
-            ## Decisions Made
-            Any decisions or agreements reached during the meeting
+        ## Decisions Made
+        Any decisions or agreements reached during the meeting
 
-            ## Next Steps
-            General next steps or follow-up items mentioned
+        ## Next Steps
+        General next steps or follow-up items mentioned
 
-            Here's the transcript to summarize:
+        Here's the transcript to summarize:
 
-            {transcript}
-            
-            Please provide a clear, professional summary that captures the essence of the meeting."""
-
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert meeting summarizer. Create clear, well-structured summaries in markdown format."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                max_tokens=1000,
-                temperature=0.3
+        {transcript}
+        
+        Please provide a clear, professional summary that captures the essence of the meeting."""
+
+        return [
+            {
+                "role": "system",
+                "content": "You are an expert meeting summarizer. Create clear, well-structured summaries in markdown format."
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ]
+    
+    def _build_chunk_messages(self, chunk, index, total):
+        """Build the map-step messages that take notes on one part of a long transcript"""
+        prompt = f"""The following is part {index} of {total} of a long meeting transcript. 
+        Write concise markdown notes on this part only, covering:
+
+        - Who spoke and the topics discussed
+        - Decisions or agreements reached
+        - Next steps or follow-up items mentioned
+
+        Transcript part {index} of {total}:
+
+        {chunk}"""
+
+        return [
+            {
+                "role": "system",
+                "content": "You are an expert meeting note-taker. Capture the key points of each transcript part accurately and concisely."
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ]
+    
+    def _build_update_messages(self, current_summary, new_transcript):
+        """Build the messages that fold a new excerpt of a meeting in progress into its summary"""
+        prompt = f"""You are keeping a running summary of a meeting that is still in progress. 
+        Update the current summary with the new transcript excerpt below, keeping it in 
+        markdown format with the following sections:
+
+        ## Meeting Overview
+        ## Key Discussion Points
+        ## Decisions Made
+        ## Next Steps
+
+        Current summary (empty if the meeting just started):
+
+        {current_summary or "(none yet)"}
+
+        New transcript excerpt:
+
+        {new_transcript}
+        
+        Respond with the complete updated summary only."""
+
+        return [
+            {
+                "role": "system",
+                "content": "You are an expert meeting summarizer. Create clear, well-structured summaries in markdown format."
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ]
+    
+    def _build_reduce_messages(self, notes):
+        """Build the reduce-step messages that merge per-part notes into the final summary"""
+        combined_notes = "\n\n".join(
+            f"### Part {index}\n{part_notes}" for index, part_notes in enumerate(notes, 1)
+        )
+        
+        prompt = f"""Please create a comprehensive meeting summary from the following notes, 
+        which were taken on consecutive parts of one meeting. Merge overlapping points and 
+        structure your response in markdown format with the following sections:
+
+        ## Meeting Overview
+        Brief description of the meeting purpose and attendees
+
+        ## Key Discussion Points
+        Main topics that were discussed
+
+        ## Decisions Made
+        Any decisions or agreements reached during the meeting
+
+        ## Next Steps
+        General next steps or follow-up items mentioned
+
+        Here are the notes to summarize:
+
+        {combined_notes}
+        
+        Please provide a clear, professional summary that captures the essence of the meeting."""
+
+        return [
+            {
+                "role": "system",
+                "content": "You are an expert meeting summarizer. Create clear, well-structured summaries in markdown format."
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ]
+    
+    def _request_summary(self, messages, max_tokens=None, stream=None):
+        """Send the summary request to the OpenAI API, streaming tokens when a stream is given"""
+        if stream:
+            return self.clients.stream_chat_completion(
+                stream,
+                model=self.model,
+                messages=messages,
+                max_tokens=max_tokens or self.max_tokens,
+                temperature=self.temperature
             )
-            
-            return response.choices[0].message.content
-            
-        except Exception as e:
-            raise Exception(f"Failed to generate meeting summary: {str(e)}")
+        
+        response = self.clients.create_chat_completion(
+            model=self.model,
+            messages=messages,
+            max_tokens=max_tokens or self.max_tokens,
+            temperature=self.temperature
+        )
+        
+        return response.choices[0].message.content
+    
+    async def _arequest_summary(self, messages, max_tokens=None, stream=None):
+        """Send the summary request to the OpenAI API without blocking the event loop"""
+        if stream:
+            return await self.clients.astream_chat_completion(
+                stream,
+                model=self.model,
+                messages=messages,
+                max_tokens=max_tokens or self.max_tokens,
+                temperature=self.temperature
+            )
+        
+        response = await self.clients.acreate_chat_completion(
+            model=self.model,
+            messages=messages,
+            max_tokens=max_tokens or self.max_tokens,
+            temperature=self.temperature
+        )
+        
+        return response.choices[0].message.content
     
     def _get_mock_summary(self):
         """Return mock summary for testing purposes"""
@@ -1,16 +1,49 @@
 import os
-from crewai import Agent
-from openai import OpenAI
+import shutil
+import asyncio
+import tempfile
+from dataclasses import asdict
+from concurrent.futures import ThreadPoolExecutor
+from config.settings import load_settings
+from utils.audio import audio_duration, probe_duration, split_audio
+from utils.preprocess import preprocess_audio
+from utils.segments import SegmentStore, stitch_segments
+from utils.clients import get_client_registry
+from utils.cache import StageCache, file_hash, request_key
+from utils.metrics import current_span, bind_current_span
 
 class TranscriberAgent:
     """Agent responsible for transcribing audio files to text using OpenAI Whisper API"""
     
-    def __init__(self):
-        self.openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-        self.mock_mode = os.getenv("MOCK_MODE", "false").lower() == "true"
+    def __init__(self, cache=None, clients=None, settings=None):
+        """
+        Args:
+            cache (StageCache): Stage output cache (disabled when omitted)
+            clients (ClientRegistry): API clients and rate limiter (defaults to the process-wide registry)
+            settings (Settings): Typed configuration (defaults to load_settings())
+        """
+        settings = settings or load_settings()
+        # API clients and the rate limiter are shared process-wide
+        self.clients = clients or get_client_registry()
+        self.mock_mode = settings.mock_mode
+        self.cache = cache or StageCache(enabled=False)
+        self.model = settings.agent("transcriber").model
         
+        # Recordings over the upload limit (or longer than one chunk) are split and
+        # transcribed concurrently
+        self.max_file_size_mb = settings.file_processing.max_file_size_mb
+        self.chunk_seconds = settings.file_processing.chunk_duration_seconds
+        self.overlap_seconds = settings.file_processing.chunk_overlap_seconds
+        self.max_concurrent_chunks = settings.file_processing.max_concurrent_chunks
+        
+        # Silence trimming, downmix and resampling before upload
+        self.preprocessing = settings.preprocessing
+    
     def create_agent(self):
         """Create and return the transcriber agent"""
+        # crewai is heavy to import and only needed for the CrewAI task flow
+        from crewai import Agent
+        
         return Agent(
             role="Meeting Transcriber",
             goal="Accurately transcribe audio recordings of meetings into clear, readable text",
@@ -32,24 +65,231 @@ class TranscriberAgent:
         Returns:
             str: Transcribed text
         """
+        return self.transcribe_segments(audio_file_path).text
+    
+    async def atranscribe_audio(self, audio_file_path):
+        """
+        Async variant of transcribe_audio
+        
+        Args:
+            audio_file_path (str): Path to the audio file
+            
+        Returns:
+            str: Transcribed text
+        """
+        return (await self.atranscribe_segments(audio_file_path)).text
+    
+    def transcribe_segments(self, audio_file_path):
+        """
+        Transcribe audio file to timestamped segments
+        
+        Args:
+            audio_file_path (str): Path to the audio file
+            
+        Returns:
+            SegmentStore: Whisper segments, timed against the original recording
+        """
         if self.mock_mode:
-            return self._get_mock_transcription()
+            return SegmentStore.from_text(self._get_mock_transcription())
         
         try:
             # Check if file exists
             if not os.path.exists(audio_file_path):
                 raise FileNotFoundError(f"Audio file not found: {audio_file_path}")
             
-            with open(audio_file_path, "rb") as audio_file:
-                response = self.openai_client.audio.transcriptions.create(
-                    model="whisper-1",
-                    file=audio_file,
-                    response_format="text"
-                )
-            return response
+            # Transcripts are cached by the recording's content, not its path
+            return SegmentStore.from_dict(self.cache.get_or_compute(
+                "transcript",
+                self._cache_key(file_hash(audio_file_path)),
+                lambda: self._transcribe(audio_file_path).to_dict()
+            ))
         except Exception as e:
             raise Exception(f"Failed to transcribe audio: {str(e)}")
     
+    async def atranscribe_segments(self, audio_file_path):
+        """
+        Async variant of transcribe_segments
+        
+        Args:
+            audio_file_path (str): Path to the audio file
+            
+        Returns:
+            SegmentStore: Whisper segments, timed against the original recording
+        """
+        if self.mock_mode:
+            return SegmentStore.from_text(self._get_mock_transcription())
+        
+        try:
+            # Check if file exists
+            if not os.path.exists(audio_file_path):
+                raise FileNotFoundError(f"Audio file not found: {audio_file_path}")
+            
+            async def transcribe():
+                return (await self._atranscribe(audio_file_path)).to_dict()
+            
+            content_hash = await asyncio.to_thread(file_hash, audio_file_path)
+            return SegmentStore.from_dict(await self.cache.aget_or_compute(
+                "transcript",
+                self._cache_key(content_hash),
+                transcribe
+            ))
+        except Exception as e:
+            raise Exception(f"Failed to transcribe audio: {str(e)}")
+    
+    def _cache_key(self, content_hash):
+        """Transcript cache key: the recording's content plus every setting that changes its segments"""
+        return request_key(
+            content_hash,
+            model=self.model,
+            response_format="verbose_json",
+            preprocessing=asdict(self.preprocessing),
+            max_file_size_mb=self.max_file_size_mb,
+            chunk_seconds=self.chunk_seconds,
+            overlap_seconds=self.overlap_seconds
+        )
+    
+    def _transcribe(self, audio_file_path):
+        """Transcribe a recording, pre-processing it and splitting it first when it is too large or long"""
+        with tempfile.TemporaryDirectory(prefix="meeting_audio_") as work_dir:
+            upload_path, offset_map = self._preprocess(audio_file_path, work_dir)
+            if self._needs_chunking(upload_path):
+                segments = self._transcribe_chunked(upload_path)
+            else:
+                segments = self._transcribe_file(upload_path)
+        
+        return segments.map_times(offset_map.original_time) if offset_map else segments
+    
+    def _preprocess(self, audio_file_path, work_dir):
+        """
+        Trim silence, downmix and resample a recording before upload
+        
+        Args:
+            audio_file_path (str): Original recording
+            work_dir (str): Directory that receives the processed file
+            
+        Returns:
+            tuple: (path of the audio to upload, OffsetMap back to the original or None) - the
+                original path when pre-processing is off, ffmpeg is missing or processing fails
+        """
+        if not self.preprocessing.enabled or not (shutil.which("ffmpeg") and shutil.which("ffprobe")):
+            return audio_file_path, None
+        
+        options = self.preprocessing
+        try:
+            upload_path, offset_map, stats = preprocess_audio(
+                audio_file_path,
+                os.path.join(work_dir, "preprocessed.mp3"),
+                trim_silence=options.trim_silence,
+                threshold_db=options.silence_threshold_db,
+                min_silence_seconds=options.min_silence_seconds,
+                padding_seconds=options.padding_seconds,
+                sample_rate=options.sample_rate,
+                channels=options.channels,
+                bitrate=options.bitrate
+            )
+        except Exception as e:
+            print(f"⚠️  Audio pre-processing failed, uploading the original recording: {str(e)}")
+            return audio_file_path, None
+        
+        print(f"   Pre-processed audio: {stats['original_bytes'] / (1024 * 1024):.1f} MB → "
+              f"{stats['processed_bytes'] / (1024 * 1024):.1f} MB, {stats['original_seconds']:.0f}s → "
+              f"{stats['processed_seconds']:.0f}s ({stats['seconds_saved']:.0f}s of silence trimmed)")
+        span = current_span()
+        if span is not None:
+            span.record_preprocessing(stats["bytes_saved"], stats["seconds_saved"])
+        return upload_path, offset_map
+    
+    def _transcribe_file(self, audio_file_path):
+        """Send a single file to the Whisper API and keep its segment timings"""
+        with open(audio_file_path, "rb") as audio_file:
+            response = self.clients.create_transcription(
+                model=self.model,
+                file=audio_file,
+                response_format="verbose_json"
+            )
+        self._record_audio(audio_file_path)
+        return SegmentStore.from_verbose_json(response)
+    
+    def _record_audio(self, audio_file_path):
+        """Count the uploaded audio against the running stage (Whisper is billed per minute)"""
+        span = current_span()
+        if span is not None:
+            span.record_audio(self.model, audio_duration(audio_file_path))
+    
+    def _needs_chunking(self, audio_file_path):
+        """Decide whether a recording must (or should) be split before upload"""
+        if os.path.getsize(audio_file_path) > self.max_file_size_mb * 1024 * 1024:
+            return True
+        
+        # Long recordings under the size limit still finish sooner when split,
+        # but only if ffmpeg is around to do the splitting
+        if shutil.which("ffmpeg") and shutil.which("ffprobe"):
+            return probe_duration(audio_file_path) > self.chunk_seconds
+        
+        return False
+    
+    def _transcribe_chunked(self, audio_file_path):
+        """
+        Split a recording into overlapping chunks, transcribe them concurrently
+        and stitch the segments back into one timeline
+        
+        Args:
+            audio_file_path (str): Path to the audio file
+            
+        Returns:
+            SegmentStore: Segments with the overlaps cut at their midpoints
+        """
+        with tempfile.TemporaryDirectory(prefix="meeting_chunks_") as chunk_dir:
+            chunks = split_audio(audio_file_path, chunk_dir, self.chunk_seconds, self.overlap_seconds)
+            print(f"   Split recording into {len(chunks)} chunks")
+            
+            with ThreadPoolExecutor(max_workers=max(1, self.max_concurrent_chunks)) as executor:
+                pieces = list(executor.map(
+                    bind_current_span(self._transcribe_file), [chunk_path for _, _, chunk_path in chunks]
+                ))
+        
+        return stitch_segments([(start, end, piece) for (start, end, _), piece in zip(chunks, pieces)])
+    
+    async def _atranscribe(self, audio_file_path):
+        """Async variant of _transcribe; ffmpeg work runs in a worker thread"""
+        with tempfile.TemporaryDirectory(prefix="meeting_audio_") as work_dir:
+            upload_path, offset_map = await asyncio.to_thread(self._preprocess, audio_file_path, work_dir)
+            if await asyncio.to_thread(self._needs_chunking, upload_path):
+                segments = await self._atranscribe_chunked(upload_path)
+            else:
+                segments = await self._atranscribe_file(upload_path)
+        
+        return segments.map_times(offset_map.original_time) if offset_map else segments
+    
+    async def _atranscribe_file(self, audio_file_path):
+        """Send a single file to the Whisper API without blocking the event loop"""
+        with open(audio_file_path, "rb") as audio_file:
+            response = await self.clients.acreate_transcription(
+                model=self.model,
+                file=audio_file,
+                response_format="verbose_json"
+            )
+        self._record_audio(audio_file_path)
+        return SegmentStore.from_verbose_json(response)
+    
+    async def _atranscribe_chunked(self, audio_file_path):
+        """Async variant of _transcribe_chunked, bounded by max_concurrent_chunks"""
+        semaphore = asyncio.Semaphore(max(1, self.max_concurrent_chunks))
+        
+        async def transcribe_chunk(chunk_path):
+            async with semaphore:
+                return await self._atranscribe_file(chunk_path)
+        
+        with tempfile.TemporaryDirectory(prefix="meeting_chunks_") as chunk_dir:
+            chunks = await asyncio.to_thread(
+                split_audio, audio_file_path, chunk_dir, self.chunk_seconds, self.overlap_seconds
+            )
+            print(f"   Split recording into {len(chunks)} chunks")
+            
+            pieces = await asyncio.gather(*(transcribe_chunk(chunk_path) for _, _, chunk_path in chunks))
+        
+        return stitch_segments([(start, end, piece) for (start, end, _), piece in zip(chunks, pieces)])
+    
     def _get_mock_transcription(self):
         """Return mock transcription for testing purposes"""
         return """Good morning everyone, thank you for joining today's project planning meeting. 
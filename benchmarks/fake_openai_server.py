@@ -0,0 +1,498 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the OpenAI transcription and chat-completions endpoints.
+
+Unlike MOCK_MODE, requests travel through the real client stack (connection
+pool, rate limiter, SDK retries), so throughput, concurrency and failure
+handling can be measured offline. Latency is drawn from a configurable
+distribution. Errors (429/500) are injected at configurable rates. The
+server enforces its own requests/min and tokens/min limits and answers with
+429 + Retry-After, the way the real API does.
+
+Usage:
+    python benchmarks/fake_openai_server.py --port 8765 --latency-ms 800 --error-rate-429 0.02
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1 OPENAI_API_KEY=fake python main.py meeting.mp3
+"""
+
+import json
+import math
+import time
+import random
+import argparse
+import threading
+from collections import deque, Counter
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+SPEAKERS = ("Sarah", "John", "Lisa", "Mike")
+SENTENCES = (
+    "Let's go over where we are with the authentication work.",
+    "The API is about seventy percent done and should be finished by Friday.",
+    "I still need the final database schema for the user profiles.",
+    "We should book a session to sort the schema out this week.",
+    "The mobile build is blocked until the new endpoints are deployed.",
+    "I'll update the project timeline and send it around tomorrow.",
+    "Can someone own the load testing before the release?",
+    "I can take that, I'll have numbers by next Tuesday."
+)
+
+SUMMARY_TEXT = """# Meeting Summary
+
+## Key Discussion Points
+- Authentication API is about 70% complete
+- Database schema for user profiles still needs to be finalized
+- Mobile work is waiting on the new endpoints
+
+## Decisions Made
+- Schema review session to be held this week
+
+## Next Steps
+- Finish the API, finalize the schema and run load tests before the release
+"""
+
+ACTION_ITEMS = [
+    {"task": "Complete user authentication API", "owner": "John", "deadline": "Friday",
+     "priority": "High", "context": "70% complete"},
+    {"task": "Finalize user profile database schema", "owner": "Lisa", "deadline": "Wednesday",
+     "priority": "High", "context": "Blocks the API work"},
+    {"task": "Run load tests before the release", "owner": "Mike", "deadline": "Tuesday",
+     "priority": "Medium", "context": "Numbers needed for the go/no-go"}
+]
+
+FOLLOWUP_TEXT = """Subject: Meeting Follow-up - Action Items and Next Steps
+
+Hi team,
+
+Thanks for joining today's meeting. The authentication API is on track for Friday, the profile
+schema will be finalized on Wednesday, and load testing is scheduled before the release.
+
+Please reach out if anything is blocking you.
+
+Best regards,
+Sarah
+"""
+
+def generate_transcript(words, seed=0):
+    """
+    Build a speaker-labelled transcript of roughly `words` words
+
+    Args:
+        words (int): Target length in words
+        seed (int): Seed so every run produces the same text
+
+    Returns:
+        str: Transcript with one "Speaker: text" turn per line
+    """
+    rng = random.Random(seed)
+    turns = []
+    count = 0
+    while count < words:
+        sentences = " ".join(rng.choice(SENTENCES) for _ in range(rng.randint(1, 3)))
+        turns.append(f"{rng.choice(SPEAKERS)}: {sentences}")
+        count += len(sentences.split())
+    return "\n".join(turns)
+
+def transcript_segments(transcript, words_per_second=2.5):
+    """
+    Split a transcript into verbose_json segments, one per turn, timed by word count
+
+    Returns:
+        tuple: (segments list, total duration in seconds)
+    """
+    segments = []
+    position = 0.0
+    for index, turn in enumerate(line for line in transcript.splitlines() if line.strip()):
+        length = round(len(turn.split()) / words_per_second, 2)
+        segments.append({"id": index, "start": position, "end": round(position + length, 2), "text": f" {turn}"})
+        position = round(position + length, 2)
+    return segments, position
+
+def estimate_tokens(text):
+    """Rough token count (about four characters per token)"""
+    return max(1, len(text) // 4)
+
+class LatencyModel:
+    """Draws per-request latencies from a fixed, uniform, normal or lognormal distribution"""
+
+    DISTRIBUTIONS = ("fixed", "uniform", "normal", "lognormal")
+
+    def __init__(self, mean_ms=0.0, jitter_ms=0.0, distribution="lognormal", rng=None):
+        """
+        Args:
+            mean_ms (float): Mean latency in milliseconds
+            jitter_ms (float): Spread: half-width for uniform, standard deviation otherwise
+            distribution (str): One of DISTRIBUTIONS
+            rng (random.Random): Source of randomness
+        """
+        if distribution not in self.DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution: {distribution}")
+        self.mean_ms = float(mean_ms)
+        self.jitter_ms = float(jitter_ms)
+        self.distribution = distribution
+        self.rng = rng or random.Random()
+
+    def sample(self):
+        """
+        Returns:
+            float: One latency in seconds
+        """
+        if self.mean_ms <= 0:
+            return 0.0
+        if self.distribution == "fixed" or self.jitter_ms <= 0:
+            latency_ms = self.mean_ms
+        elif self.distribution == "uniform":
+            latency_ms = self.rng.uniform(self.mean_ms - self.jitter_ms, self.mean_ms + self.jitter_ms)
+        elif self.distribution == "normal":
+            latency_ms = self.rng.gauss(self.mean_ms, self.jitter_ms)
+        else:
+            # Parameterised so the samples have the requested mean and standard deviation
+            sigma = math.sqrt(math.log(1.0 + (self.jitter_ms / self.mean_ms) ** 2))
+            mu = math.log(self.mean_ms) - sigma ** 2 / 2.0
+            latency_ms = self.rng.lognormvariate(mu, sigma)
+        return max(0.0, latency_ms) / 1000.0
+
+class SlidingWindowLimit:
+    """Server-side per-minute limit over a sliding 60 second window"""
+
+    def __init__(self, per_minute):
+        self.per_minute = per_minute
+        self.events = deque()
+        self.total = 0
+
+    def try_take(self, amount, now):
+        """
+        Record `amount` units if they fit in the window
+
+        Returns:
+            float: 0 when accepted, otherwise the seconds until enough of the window frees up
+        """
+        while self.events and now - self.events[0][0] >= 60.0:
+            self.total -= self.events.popleft()[1]
+        if self.total + amount <= self.per_minute or not self.events:
+            self.events.append((now, amount))
+            self.total += amount
+            return 0.0
+
+        # Walk forward until enough old events would have expired
+        freed = 0
+        for timestamp, used in self.events:
+            freed += used
+            if self.total - freed + amount <= self.per_minute:
+                return max(0.001, 60.0 - (now - timestamp))
+        return 60.0
+
+class FakeOpenAIBackend:
+    """Behaviour and statistics shared by every request handler thread"""
+
+    def __init__(self, chat_latency=None, transcription_latency=None, token_delay_ms=0.0,
+                 error_rate_429=0.0, error_rate_500=0.0, requests_per_minute=0, tokens_per_minute=0,
+                 transcript_words=400, seed=None):
+        """
+        Args:
+            chat_latency (LatencyModel): Time before a chat completion starts answering
+            transcription_latency (LatencyModel): Time to answer a transcription
+            token_delay_ms (float): Delay between streamed fragments
+            error_rate_429 (float): Fraction of requests rejected with 429 at random
+            error_rate_500 (float): Fraction of requests failing with 500 at random
+            requests_per_minute (int): Server-side request limit (0 disables it)
+            tokens_per_minute (int): Server-side token limit (0 disables it)
+            transcript_words (int): Length of the transcript returned for every recording
+            seed (int): Seed for reproducible latencies and failures
+        """
+        self.rng = random.Random(seed)
+        self.chat_latency = chat_latency or LatencyModel(rng=self.rng)
+        self.transcription_latency = transcription_latency or LatencyModel(rng=self.rng)
+        self.token_delay = token_delay_ms / 1000.0
+        self.error_rate_429 = error_rate_429
+        self.error_rate_500 = error_rate_500
+        self.request_limit = SlidingWindowLimit(requests_per_minute) if requests_per_minute else None
+        self.token_limit = SlidingWindowLimit(tokens_per_minute) if tokens_per_minute else None
+        self.transcript = generate_transcript(transcript_words, seed=seed or 0)
+        self.stats = Counter()
+        self._lock = threading.Lock()
+
+    def admit(self, tokens):
+        """
+        Decide whether a request gets served
+
+        Returns:
+            tuple: (status, retry_after) where status is 200, 429 or 500
+        """
+        now = time.monotonic()
+        with self._lock:
+            self.stats["requests"] += 1
+            roll = self.rng.random()
+            if roll < self.error_rate_500:
+                self.stats["injected_500"] += 1
+                return 500, None
+            if roll < self.error_rate_500 + self.error_rate_429:
+                self.stats["injected_429"] += 1
+                return 429, 1.0
+
+            retry_after = 0.0
+            if self.request_limit:
+                retry_after = self.request_limit.try_take(1, now)
+            if not retry_after and self.token_limit:
+                retry_after = self.token_limit.try_take(tokens, now)
+            if retry_after:
+                self.stats["rate_limited_429"] += 1
+                return 429, retry_after
+
+            self.stats["served"] += 1
+            self.stats["tokens"] += tokens
+            return 200, None
+
+    def chat_reply(self, params):
+        """Pick the canned reply matching the agent that sent the request"""
+        response_type = params.get("response_format", {}).get("type")
+        if response_type == "json_schema":
+            return json.dumps({"summary": SUMMARY_TEXT, "action_items": ACTION_ITEMS})
+        if response_type == "json_object":
+            return json.dumps({"action_items": ACTION_ITEMS})
+        system_prompt = next(
+            (message.get("content") or "" for message in params.get("messages", []) if message.get("role") == "system"),
+            ""
+        ).lower()
+        if "follow-up" in system_prompt or "email" in system_prompt:
+            return FOLLOWUP_TEXT
+        return SUMMARY_TEXT
+
+    def snapshot(self):
+        """
+        Returns:
+            dict: Request counters since start-up
+        """
+        with self._lock:
+            return dict(self.stats)
+
+class FakeOpenAIHandler(BaseHTTPRequestHandler):
+    """Serves /v1/chat/completions and /v1/audio/transcriptions"""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        # Keep benchmark output clean
+        pass
+
+    @property
+    def backend(self):
+        return self.server.backend
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+
+        if self.path.endswith("/chat/completions"):
+            self._chat_completions(json.loads(body or b"{}"))
+        elif self.path.endswith("/audio/transcriptions"):
+            self._transcriptions(body)
+        else:
+            self._send_json(404, {"error": {"message": f"Unknown endpoint {self.path}", "type": "invalid_request_error"}})
+
+    def _chat_completions(self, params):
+        reply = self.backend.chat_reply(params)
+        prompt_tokens = sum(estimate_tokens(message.get("content") or "") for message in params.get("messages", []))
+        completion_tokens = estimate_tokens(reply)
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens
+        }
+
+        if not self._admit(prompt_tokens + (params.get("max_tokens") or completion_tokens)):
+            return
+        time.sleep(self.backend.chat_latency.sample())
+
+        completion_id = f"chatcmpl-fake-{int(time.time() * 1000)}"
+        model = params.get("model", "gpt-4o")
+        if not params.get("stream"):
+            self._send_json(200, {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": reply},
+                    "finish_reason": "stop"
+                }],
+                "usage": usage
+            })
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        def send_chunk(delta, finish_reason=None, chunk_usage=None):
+            chunk = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}] if delta is not None else []
+            }
+            if chunk_usage is not None:
+                chunk["usage"] = chunk_usage
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+
+        send_chunk({"role": "assistant", "content": ""})
+        for fragment in reply.split(" "):
+            send_chunk({"content": fragment + " "})
+            if self.backend.token_delay:
+                time.sleep(self.backend.token_delay)
+        send_chunk({}, finish_reason="stop")
+        if (params.get("stream_options") or {}).get("include_usage"):
+            send_chunk(None, chunk_usage=usage)
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+    def _transcriptions(self, body):
+        if not self._admit(0):
+            return
+        time.sleep(self.backend.transcription_latency.sample())
+
+        # The multipart form is not parsed; only the response format matters here
+        if b'name="response_format"\r\n\r\ntext' in body:
+            self._send(200, self.backend.transcript.encode("utf-8"), "text/plain; charset=utf-8")
+        elif b'name="response_format"\r\n\r\nverbose_json' in body:
+            segments, duration = transcript_segments(self.backend.transcript)
+            self._send_json(200, {
+                "task": "transcribe", "language": "english", "duration": duration,
+                "text": " ".join(segment["text"].strip() for segment in segments), "segments": segments
+            })
+        else:
+            self._send_json(200, {"text": self.backend.transcript})
+
+    def _admit(self, tokens):
+        status, retry_after = self.backend.admit(tokens)
+        if status == 200:
+            return True
+
+        if status == 429:
+            error = {"message": "Rate limit reached (fake server)", "type": "rate_limit_exceeded"}
+        else:
+            error = {"message": "Internal server error (fake server)", "type": "server_error"}
+        headers = {"Retry-After": f"{retry_after:.3f}"} if retry_after else {}
+        self._send_json(status, {"error": error}, headers)
+        return False
+
+    def _send_json(self, status, payload, headers=None):
+        self._send(status, json.dumps(payload).encode("utf-8"), "application/json", headers)
+
+    def _send(self, status, data, content_type, headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+class FakeOpenAIServer:
+    """
+    Runs the fake endpoints on a background thread
+
+    Example:
+        with FakeOpenAIServer(FakeOpenAIBackend(chat_latency=LatencyModel(500, 150))) as server:
+            registry = ClientRegistry(api_key="fake", base_url=server.base_url)
+    """
+
+    def __init__(self, backend=None, host="127.0.0.1", port=0):
+        """
+        Args:
+            backend (FakeOpenAIBackend): Behaviour of the endpoints
+            host (str): Interface to bind
+            port (int): Port to bind (0 picks a free one)
+        """
+        self.backend = backend or FakeOpenAIBackend()
+        self.httpd = ThreadingHTTPServer((host, port), FakeOpenAIHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.backend = self.backend
+        self._thread = None
+
+    @property
+    def base_url(self):
+        """URL to pass as the OpenAI client's base_url"""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="fake-openai", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+def add_backend_arguments(parser):
+    """Register the command-line options that shape the fake backend"""
+    parser.add_argument("--latency-ms", type=float, default=800, help="Mean chat completion latency")
+    parser.add_argument("--jitter-ms", type=float, default=250, help="Latency spread (stddev, or half-width for uniform)")
+    parser.add_argument("--distribution", choices=LatencyModel.DISTRIBUTIONS, default="lognormal",
+                        help="Latency distribution")
+    parser.add_argument("--transcription-latency-ms", type=float, default=1500, help="Mean transcription latency")
+    parser.add_argument("--token-delay-ms", type=float, default=5, help="Delay between streamed fragments")
+    parser.add_argument("--error-rate-429", type=float, default=0.0, help="Fraction of requests rejected with 429")
+    parser.add_argument("--error-rate-500", type=float, default=0.0, help="Fraction of requests failing with 500")
+    parser.add_argument("--server-rpm", type=int, default=0, help="Server-side requests/min limit (0 = unlimited)")
+    parser.add_argument("--server-tpm", type=int, default=0, help="Server-side tokens/min limit (0 = unlimited)")
+    parser.add_argument("--transcript-words", type=int, default=400, help="Length of the returned transcripts")
+    parser.add_argument("--seed", type=int, default=1, help="Seed for reproducible latencies and failures")
+
+def backend_from_args(args):
+    """
+    Build a FakeOpenAIBackend from parsed add_backend_arguments options
+
+    Returns:
+        FakeOpenAIBackend: Configured backend
+    """
+    rng = random.Random(args.seed)
+    return FakeOpenAIBackend(
+        chat_latency=LatencyModel(args.latency_ms, args.jitter_ms, args.distribution, rng),
+        transcription_latency=LatencyModel(
+            args.transcription_latency_ms,
+            args.jitter_ms * args.transcription_latency_ms / args.latency_ms if args.latency_ms else 0,
+            args.distribution, rng
+        ),
+        token_delay_ms=args.token_delay_ms,
+        error_rate_429=args.error_rate_429,
+        error_rate_500=args.error_rate_500,
+        requests_per_minute=args.server_rpm,
+        tokens_per_minute=args.server_tpm,
+        transcript_words=args.transcript_words,
+        seed=args.seed
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a fake OpenAI server for offline benchmarks")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind")
+    parser.add_argument("--port", type=int, default=8765, help="Port to bind")
+    add_backend_arguments(parser)
+    args = parser.parse_args()
+
+    server = FakeOpenAIServer(backend_from_args(args), args.host, args.port)
+    print(f"🧪 Fake OpenAI server listening on {server.base_url}")
+    print(f"   export OPENAI_BASE_URL={server.base_url} OPENAI_API_KEY=fake")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        print(f"\n📊 Requests: {server.backend.snapshot()}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+End-to-end pipeline benchmark against the local fake OpenAI server.
+
+Runs `run_crew` sequentially and through the batch runner. The agents go
+through the real client stack (connection pool, rate limiter, SDK), which
+points at benchmarks/fake_openai_server.py. Reports meetings/min,
+p50/p95/p99 latency per stage and end to end, and memory. Every run is stored
+under benchmarks/results/ and compared with the previous one, so
+regressions show up between versions.
+
+Usage:
+    python benchmarks/pipeline_benchmark.py --meetings 20 --workers 4 --latency-ms 800 --error-rate-429 0.02
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import resource
+import tempfile
+import contextlib
+import subprocess
+import tracemalloc
+from datetime import datetime
+from dataclasses import replace
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.fake_openai_server import FakeOpenAIServer, add_backend_arguments, backend_from_args
+from config.settings import load_settings
+from utils.audio import write_wav
+from utils.clients import ClientRegistry, set_client_registry
+
+RESULTS_DIR = os.path.join(REPO_ROOT, "benchmarks", "results")
+STAGES = ("segments", "summary", "action_items", "followup_message")
+
+def percentile(values, fraction):
+    """
+    Linear-interpolated percentile
+
+    Args:
+        values (list): Samples
+        fraction (float): Percentile as a fraction, e.g. 0.95
+
+    Returns:
+        float: The percentile, or None without samples
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+def latency_summary(values):
+    """
+    Returns:
+        dict: count, mean, p50, p95, p99 and max of the samples (seconds)
+    """
+    return {
+        "count": len(values),
+        "mean": sum(values) / len(values) if values else None,
+        "p50": percentile(values, 0.50),
+        "p95": percentile(values, 0.95),
+        "p99": percentile(values, 0.99),
+        "max": max(values) if values else None
+    }
+
+def make_recordings(directory, count, seconds=1.0):
+    """
+    Write `count` short silent WAV files, each with distinct content so the
+    transcript cache can never short-circuit a run
+
+    Returns:
+        list: Recording paths
+    """
+    paths = []
+    for index in range(count):
+        pcm = b"\x00\x00" * int(16000 * seconds) + index.to_bytes(4, "little")
+        paths.append(write_wav(os.path.join(directory, f"meeting_{index:04d}.wav"), pcm))
+    return paths
+
+class ScenarioRecorder:
+    """Collects per-meeting and per-stage timings for one scenario"""
+
+    def __init__(self):
+        self.meeting_latencies = []
+        self.stage_latencies = {stage: [] for stage in STAGES}
+        self.failures = []
+
+    def record(self, entry):
+        if entry["status"] != "ok":
+            self.failures.append(entry.get("error"))
+            return
+        self.meeting_latencies.append(entry["latency"])
+        for stage, timing in entry["results"]["performance"]["stages"].items():
+            self.stage_latencies.setdefault(stage, []).append(timing["duration"])
+
+    def report(self, wall_time, peak_memory):
+        succeeded = len(self.meeting_latencies)
+        return {
+            "meetings": succeeded + len(self.failures),
+            "succeeded": succeeded,
+            "failed": len(self.failures),
+            "errors": sorted(set(str(error) for error in self.failures))[:5],
+            "wall_time": wall_time,
+            "meetings_per_minute": succeeded / wall_time * 60 if wall_time > 0 else 0.0,
+            "meeting_latency": latency_summary(self.meeting_latencies),
+            "stage_latency": {stage: latency_summary(values) for stage, values in self.stage_latencies.items()},
+            "peak_traced_memory_mb": peak_memory / (1024 * 1024)
+        }
+
+@contextlib.contextmanager
+def measure_memory():
+    """Trace Python allocations for the block; yields a dict that receives the peak"""
+    measurement = {}
+    tracemalloc.start()
+    try:
+        yield measurement
+    finally:
+        measurement["peak"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+def run_sequential(recordings, quiet):
+    """Process the recordings one after another with a single crew"""
+    from crew.crew import MeetingSummarizerCrew
+    from crew.batch import _run_recording
+
+    recorder = ScenarioRecorder()
+    with measure_memory() as memory:
+        crew = MeetingSummarizerCrew(use_cache=False)
+        started = time.perf_counter()
+        with _maybe_quiet(quiet):
+            for path in recordings:
+                recorder.record(_run_recording(crew, path))
+        wall_time = time.perf_counter() - started
+    return recorder.report(wall_time, memory["peak"])
+
+def run_batch(recordings, workers, quiet):
+    """Process the recordings through BatchRunner's thread pool"""
+    from crew.batch import BatchRunner
+
+    recorder = ScenarioRecorder()
+    with measure_memory() as memory:
+        runner = BatchRunner(workers=workers, crew_kwargs={"use_cache": False})
+        started = time.perf_counter()
+        with _maybe_quiet(quiet):
+            runner.run(recordings, on_result=lambda index, entry: recorder.record(entry))
+        wall_time = time.perf_counter() - started
+    return recorder.report(wall_time, memory["peak"])
+
+@contextlib.contextmanager
+def _maybe_quiet(quiet):
+    """Silence the crew's progress output (from every thread) while benchmarking"""
+    if not quiet:
+        yield
+        return
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+def git_revision():
+    """Current commit hash, or None outside a git checkout"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def latest_result(results_dir):
+    """Path of the most recent stored result, or None"""
+    if not os.path.isdir(results_dir):
+        return None
+    names = sorted(name for name in os.listdir(results_dir) if name.endswith(".json"))
+    return os.path.join(results_dir, names[-1]) if names else None
+
+def compare(result, baseline, tolerance):
+    """
+    Compare a run with a stored baseline
+
+    Returns:
+        list: Human-readable regression messages (empty when nothing regressed)
+    """
+    regressions = []
+    for name, scenario in result["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if not previous:
+            continue
+
+        old, new = previous["meetings_per_minute"], scenario["meetings_per_minute"]
+        if old and new < old * (1 - tolerance):
+            regressions.append(f"{name}: throughput {old:.1f} -> {new:.1f} meetings/min")
+
+        for stage, summary in scenario["stage_latency"].items():
+            old_p95 = previous["stage_latency"].get(stage, {}).get("p95")
+            if old_p95 and summary["p95"] and summary["p95"] > old_p95 * (1 + tolerance):
+                regressions.append(f"{name}: {stage} p95 {old_p95:.2f}s -> {summary['p95']:.2f}s")
+    return regressions
+
+def print_scenario(name, scenario):
+    print(f"\n📊 {name}: {scenario['succeeded']}/{scenario['meetings']} meetings in {scenario['wall_time']:.1f}s "
+          f"({scenario['meetings_per_minute']:.1f} meetings/min, peak traced memory "
+          f"{scenario['peak_traced_memory_mb']:.1f} MB)")
+    print(f"   {'stage':<18}{'p50':>9}{'p95':>9}{'p99':>9}")
+    rows = list(scenario["stage_latency"].items()) + [("end to end", scenario["meeting_latency"])]
+    for stage, summary in rows:
+        if summary["count"]:
+            print(f"   {stage:<18}{summary['p50']:>8.2f}s{summary['p95']:>8.2f}s{summary['p99']:>8.2f}s")
+    for error in scenario["errors"]:
+        print(f"   ❌ {error}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the meeting pipeline against a fake OpenAI server")
+    parser.add_argument("--meetings", type=int, default=20, help="Recordings per scenario")
+    parser.add_argument("--workers", type=int, default=4, help="Batch runner pool size")
+    parser.add_argument("--scenarios", nargs="+", choices=("sequential", "batch"), default=["sequential", "batch"],
+                        help="Scenarios to run")
+    parser.add_argument("--client-rpm", type=int, help="Override openai.requests_per_minute for the client limiter")
+    parser.add_argument("--client-tpm", type=int, help="Override openai.tokens_per_minute for the client limiter")
+    parser.add_argument("--results-dir", default=RESULTS_DIR, help="Where results are stored")
+    parser.add_argument("--baseline", help="Result file to compare with (defaults to the latest stored result)")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Allowed regression before flagging (0.15 = 15%%)")
+    parser.add_argument("--no-save", action="store_true", help="Do not store this run's results")
+    parser.add_argument("--verbose", action="store_true", help="Show the crew's own progress output")
+    add_backend_arguments(parser)
+    args = parser.parse_args()
+
+    # The agents must hit the fake server instead of short-circuiting in mock mode
+    os.environ["MOCK_MODE"] = "false"
+    os.environ.setdefault("OPENAI_API_KEY", "fake-key")
+
+    settings = load_settings()
+    if args.client_rpm is not None:
+        settings = replace(settings, openai=replace(settings.openai, requests_per_minute=args.client_rpm))
+    if args.client_tpm is not None:
+        settings = replace(settings, openai=replace(settings.openai, tokens_per_minute=args.client_tpm))
+
+    backend = backend_from_args(args)
+    result = {
+        "timestamp": datetime.now().isoformat(),
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "parameters": {key: value for key, value in vars(args).items()
+                       if key not in ("results_dir", "baseline", "no_save", "verbose")},
+        "scenarios": {}
+    }
+
+    with FakeOpenAIServer(backend) as server, tempfile.TemporaryDirectory(prefix="meeting_bench_") as workdir:
+        print(f"🧪 Fake OpenAI server on {server.base_url}")
+        set_client_registry(ClientRegistry(api_key=os.environ["OPENAI_API_KEY"], settings=settings, base_url=server.base_url))
+        recordings = make_recordings(workdir, args.meetings)
+
+        for name in args.scenarios:
+            if name == "sequential":
+                scenario = run_sequential(recordings, quiet=not args.verbose)
+            else:
+                scenario = run_batch(recordings, args.workers, quiet=not args.verbose)
+            result["scenarios"][name] = scenario
+            print_scenario(name, scenario)
+
+        result["server"] = backend.snapshot()
+
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    result["max_rss_mb"] = max_rss / (1024 * 1024) if sys.platform == "darwin" else max_rss / 1024
+    print(f"\n🧠 Max RSS: {result['max_rss_mb']:.1f} MB   Server: {result['server']}")
+
+    baseline_path = args.baseline or latest_result(args.results_dir)
+    if not args.no_save:
+        os.makedirs(args.results_dir, exist_ok=True)
+        result_path = os.path.join(args.results_dir, f"pipeline_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+        with open(result_path, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+        print(f"💾 Results saved to {result_path}")
+
+    if baseline_path:
+        with open(baseline_path, "r", encoding="utf-8") as f:
+            regressions = compare(result, json.load(f), args.tolerance)
+        if regressions:
+            print(f"\n❌ Regressions against {baseline_path}:")
+            for regression in regressions:
+                print(f"   - {regression}")
+            sys.exit(1)
+        print(f"\n✅ No regressions against {baseline_path}")
+
+if __name__ == "__main__":
+    main()
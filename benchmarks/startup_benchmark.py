@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Startup-time benchmark for the CLI.
+
+Measures the cold-start wall time of `python main.py` in mock mode and the
+import-time breakdown of `import main` (via `python -X importtime`). It also
+checks that the heavy optional dependencies (crewai, openai, httpx,
+tiktoken) stay unloaded on the mock path.
+
+Usage:
+    python benchmarks/startup_benchmark.py [--runs 5] [--top 15] [--json results.json] [--baseline old.json]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ("crewai", "openai", "httpx", "tiktoken")
+
+def _mock_env():
+    env = dict(os.environ)
+    env["MOCK_MODE"] = "true"
+    env["SAVE_OUTPUT"] = "false"
+    env["PYTHONDONTWRITEBYTECODE"] = "1"
+    return env
+
+def measure_cold_start(runs):
+    """
+    Time complete `python main.py` runs in mock mode
+
+    Args:
+        runs (int): Number of runs
+
+    Returns:
+        list: Wall times in seconds
+    """
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "main.py", "--no-cache"],
+            cwd=REPO_ROOT, env=_mock_env(),
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True
+        )
+        timings.append(time.perf_counter() - started)
+    return timings
+
+def measure_import_times():
+    """
+    Run `python -X importtime -c "import main"` and parse its report
+
+    Returns:
+        list: (module, self_us, cumulative_us, depth) tuples in import order
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=REPO_ROOT, env=_mock_env(), capture_output=True, text=True, check=True
+    )
+
+    entries = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        entries.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return entries
+
+def summarize(timings, import_entries, top):
+    """Build the benchmark result document"""
+    loaded = {name.split(".")[0] for name, _, _, _ in import_entries}
+    main_entry = next((entry for entry in import_entries if entry[0] == "main"), None)
+
+    return {
+        "python": sys.version.split()[0],
+        "cold_start": {
+            "runs": len(timings),
+            "median_seconds": statistics.median(timings),
+            "min_seconds": min(timings),
+            "max_seconds": max(timings)
+        },
+        "import_main_seconds": main_entry[2] / 1e6 if main_entry else None,
+        "heavy_modules_loaded": sorted(module for module in HEAVY_MODULES if module in loaded),
+        "slowest_imports": [
+            {"module": name, "self_ms": self_us / 1000, "cumulative_ms": cumulative_us / 1000}
+            for name, self_us, cumulative_us, _ in sorted(import_entries, key=lambda entry: -entry[2])[:top]
+        ]
+    }
+
+def compare(result, baseline, tolerance):
+    """
+    Compare against a previous result
+
+    Returns:
+        list: Human-readable regression messages (empty when nothing regressed)
+    """
+    regressions = []
+    old = baseline["cold_start"]["median_seconds"]
+    new = result["cold_start"]["median_seconds"]
+    if new > old * (1 + tolerance):
+        regressions.append(f"cold start median {old:.3f}s -> {new:.3f}s")
+
+    old_import = baseline.get("import_main_seconds")
+    new_import = result.get("import_main_seconds")
+    if old_import and new_import and new_import > old_import * (1 + tolerance):
+        regressions.append(f"import main {old_import:.3f}s -> {new_import:.3f}s")
+
+    newly_loaded = set(result["heavy_modules_loaded"]) - set(baseline.get("heavy_modules_loaded", []))
+    if newly_loaded:
+        regressions.append(f"heavy modules now loaded at startup: {', '.join(sorted(newly_loaded))}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CLI cold start and import time")
+    parser.add_argument("--runs", type=int, default=5, help="Number of cold-start runs")
+    parser.add_argument("--top", type=int, default=15, help="Number of slowest imports to list")
+    parser.add_argument("--json", metavar="PATH", help="Write the results to a JSON file")
+    parser.add_argument("--baseline", metavar="PATH", help="Compare against a previous JSON result")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown before flagging (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    result = summarize(measure_cold_start(args.runs), measure_import_times(), args.top)
+
+    cold_start = result["cold_start"]
+    print(f"⏱️  Cold start (python main.py, mock mode, {cold_start['runs']} runs): "
+          f"median {cold_start['median_seconds']:.3f}s, min {cold_start['min_seconds']:.3f}s, "
+          f"max {cold_start['max_seconds']:.3f}s")
+    if result["import_main_seconds"] is not None:
+        print(f"📦 import main: {result['import_main_seconds'] * 1000:.1f} ms")
+    print(f"🪶 Heavy modules loaded at startup: {', '.join(result['heavy_modules_loaded']) or 'none'}")
+    print("\nSlowest imports (cumulative):")
+    for entry in result["slowest_imports"]:
+        print(f"   {entry['cumulative_ms']:8.1f} ms  {entry['module']}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+        print(f"\n💾 Results saved to {args.json}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare(result, json.load(f), args.tolerance)
+        if regressions:
+            print("\n❌ Startup regressions:")
+            for regression in regressions:
+                print(f"   - {regression}")
+            sys.exit(1)
+        print("\n✅ No startup regressions against the baseline")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,542 @@
+import os
+import copy
+import yaml
+from dataclasses import dataclass, field, fields, replace
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.yaml")
+
+# MEETING__PERFORMANCE__BATCH_SIZE=8 overrides performance.batch_size, etc.
+ENV_PREFIX = "MEETING__"
+
+_config_cache = {}
+_settings_cache = {}
+
+class ConfigError(ValueError):
+    """Raised when config.yaml (or an environment override) holds an invalid value"""
+
+def apply_env_overrides(config, environ=None):
+    """
+    Overlay MEETING__SECTION__KEY=value environment variables onto a parsed config
+
+    Values are parsed as YAML scalars, so "8", "0.5", "true" and "null" keep their types.
+
+    Args:
+        config (dict): Parsed configuration
+        environ (dict): Environment to read (defaults to os.environ)
+
+    Returns:
+        dict: A copy of the configuration with the overrides applied
+    """
+    config = copy.deepcopy(config)
+    environ = os.environ if environ is None else environ
+    for name, raw_value in sorted(environ.items()):
+        if not name.startswith(ENV_PREFIX):
+            continue
+        path = [part.lower() for part in name[len(ENV_PREFIX):].split("__") if part]
+        if not path:
+            continue
+        section = config
+        for key in path[:-1]:
+            if not isinstance(section.get(key), dict):
+                section[key] = {}
+            section = section[key]
+        try:
+            section[path[-1]] = yaml.safe_load(raw_value)
+        except yaml.YAMLError:
+            section[path[-1]] = raw_value
+    return config
+
+def load_config(config_path=None):
+    """
+    Load the YAML configuration file with environment overrides applied,
+    caching the parsed result per path
+
+    Args:
+        config_path (str): Path to the config file (defaults to config/config.yaml)
+
+    Returns:
+        dict: Parsed configuration (empty if the file does not exist)
+    """
+    config_path = config_path or os.getenv("MEETING_CONFIG_PATH", CONFIG_PATH)
+
+    if config_path not in _config_cache:
+        if os.path.exists(config_path):
+            with open(config_path, "r", encoding="utf-8") as f:
+                config = yaml.safe_load(f) or {}
+        else:
+            config = {}
+        _config_cache[config_path] = apply_env_overrides(config)
+
+    return _config_cache[config_path]
+
+def get_setting(config, dotted_key, default=None):
+    """
+    Look up a nested setting such as "performance.parallel_processing"
+
+    Args:
+        config (dict): Parsed configuration
+        dotted_key (str): Dot-separated path to the setting
+        default: Value returned when the setting is missing
+
+    Returns:
+        The configured value, or the default
+    """
+    value = config
+    for key in dotted_key.split("."):
+        if not isinstance(value, dict) or key not in value:
+            return default
+        value = value[key]
+    return value
+
+@dataclass(frozen=True)
+class OpenAISettings:
+    model: str = "gpt-4o"
+    whisper_model: str = "whisper-1"
+    max_tokens: int = 1000
+    temperature: float = 0.3
+    requests_per_minute: int = 0
+    tokens_per_minute: int = 0
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    request_timeout: float = 120.0
+    base_url: str = None
+
+@dataclass(frozen=True)
+class AgentSettings:
+    """Model and generation limits of one agent (unset values inherit from the openai section)"""
+    model: str = None
+    max_tokens: int = None
+    temperature: float = None
+    max_retries: int = None
+
+@dataclass(frozen=True)
+class AgentsSettings:
+    transcriber: AgentSettings = field(default_factory=AgentSettings)
+    summarizer: AgentSettings = field(default_factory=AgentSettings)
+    extractor: AgentSettings = field(default_factory=AgentSettings)
+    followup: AgentSettings = field(default_factory=AgentSettings)
+    analyst: AgentSettings = field(default_factory=AgentSettings)
+
+@dataclass(frozen=True)
+class FileProcessingSettings:
+    supported_audio_formats: tuple = (".mp3", ".wav", ".m4a", ".flac")
+    max_file_size_mb: float = 25.0
+    chunk_duration_seconds: float = 600.0
+    chunk_overlap_seconds: float = 5.0
+    max_concurrent_chunks: int = 4
+
+@dataclass(frozen=True)
+class PreprocessingSettings:
+    enabled: bool = True
+    trim_silence: bool = True
+    silence_threshold_db: float = -40.0
+    min_silence_seconds: float = 1.0
+    padding_seconds: float = 0.25
+    sample_rate: int = 16000
+    channels: int = 1
+    bitrate: str = "32k"
+
+@dataclass(frozen=True)
+class MapReduceSettings:
+    threshold_tokens: int = 12000
+    chunk_tokens: int = 6000
+    chunk_summary_max_tokens: int = 600
+    max_parallel_chunks: int = 4
+
+@dataclass(frozen=True)
+class StageBudgets:
+    """Transcript tokens allowed in one request of each stage (None = map_reduce.threshold_tokens)"""
+    summary: int = None
+    action_items: int = None
+    analysis: int = None
+
+@dataclass(frozen=True)
+class CompressionSettings:
+    enabled: bool = True
+    remove_fillers: bool = True
+    collapse_repeats: bool = True
+    budgets: StageBudgets = field(default_factory=StageBudgets)
+
+@dataclass(frozen=True)
+class LiveSettings:
+    window_seconds: float = 30.0
+    overlap_seconds: float = 2.0
+    idle_timeout_seconds: float = 15.0
+
+@dataclass(frozen=True)
+class FollowupSettings:
+    mode: str = "template"
+    templates_dir: str = None
+    team: str = None
+    sender: str = "Meeting Coordinator"
+    recipients: str = "Team"
+
+@dataclass(frozen=True)
+class OutputSettings:
+    save_to_files: bool = False
+    output_directory: str = "./output"
+    timestamp_files: bool = True
+
+@dataclass(frozen=True)
+class CacheSettings:
+    enabled: bool = False
+    directory: str = ".cache/stages"
+    max_size_mb: float = 500.0
+
+@dataclass(frozen=True)
+class CheckpointSettings:
+    enabled: bool = True
+    directory: str = ".runs"
+    keep_runs: int = 20
+
+@dataclass(frozen=True)
+class ActionStoreSettings:
+    enabled: bool = True
+    path: str = ".data/action_items.db"
+    similarity: float = 0.8
+
+@dataclass(frozen=True)
+class SearchIndexSettings:
+    enabled: bool = True
+    directory: str = ".data/search"
+    merge_factor: int = 10
+
+@dataclass(frozen=True)
+class ServerSettings:
+    host: str = "127.0.0.1"
+    port: int = 8080
+    workers: int = 2
+    queue_size: int = 16
+    keep_jobs: int = 1000
+    upload_dir: str = ".data/uploads"
+    max_upload_mb: float = 200
+    stream_tokens: bool = True
+
+@dataclass(frozen=True)
+class SchedulerSettings:
+    enabled: bool = False
+    max_active_jobs: int = 0
+    reserved_jobs: int = 1
+    window_seconds: float = 60.0
+    deadline_margin_seconds: float = 300.0
+    default_tenant: str = "default"
+    default_weight: float = 1.0
+    tenant_queue_size: int = 0
+    default_priority: str = "normal"
+    priorities: dict = field(default_factory=lambda: {"urgent": 2, "normal": 1, "bulk": 0})
+    tenants: dict = field(default_factory=dict)
+
+@dataclass(frozen=True)
+class HedgingSettings:
+    enabled: bool = False
+    operations: tuple = ("chat",)
+    percentile: float = 0.95
+    initial_delay_seconds: float = 10.0
+    min_samples: int = 20
+    max_per_minute: int = 30
+
+@dataclass(frozen=True)
+class ErrorHandlingSettings:
+    retry_attempts: int = 3
+    retry_delay: float = 2.0
+    max_retry_delay: float = 30.0
+    retry_jitter: float = 1.0
+    continue_on_error: bool = False
+    hedging: HedgingSettings = field(default_factory=HedgingSettings)
+
+@dataclass(frozen=True)
+class PerformanceSettings:
+    parallel_processing: bool = False
+    combined_analysis: bool = False
+    batch_size: int = 1
+    timeout_seconds: float = 0.0
+
+@dataclass(frozen=True)
+class Settings:
+    """
+    Typed, validated view of config.yaml. Build it with load_settings(); pass
+    it to MeetingSummarizerCrew, the agents and the client registry to tune
+    them without touching code.
+    """
+    openai: OpenAISettings = field(default_factory=OpenAISettings)
+    agents: AgentsSettings = field(default_factory=AgentsSettings)
+    file_processing: FileProcessingSettings = field(default_factory=FileProcessingSettings)
+    preprocessing: PreprocessingSettings = field(default_factory=PreprocessingSettings)
+    map_reduce: MapReduceSettings = field(default_factory=MapReduceSettings)
+    compression: CompressionSettings = field(default_factory=CompressionSettings)
+    live: LiveSettings = field(default_factory=LiveSettings)
+    followup: FollowupSettings = field(default_factory=FollowupSettings)
+    output: OutputSettings = field(default_factory=OutputSettings)
+    cache: CacheSettings = field(default_factory=CacheSettings)
+    checkpoint: CheckpointSettings = field(default_factory=CheckpointSettings)
+    action_store: ActionStoreSettings = field(default_factory=ActionStoreSettings)
+    search_index: SearchIndexSettings = field(default_factory=SearchIndexSettings)
+    server: ServerSettings = field(default_factory=ServerSettings)
+    scheduler: SchedulerSettings = field(default_factory=SchedulerSettings)
+    error_handling: ErrorHandlingSettings = field(default_factory=ErrorHandlingSettings)
+    performance: PerformanceSettings = field(default_factory=PerformanceSettings)
+    pricing: dict = field(default_factory=dict)
+    mock_mode: bool = False
+
+    def agent(self, name):
+        """
+        Resolve an agent's effective model and limits
+
+        Args:
+            name (str): "transcriber", "summarizer", "extractor", "followup" or "analyst"
+
+        Returns:
+            AgentSettings: Settings with every unset value filled in from the openai section
+        """
+        agent = getattr(self.agents, name)
+        default_model = self.openai.whisper_model if name == "transcriber" else self.openai.model
+        return replace(
+            agent,
+            model=agent.model or default_model,
+            max_tokens=agent.max_tokens if agent.max_tokens is not None else self.openai.max_tokens,
+            temperature=agent.temperature if agent.temperature is not None else self.openai.temperature,
+            max_retries=agent.max_retries if agent.max_retries is not None else self.error_handling.retry_attempts
+        )
+
+    def input_budget(self, stage):
+        """
+        Resolve how a stage's transcript is split to stay within its input-token budget
+
+        Args:
+            stage (str): "summary", "action_items" or "analysis"
+
+        Returns:
+            tuple: (threshold_tokens, chunk_tokens) - transcripts over the threshold are
+                map-reduced in chunks of chunk_tokens
+        """
+        budget = getattr(self.compression.budgets, stage)
+        threshold = self.map_reduce.threshold_tokens
+        chunk_tokens = self.map_reduce.chunk_tokens
+        if budget is None:
+            return threshold, chunk_tokens
+        return min(threshold, budget), min(chunk_tokens, budget)
+
+def _coerce(section, name, expected, value, optional=False):
+    if value is None:
+        # null only stands for "unset" where the setting defaults to None
+        if optional:
+            return None
+        raise ConfigError(f"{section}.{name}: expected {expected.__name__}, got None")
+    try:
+        if expected is bool:
+            if isinstance(value, str):
+                if value.strip().lower() not in ("true", "false", "1", "0", "yes", "no"):
+                    raise ValueError(value)
+                return value.strip().lower() in ("true", "1", "yes")
+            return bool(value)
+        if expected is int:
+            if isinstance(value, float) and not value.is_integer():
+                raise ValueError(value)
+            return int(value)
+        if expected is float:
+            return float(value)
+        if expected is str:
+            return str(value)
+        if expected is tuple:
+            return tuple(value) if isinstance(value, (list, tuple)) else tuple(str(value).split(","))
+        if expected is dict:
+            if not isinstance(value, dict):
+                raise ValueError(value)
+            return value
+    except (TypeError, ValueError):
+        raise ConfigError(f"{section}.{name}: expected {expected.__name__}, got {value!r}")
+    return value
+
+def _build_section(cls, data, section):
+    """Create a settings dataclass from its YAML mapping, ignoring keys it does not know"""
+    if data is None:
+        data = {}
+    if not isinstance(data, dict):
+        raise ConfigError(f"{section}: expected a mapping, got {data!r}")
+
+    values = {}
+    for setting in fields(cls):
+        if setting.name not in data:
+            continue
+        value = data[setting.name]
+        if isinstance(setting.type, type) and hasattr(setting.type, "__dataclass_fields__"):
+            values[setting.name] = _build_section(setting.type, value, f"{section}.{setting.name}")
+        else:
+            values[setting.name] = _coerce(section, setting.name, setting.type, value, optional=setting.default is None)
+    return cls(**values)
+
+def build_settings(config, environ=None):
+    """
+    Convert a parsed config into validated Settings
+
+    Args:
+        config (dict): Parsed configuration (environment overrides already applied)
+        environ (dict): Environment used for MOCK_MODE (defaults to os.environ)
+
+    Returns:
+        Settings: Typed configuration
+
+    Raises:
+        ConfigError: When a value has the wrong type or is out of range
+    """
+    environ = os.environ if environ is None else environ
+    crewai = config.get("crewai") or {}
+    cache = dict(config.get("cache") or {})
+    # The on/off switch predates the cache section and still lives under crewai
+    if "enabled" not in cache and "cache" in crewai:
+        cache["enabled"] = crewai["cache"]
+
+    mock_mode = get_setting(config, "mock_mode.enabled", False)
+    if "MOCK_MODE" in environ:
+        mock_mode = environ["MOCK_MODE"]
+
+    settings = Settings(
+        openai=_build_section(OpenAISettings, config.get("openai"), "openai"),
+        agents=_build_section(AgentsSettings, config.get("agents"), "agents"),
+        file_processing=_build_section(FileProcessingSettings, config.get("file_processing"), "file_processing"),
+        preprocessing=_build_section(PreprocessingSettings, config.get("preprocessing"), "preprocessing"),
+        map_reduce=_build_section(MapReduceSettings, config.get("map_reduce"), "map_reduce"),
+        compression=_build_section(CompressionSettings, config.get("compression"), "compression"),
+        live=_build_section(LiveSettings, config.get("live"), "live"),
+        followup=_build_section(FollowupSettings, config.get("followup"), "followup"),
+        output=_build_section(OutputSettings, config.get("output"), "output"),
+        cache=_build_section(CacheSettings, cache, "cache"),
+        checkpoint=_build_section(CheckpointSettings, config.get("checkpoint"), "checkpoint"),
+        action_store=_build_section(ActionStoreSettings, config.get("action_store"), "action_store"),
+        search_index=_build_section(SearchIndexSettings, config.get("search_index"), "search_index"),
+        server=_build_section(ServerSettings, config.get("server"), "server"),
+        scheduler=_build_section(SchedulerSettings, config.get("scheduler"), "scheduler"),
+        error_handling=_build_section(ErrorHandlingSettings, config.get("error_handling"), "error_handling"),
+        performance=_build_section(PerformanceSettings, config.get("performance"), "performance"),
+        pricing=_coerce("pricing", "pricing", dict, config.get("pricing") or {}),
+        mock_mode=_coerce("mock_mode", "enabled", bool, mock_mode)
+    )
+    validate_settings(settings)
+    return settings
+
+def validate_settings(settings):
+    """
+    Check value ranges and cross-field constraints
+
+    Raises:
+        ConfigError: Listing every problem found
+    """
+    problems = []
+
+    def check(condition, message):
+        if not condition:
+            problems.append(message)
+
+    openai = settings.openai
+    check(openai.max_tokens > 0, "openai.max_tokens must be positive")
+    check(0.0 <= openai.temperature <= 2.0, "openai.temperature must be between 0 and 2")
+    check(openai.requests_per_minute >= 0, "openai.requests_per_minute must be >= 0 (0 disables the limit)")
+    check(openai.tokens_per_minute >= 0, "openai.tokens_per_minute must be >= 0 (0 disables the limit)")
+    check(openai.max_connections > 0, "openai.max_connections must be positive")
+    check(0 <= openai.max_keepalive_connections <= openai.max_connections,
+          "openai.max_keepalive_connections must be between 0 and openai.max_connections")
+    check(openai.request_timeout > 0, "openai.request_timeout must be positive")
+
+    for name in ("transcriber", "summarizer", "extractor", "followup", "analyst"):
+        agent = getattr(settings.agents, name)
+        check(agent.max_tokens is None or agent.max_tokens > 0, f"agents.{name}.max_tokens must be positive")
+        check(agent.temperature is None or 0.0 <= agent.temperature <= 2.0,
+              f"agents.{name}.temperature must be between 0 and 2")
+        check(agent.max_retries is None or agent.max_retries >= 0, f"agents.{name}.max_retries must be >= 0")
+
+    files = settings.file_processing
+    check(files.max_file_size_mb > 0, "file_processing.max_file_size_mb must be positive")
+    check(files.chunk_duration_seconds > 0, "file_processing.chunk_duration_seconds must be positive")
+    check(0 <= files.chunk_overlap_seconds < files.chunk_duration_seconds,
+          "file_processing.chunk_overlap_seconds must be >= 0 and shorter than chunk_duration_seconds")
+    check(files.max_concurrent_chunks >= 1, "file_processing.max_concurrent_chunks must be at least 1")
+
+    preprocessing = settings.preprocessing
+    check(preprocessing.silence_threshold_db < 0, "preprocessing.silence_threshold_db must be negative")
+    check(preprocessing.min_silence_seconds > 2 * preprocessing.padding_seconds >= 0,
+          "preprocessing.min_silence_seconds must be longer than twice padding_seconds")
+    check(preprocessing.sample_rate >= 8000, "preprocessing.sample_rate must be at least 8000")
+    check(preprocessing.channels in (1, 2), "preprocessing.channels must be 1 or 2")
+
+    map_reduce = settings.map_reduce
+    check(map_reduce.chunk_tokens > 0, "map_reduce.chunk_tokens must be positive")
+    check(map_reduce.threshold_tokens >= map_reduce.chunk_tokens,
+          "map_reduce.threshold_tokens must be >= map_reduce.chunk_tokens")
+    check(map_reduce.chunk_summary_max_tokens > 0, "map_reduce.chunk_summary_max_tokens must be positive")
+    check(map_reduce.max_parallel_chunks >= 1, "map_reduce.max_parallel_chunks must be at least 1")
+
+    for stage in ("summary", "action_items", "analysis"):
+        budget = getattr(settings.compression.budgets, stage)
+        check(budget is None or budget > 0, f"compression.budgets.{stage} must be positive")
+
+    live = settings.live
+    check(live.window_seconds > 0, "live.window_seconds must be positive")
+    check(0 <= live.overlap_seconds < live.window_seconds,
+          "live.overlap_seconds must be >= 0 and shorter than live.window_seconds")
+    check(live.idle_timeout_seconds > 0, "live.idle_timeout_seconds must be positive")
+
+    check(settings.followup.mode in ("template", "llm"), "followup.mode must be 'template' or 'llm'")
+
+    check(settings.cache.max_size_mb > 0, "cache.max_size_mb must be positive")
+    check(settings.checkpoint.keep_runs >= 0, "checkpoint.keep_runs must be >= 0 (0 keeps every run)")
+    check(0.0 < settings.action_store.similarity <= 1.0, "action_store.similarity must be between 0 and 1")
+    check(settings.search_index.merge_factor >= 2, "search_index.merge_factor must be at least 2")
+
+    server = settings.server
+    check(0 <= server.port <= 65535, "server.port must be between 0 and 65535")
+    check(server.workers >= 1, "server.workers must be at least 1")
+    check(server.queue_size >= 1, "server.queue_size must be at least 1")
+    check(server.keep_jobs >= 1, "server.keep_jobs must be at least 1")
+    check(server.max_upload_mb > 0, "server.max_upload_mb must be positive")
+
+    scheduler = settings.scheduler
+    check(scheduler.max_active_jobs >= 0, "scheduler.max_active_jobs must be >= 0 (0 uses twice server.workers)")
+    check(scheduler.reserved_jobs >= 0, "scheduler.reserved_jobs must be >= 0")
+    check(scheduler.window_seconds > 0, "scheduler.window_seconds must be positive")
+    check(scheduler.deadline_margin_seconds >= 0, "scheduler.deadline_margin_seconds must be >= 0")
+    check(scheduler.default_weight > 0, "scheduler.default_weight must be positive")
+    check(scheduler.tenant_queue_size >= 0, "scheduler.tenant_queue_size must be >= 0 (0 uses server.queue_size)")
+    check(all(isinstance(level, int) and not isinstance(level, bool) for level in scheduler.priorities.values()),
+          "scheduler.priorities must map names to integers")
+    check(scheduler.default_priority in scheduler.priorities, "scheduler.default_priority must be one of scheduler.priorities")
+    for name, tenant in scheduler.tenants.items():
+        if not isinstance(tenant, dict):
+            check(False, f"scheduler.tenants.{name} must be a mapping")
+            continue
+        weight = tenant.get("weight", scheduler.default_weight)
+        check(isinstance(weight, (int, float)) and weight > 0, f"scheduler.tenants.{name}.weight must be positive")
+        queue_size = tenant.get("queue_size", 1)
+        check(isinstance(queue_size, int) and queue_size >= 1, f"scheduler.tenants.{name}.queue_size must be at least 1")
+
+    errors = settings.error_handling
+    check(errors.retry_attempts >= 0, "error_handling.retry_attempts must be >= 0")
+    check(errors.retry_delay >= 0, "error_handling.retry_delay must be >= 0")
+    check(errors.max_retry_delay >= errors.retry_delay, "error_handling.max_retry_delay must be >= retry_delay")
+    check(0.0 <= errors.retry_jitter <= 1.0, "error_handling.retry_jitter must be between 0 and 1")
+    check(0.0 < errors.hedging.percentile < 1.0, "error_handling.hedging.percentile must be between 0 and 1")
+    check(errors.hedging.max_per_minute >= 0, "error_handling.hedging.max_per_minute must be >= 0 (0 removes the cap)")
+    check(set(errors.hedging.operations) <= {"chat", "transcription"},
+          "error_handling.hedging.operations may only contain 'chat' and 'transcription'")
+
+    performance = settings.performance
+    check(performance.batch_size >= 1, "performance.batch_size must be at least 1")
+    check(performance.timeout_seconds >= 0, "performance.timeout_seconds must be >= 0 (0 disables it)")
+
+    if problems:
+        raise ConfigError("Invalid configuration:\n  - " + "\n  - ".join(problems))
+
+def load_settings(config_path=None):
+    """
+    Load, validate and cache the typed configuration
+
+    Args:
+        config_path (str): Path to the config file (defaults to config/config.yaml)
+
+    Returns:
+        Settings: Typed configuration, shared by every caller of the same path
+    """
+    config_path = config_path or os.getenv("MEETING_CONFIG_PATH", CONFIG_PATH)
+    if config_path not in _settings_cache:
+        _settings_cache[config_path] = build_settings(load_config(config_path))
+    return _settings_cache[config_path]
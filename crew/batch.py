@@ -0,0 +1,185 @@
+import os
+import glob
+import json
+import time
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from config.settings import load_settings
+from utils.checkpoint import RunCheckpoint, batch_run_dir
+
+def collect_recordings(source):
+    """
+    Resolve a batch source into a list of recording paths
+
+    Args:
+        source (str): A directory, a glob pattern, or a JSONL manifest whose lines
+            are either a path string or an object with a "path" field
+
+    Returns:
+        list: Recording paths in a stable order
+    """
+    if os.path.isdir(source):
+        extensions = tuple(extension.lower() for extension in load_settings().file_processing.supported_audio_formats)
+        return sorted(
+            os.path.join(source, name) for name in os.listdir(source)
+            if os.path.splitext(name)[1].lower() in extensions
+        )
+
+    if source.endswith(".jsonl") and os.path.isfile(source):
+        base_dir = os.path.dirname(os.path.abspath(source))
+        recordings = []
+        with open(source, "r", encoding="utf-8") as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                entry = json.loads(line)
+                path = entry.get("path") if isinstance(entry, dict) else entry
+                if not path or not isinstance(path, str):
+                    raise ValueError(f"Manifest line {line_number} has no path: {line}")
+                recordings.append(path if os.path.isabs(path) else os.path.join(base_dir, path))
+        return recordings
+
+    recordings = sorted(glob.glob(source, recursive=True))
+    if not recordings and os.path.isfile(source):
+        recordings = [source]
+    return recordings
+
+# Crews are expensive to build (agents, API clients), so each worker keeps one
+_thread_state = threading.local()
+_process_crew = None
+
+def _thread_crew(crew_kwargs):
+    if not hasattr(_thread_state, "crew"):
+        from crew.crew import MeetingSummarizerCrew
+        _thread_state.crew = MeetingSummarizerCrew(**crew_kwargs)
+    return _thread_state.crew
+
+def _init_process_worker(crew_kwargs):
+    global _process_crew
+    from crew.crew import MeetingSummarizerCrew
+    _process_crew = MeetingSummarizerCrew(**crew_kwargs)
+
+def _process_recording(audio_file_path, run_dir=None):
+    return _run_recording(_process_crew, audio_file_path, run_dir)
+
+def _run_recording(crew, audio_file_path, run_dir=None):
+    started = time.perf_counter()
+    try:
+        checkpoint = RunCheckpoint(run_dir, audio_file_path) if run_dir else None
+        results = crew.run_crew(audio_file_path, checkpoint=checkpoint)
+        return {
+            "path": audio_file_path,
+            "status": "ok",
+            "latency": time.perf_counter() - started,
+            "resumed_stages": results["resumed_stages"],
+            "metrics": results["metrics"]["totals"],
+            "results": results
+        }
+    except Exception as e:
+        return {
+            "path": audio_file_path,
+            "status": "error",
+            "latency": time.perf_counter() - started,
+            "error": str(e),
+            "spans": getattr(e, "spans", [])
+        }
+
+class BatchRunner:
+    """Process many recordings with a bounded pool of reusable crews"""
+
+    def __init__(self, workers=None, use_processes=False, crew_kwargs=None):
+        """
+        Args:
+            workers (int): Pool size; defaults to performance.batch_size from config.yaml
+            use_processes (bool): Use a process pool instead of a thread pool
+            crew_kwargs (dict): Keyword arguments for each worker's MeetingSummarizerCrew
+        """
+        self.crew_kwargs = crew_kwargs or {}
+        settings = self.crew_kwargs.get("settings") or load_settings()
+        self.workers = max(1, int(workers or settings.performance.batch_size))
+        self.use_processes = use_processes
+
+    def run(self, recordings, on_result=None, batch_dir=None):
+        """
+        Run the crew over every recording
+
+        Args:
+            recordings (list): Recording paths
+            on_result (callable): Optional callback invoked with (index, entry) for each
+                finished recording, e.g. to save its results
+            batch_dir (str): Optional checkpoint directory of the batch (see
+                utils.checkpoint.create_batch). Each recording checkpoints its stages
+                underneath it, so rerunning the same batch skips finished work.
+
+        Returns:
+            dict: Batch report with per-file status/latency and aggregate throughput
+        """
+        started_at = datetime.now()
+        started = time.perf_counter()
+        entries = [None] * len(recordings)
+
+        if self.use_processes:
+            executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_process_worker,
+                initargs=(self.crew_kwargs,)
+            )
+            worker = _process_recording
+        else:
+            executor = ThreadPoolExecutor(max_workers=self.workers)
+            worker = lambda path, run_dir: _run_recording(_thread_crew(self.crew_kwargs), path, run_dir)
+
+        with executor:
+            futures = {
+                executor.submit(worker, path, batch_run_dir(batch_dir, index, path) if batch_dir else None): index
+                for index, path in enumerate(recordings)
+            }
+            for future in as_completed(futures):
+                index = futures[future]
+                entry = future.result()
+                entries[index] = entry
+                status = "✅" if entry["status"] == "ok" else "❌"
+                print(f"{status} [{index + 1}/{len(recordings)}] {entry['path']} ({entry['latency']:.2f}s)")
+                if on_result:
+                    on_result(index, entry)
+
+        wall_time = time.perf_counter() - started
+        succeeded = sum(1 for entry in entries if entry["status"] == "ok")
+
+        return {
+            "started_at": started_at.isoformat(),
+            "workers": self.workers,
+            "executor": "process" if self.use_processes else "thread",
+            "total": len(recordings),
+            "succeeded": succeeded,
+            "failed": len(recordings) - succeeded,
+            "wall_time": wall_time,
+            "meetings_per_minute": (succeeded / wall_time * 60) if wall_time > 0 else 0.0,
+            "files": [
+                {key: value for key, value in entry.items() if key not in ("results", "spans")}
+                for entry in entries
+            ]
+        }
+
+def write_batch_report(report, output_dir="output"):
+    """
+    Write a batch report to a timestamped JSON file
+
+    Args:
+        report (dict): Report returned by BatchRunner.run
+        output_dir (str): Directory for the report
+
+    Returns:
+        str: Path of the written report
+    """
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    report_path = f"{output_dir}/batch_report_{timestamp}.json"
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    return report_path
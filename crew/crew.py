@@ -1,36 +1,117 @@
+import asyncio
 import os
-from crewai import Crew, Task
 from agents.transcriber_agent import TranscriberAgent
 from agents.summarizer_agent import SummarizerAgent
 from agents.extractor_agent import ExtractorAgent
 from agents.followup_agent import FollowupAgent
-from tasks.task import MeetingTasks
+from agents.analysis_agent import AnalysisAgent
+from crew.pipeline import StagePipeline
+from config.settings import load_settings
+from utils.cache import StageCache, get_stage_cache
+from utils.clients import get_client_registry
+from utils.metrics import summarize_spans
+from utils.transcript import compress_transcript
+from utils.segments import SegmentStore
+from utils.chunk_memo import ChunkMemo
 
 class MeetingSummarizerCrew:
     """Main crew class that orchestrates the meeting summarization process"""
     
-    def __init__(self):
-        # Initialize agent instances
-        self.transcriber_agent = TranscriberAgent()
-        self.summarizer_agent = SummarizerAgent()
-        self.extractor_agent = ExtractorAgent()
-        self.followup_agent = FollowupAgent()
+    def __init__(self, use_cache=None, refresh_stages=(), clients=None, settings=None):
+        """
+        Args:
+            use_cache (bool): Enable the on-disk stage cache (defaults to crewai.cache in config.yaml)
+            refresh_stages (iterable): Stage names to recompute even when cached
+            clients (ClientRegistry): API clients and rate limiter (defaults to the process-wide registry)
+            settings (Settings): Typed configuration shared with every agent (defaults to load_settings())
+        """
+        self.settings = settings or load_settings()
+        self.clients = clients or get_client_registry()
+        
+        # Stage outputs are cached on disk, keyed by their inputs
+        if use_cache is None:
+            use_cache = self.settings.cache.enabled
+        if use_cache:
+            self.cache = get_stage_cache(
+                self.settings.cache.directory,
+                self.settings.cache.max_size_mb,
+                refresh_stages
+            )
+        else:
+            self.cache = StageCache(enabled=False)
         
-        # Initialize tasks
-        self.meeting_tasks = MeetingTasks()
+        # Initialize agent instances
+        agent_options = {"cache": self.cache, "clients": self.clients, "settings": self.settings}
+        self.transcriber_agent = TranscriberAgent(**agent_options)
+        self.summarizer_agent = SummarizerAgent(**agent_options)
+        self.extractor_agent = ExtractorAgent(**agent_options)
+        self.followup_agent = FollowupAgent(**agent_options)
+        self.analysis_agent = AnalysisAgent(self.summarizer_agent, **agent_options)
         
-        # Create agents
-        self.transcriber = self.transcriber_agent.create_agent()
-        self.summarizer = self.summarizer_agent.create_agent()
-        self.extractor = self.extractor_agent.create_agent()
-        self.followup = self.followup_agent.create_agent()
+        # Stage scheduling: summarize and extract run concurrently when enabled,
+        # and a run can be capped with performance.timeout_seconds (0, the default, leaves it unbounded)
+        self.parallel_processing = self.settings.performance.parallel_processing
+        # With combined_analysis, one structured-output request yields both the summary and the action items
+        self.combined_analysis = self.settings.performance.combined_analysis
+        self.timeout_seconds = self.settings.performance.timeout_seconds
         
-    def run_crew(self, audio_file_path):
+        # CrewAI agents and tasks are only built when the CrewAI task flow is used
+        self._crewai_agents = None
+        self._meeting_tasks = None
+    
+    @property
+    def meeting_tasks(self):
+        """Task definitions, imported on first use"""
+        if self._meeting_tasks is None:
+            from tasks.task import MeetingTasks
+            self._meeting_tasks = MeetingTasks()
+        return self._meeting_tasks
+    
+    def _get_crewai_agents(self):
+        """Create the CrewAI agents on first use"""
+        if self._crewai_agents is None:
+            self._crewai_agents = {
+                "transcriber": self.transcriber_agent.create_agent(),
+                "summarizer": self.summarizer_agent.create_agent(),
+                "extractor": self.extractor_agent.create_agent(),
+                "followup": self.followup_agent.create_agent()
+            }
+        return self._crewai_agents
+    
+    @property
+    def transcriber(self):
+        """CrewAI transcriber agent, created on first use"""
+        return self._get_crewai_agents()["transcriber"]
+    
+    @property
+    def summarizer(self):
+        """CrewAI summarizer agent, created on first use"""
+        return self._get_crewai_agents()["summarizer"]
+    
+    @property
+    def extractor(self):
+        """CrewAI extractor agent, created on first use"""
+        return self._get_crewai_agents()["extractor"]
+    
+    @property
+    def followup(self):
+        """CrewAI follow-up agent, created on first use"""
+        return self._get_crewai_agents()["followup"]
+    
+    def run_crew(self, audio_file_path, streams=None, checkpoint=None, on_stage_complete=None, admission=None):
         """
         Execute the complete meeting summarization workflow
         
         Args:
             audio_file_path (str): Path to the meeting audio file
+            streams (dict): Optional TokenStream per stage ("summary", "followup_message")
+                that receives tokens as they are generated
+            checkpoint (RunCheckpoint): Optional run checkpoint; stages it already holds are
+                skipped and every newly finished stage is saved to it
+            on_stage_complete (callable): Optional callback invoked with (stage, output) as
+                each stage finishes
+            admission: Optional admission controller each stage must pass before it starts
+                (see StagePipeline), e.g. a job's slot in crew.scheduler.MeetingScheduler
             
         Returns:
             dict: Complete results including transcript, summary, action items, and follow-up
@@ -39,42 +120,449 @@ class MeetingSummarizerCrew:
             print("🎯 Starting Meeting Summarizer & Action Tracker...")
             print("=" * 60)
             
+            streams = streams or {}
+            completed, memo = self._resume_from(checkpoint, streams)
+            results = self._run_pipeline(
+                audio_file_path, streams, checkpoint, on_stage_complete, completed, memo, admission
+            )
+            
+            print("\n🎉 Meeting analysis completed successfully!")
+            print("=" * 60)
+            
+            return results
+            
+        except Exception as e:
+            if checkpoint is not None:
+                checkpoint.mark_failed(e)
+            print(f"❌ Error during crew execution: {str(e)}")
+            raise e
+    
+    async def arun_crew(self, audio_file_path, streams=None, checkpoint=None, on_stage_complete=None, admission=None):
+        """
+        Async variant of run_crew, for embedding in an asyncio service
+        
+        Args:
+            audio_file_path (str): Path to the meeting audio file
+            streams (dict): Optional TokenStream per stage ("summary", "followup_message")
+            checkpoint (RunCheckpoint): Optional run checkpoint to resume from and save to
+            on_stage_complete (callable): Optional callback invoked with (stage, output) as
+                each stage finishes
+            admission: Optional admission controller each stage must pass before it starts,
+                as in run_crew; its blocking acquire() is awaited on a worker thread
+            
+        Returns:
+            dict: Complete results including transcript, summary, action items, and follow-up
+        """
+        try:
+            print(f"🎯 Starting meeting analysis for {audio_file_path}...")
+            
+            streams = streams or {}
+            completed, memo = self._resume_from(checkpoint, streams)
+            pipeline = self._build_async_pipeline(audio_file_path, streams, memo)
+            pipeline.on_stage_complete = self._stage_callback(checkpoint, on_stage_complete)
+            pipeline.admission = admission
+            try:
+                outputs = await pipeline.arun(completed)
+            except Exception as e:
+                self._attach_spans(e, pipeline)
+                raise
+            
+            results = self._compile_results(outputs, pipeline, streams)
+            results["resumed_stages"] = list(completed)
+            self._finish_checkpoint(checkpoint, memo, results)
+            
+            print(f"🎉 Meeting analysis completed for {audio_file_path}")
+            
+            return results
+            
+        except Exception as e:
+            if checkpoint is not None:
+                checkpoint.mark_failed(e)
+            print(f"❌ Error during crew execution: {str(e)}")
+            raise e
+    
+    def revise(self, previous, transcript, checkpoint=None, streams=None):
+        """
+        Re-process a meeting after its transcript was corrected, re-running only
+        the map steps of the chunks the corrections touched
+        
+        The corrected transcript is chunked along the boundaries of the previous
+        run; the notes and action items of unchanged chunks come from that run's
+        chunk memo, and the reduce steps and follow-up run again on the result.
+        
+        Args:
+            previous (RunCheckpoint): Checkpointed run of the transcript version being corrected
+            transcript (str): Corrected transcript
+            checkpoint (RunCheckpoint): Optional new run that records the revision
+            streams (dict): Optional TokenStream per stage ("summary", "followup_message")
+            
+        Returns:
+            dict: Complete results, with map-step reuse counts under "revision"
+        """
+        try:
+            print(f"✏️  Revising run {previous.run_id} with a corrected transcript...")
+            print("=" * 60)
+            
+            previous_outputs = previous.completed_outputs()
+            if "transcript" not in previous_outputs:
+                raise ValueError(f"Run {previous.run_id} has no transcript to revise")
+            memo = ChunkMemo(previous_outputs.get("chunk_memo"))
+            previous_segments = SegmentStore.coerce(previous_outputs.get("segments") or previous_outputs["transcript"])
+            completed = {"segments": previous_segments.with_text(transcript), "transcript": transcript}
+            if checkpoint is not None:
+                for stage, output in completed.items():
+                    checkpoint.save_stage(stage, output)
+            
+            results = self._run_pipeline(previous.audio_file, streams or {}, checkpoint, None, completed, memo)
+            results["revision"] = dict(memo.stats(), revised_from=previous.run_id)
+            print(f"♻️  Revision: {results['revision']['reused']} chunk result(s) reused, "
+                  f"{results['revision']['recomputed']} recomputed")
+            
+            print("\n🎉 Meeting analysis revised successfully!")
+            print("=" * 60)
+            
+            return results
+            
+        except Exception as e:
+            if checkpoint is not None:
+                checkpoint.mark_failed(e)
+            print(f"❌ Error during revision: {str(e)}")
+            raise e
+    
+    def _run_pipeline(self, audio_file_path, streams, checkpoint, on_stage_complete, completed, memo, admission=None):
+        """Run the stage graph, skipping the completed stages, and assemble the results"""
+        pipeline = self._build_pipeline(audio_file_path, streams, memo)
+        pipeline.on_stage_complete = self._stage_callback(checkpoint, on_stage_complete)
+        pipeline.admission = admission
+        try:
+            outputs = pipeline.run(completed)
+        except Exception as e:
+            self._attach_spans(e, pipeline)
+            raise
+        
+        results = self._compile_results(outputs, pipeline, streams)
+        results["resumed_stages"] = list(completed)
+        self._finish_checkpoint(checkpoint, memo, results)
+        return results
+    
+    def _attach_spans(self, error, pipeline):
+        """Attach the spans of the stages that ran to a failed run's exception, for metrics exports"""
+        error.spans = pipeline.span_report(self.settings.pricing)
+    
+    @staticmethod
+    def _finish_checkpoint(checkpoint, memo, results):
+        """Save the chunk memo (for later revisions) and mark the run completed"""
+        if checkpoint is None:
+            return
+        checkpoint.save_stage("chunk_memo", memo.to_dict())
+        checkpoint.mark_completed()
+        results["run_id"] = checkpoint.run_id
+    
+    async def arun_many(self, audio_file_paths, max_concurrency=None):
+        """
+        Process many meetings on the current event loop, at most max_concurrency at a time
+        
+        Args:
+            audio_file_paths (list): Paths to the meeting audio files
+            max_concurrency (int): In-flight meeting limit (defaults to performance.batch_size)
+            
+        Returns:
+            list: Results dict, or the raised exception, for each path in order
+        """
+        if max_concurrency is None:
+            max_concurrency = self.settings.performance.batch_size
+        semaphore = asyncio.Semaphore(max(1, int(max_concurrency)))
+        
+        async def run_one(audio_file_path):
+            async with semaphore:
+                return await self.arun_crew(audio_file_path)
+        
+        return await asyncio.gather(
+            *(run_one(audio_file_path) for audio_file_path in audio_file_paths),
+            return_exceptions=True
+        )
+    
+    @staticmethod
+    def _stage_callback(checkpoint, on_stage_complete):
+        """Combine checkpoint saving with the caller's stage callback"""
+        callbacks = [callback for callback in (checkpoint.save_stage if checkpoint is not None else None,
+                                                on_stage_complete) if callback is not None]
+        if not callbacks:
+            return None
+        
+        def stage_complete(stage, output):
+            for callback in callbacks:
+                callback(stage, output)
+        
+        return stage_complete
+    
+    def _resume_from(self, checkpoint, streams):
+        """
+        Load the stage outputs a checkpoint already holds
+
+        Args:
+            checkpoint (RunCheckpoint): Run to resume, or None
+            streams (dict): TokenStream per stage; resumed stages are replayed into them
+
+        Returns:
+            tuple: (outputs of the stages to skip, ChunkMemo recording this run's map outputs)
+        """
+        if checkpoint is None:
+            return {}, ChunkMemo(enabled=False)
+        
+        completed = checkpoint.completed_outputs()
+        memo = ChunkMemo(completed.pop("chunk_memo", None))
+        if "transcript" in completed and "segments" not in completed:
+            # Checkpointed before transcripts kept their timings; rebuild estimated ones rather than re-transcribe
+            completed["segments"] = SegmentStore.from_text(completed["transcript"])
+        if self.combined_analysis and "analysis" not in completed and {"summary", "action_items"} <= set(completed):
+            # Checkpointed by the two-request flow; nothing left for the combined stage to do
+            completed["analysis"] = {"summary": completed["summary"], "action_items": completed["action_items"]}
+        if completed:
+            print(f"♻️  Resuming run {checkpoint.run_id}: skipping {', '.join(completed)}")
+        for stage, stream in streams.items():
+            if stage in completed:
+                stream.replay(completed[stage])
+        return completed, memo
+    
+    def _compile_results(self, outputs, pipeline, streams):
+        """Assemble the results dict from the stage outputs and run statistics"""
+        spans = pipeline.span_report(self.settings.pricing)
+        results = {
+            "transcript": outputs["transcript"],
+            "segments": SegmentStore.coerce(outputs["segments"]),
+            "summary": outputs["summary"],
+            "action_items": outputs["action_items"],
+            "followup_message": outputs["followup_message"],
+            "performance": pipeline.report(),
+            "metrics": {"spans": spans, "totals": summarize_spans(spans)},
+            "cache": self._cache_stats(spans)
+        }
+        compressed = outputs.get("compressed_transcript") or {}
+        if compressed.get("stats"):
+            results["compression"] = compressed["stats"]
+        if streams:
+            results["streaming"] = {stage: stream.metrics() for stage, stream in streams.items()}
+        
+        self._print_performance(results["performance"], results["metrics"])
+        if results.get("compression"):
+            compression = results["compression"]
+            print(f"   Transcript compression: {compression['tokens_saved']} of {compression['original_tokens']} "
+                  f"prompt tokens saved ({compression['fillers_removed']} fillers, {compression['repeats_removed']} repeats)")
+        for stage, metrics in results.get("streaming", {}).items():
+            if metrics["time_to_first_token"] is not None:
+                print(f"   Time to first token ({stage}): {metrics['time_to_first_token']:.2f}s")
+        if self.cache.enabled:
+            cache_stats = results["cache"]
+            print(f"🗄️  Stage cache: {sum(cache_stats['hits'].values())} hits, "
+                  f"{sum(cache_stats['misses'].values())} misses")
+        
+        return results
+    
+    def _build_pipeline(self, audio_file_path, streams, memo=None):
+        """
+        Build the stage graph: transcribe -> compress -> {summarize, extract} -> follow-up
+        (or transcribe -> compress -> analyze -> follow-up with performance.combined_analysis).
+        Transcription yields timestamped segments; the plain transcript is derived from them.
+        
+        Args:
+            audio_file_path (str): Path to the meeting audio file
+            streams (dict): Optional TokenStream per stage
+            memo (ChunkMemo): Map-step outputs by chunk, reused and recorded by the agents
+            
+        Returns:
+            StagePipeline: Pipeline ready to run
+        """
+        pipeline = StagePipeline(parallel=self.parallel_processing, timeout=self.timeout_seconds)
+        title = os.path.splitext(os.path.basename(audio_file_path))[0]
+        
+        def transcribe():
             # Step 1: Transcribe audio
             print("\n📝 Step 1: Transcribing audio...")
-            transcript = self.transcriber_agent.transcribe_audio(audio_file_path)
-            print("✅ Transcription completed")
-            
+            segments = self.transcriber_agent.transcribe_segments(audio_file_path)
+            print(f"✅ Transcription completed ({len(segments)} segments)")
+            return segments
+        
+        def summarize(compressed_transcript):
             # Step 2: Create summary
             print("\n📋 Step 2: Generating meeting summary...")
-            summary = self.summarizer_agent.summarize_meeting(transcript)
+            summary = self.summarizer_agent.summarize_meeting(
+                compressed_transcript["text"], stream=streams.get("summary"), memo=memo
+            )
             print("✅ Summary generated")
-            
+            return summary
+        
+        def extract(compressed_transcript):
             # Step 3: Extract action items
             print("\n🎯 Step 3: Extracting action items...")
-            action_items = self.extractor_agent.extract_action_items(transcript)
+            action_items = self.extractor_agent.extract_action_items(compressed_transcript["text"], memo=memo)
             print("✅ Action items extracted")
-            
+            return action_items
+        
+        def followup(summary, action_items):
             # Step 4: Create follow-up message
             print("\n📧 Step 4: Creating follow-up message...")
-            followup_message = self.followup_agent.create_followup_message(summary, action_items)
+            followup_message = self.followup_agent.create_followup_message(
+                summary, action_items, stream=streams.get("followup_message"), title=title
+            )
             print("✅ Follow-up message created")
+            return followup_message
+        
+        def analyze(compressed_transcript):
+            # Steps 2 and 3 in one request: summary and action items
+            print("\n📋 Steps 2-3: Generating meeting summary and extracting action items...")
+            analysis = self.analysis_agent.analyze_meeting(compressed_transcript["text"], memo=memo)
+            print("✅ Summary and action items generated")
+            return analysis
+        
+        pipeline.add_stage("segments", transcribe)
+        pipeline.add_stage("transcript", self._segments_text, depends_on=["segments"])
+        pipeline.add_stage("compressed_transcript", self._compress_transcript, depends_on=["transcript"])
+        if self.combined_analysis:
+            self._add_analysis_stages(pipeline, analyze, streams)
+        else:
+            pipeline.add_stage("summary", summarize, depends_on=["compressed_transcript"])
+            pipeline.add_stage("action_items", extract, depends_on=["compressed_transcript"])
+        pipeline.add_stage("followup_message", followup, depends_on=["summary", "action_items"])
+        
+        return pipeline
+    
+    def _add_analysis_stages(self, pipeline, analyze, streams, is_async=False):
+        """
+        Add the combined analysis stage and split its output into the summary and
+        action_items stages, so checkpoints, results and the follow-up stage see
+        the same stage outputs as in the two-request flow
+        """
+        def summary(analysis):
+            # The structured response cannot be streamed token by token, so the summary is replayed whole
+            if streams.get("summary"):
+                streams["summary"].replay(analysis["summary"])
+            return analysis["summary"]
+        
+        def action_items(analysis):
+            return analysis["action_items"]
+        
+        if is_async:
+            summary, action_items = self._as_coroutine(summary), self._as_coroutine(action_items)
+        
+        pipeline.add_stage("analysis", analyze, depends_on=["compressed_transcript"])
+        pipeline.add_stage("summary", summary, depends_on=["analysis"])
+        pipeline.add_stage("action_items", action_items, depends_on=["analysis"])
+    
+    @staticmethod
+    def _segments_text(segments):
+        """Plain transcript of the segments (a checkpointed stage holds their dict form)"""
+        return SegmentStore.coerce(segments).text
+    
+    def _compress_transcript(self, transcript):
+        """
+        Shrink the transcript that goes into the prompts (the verbatim transcript stays in the results)
+        
+        Returns:
+            dict: {"text": prompt transcript, "stats": token counts and removals, or None when disabled}
+        """
+        compression = self.settings.compression
+        if not compression.enabled:
+            return {"text": transcript, "stats": None}
+        
+        text, stats = compress_transcript(
+            transcript,
+            remove_fillers=compression.remove_fillers,
+            collapse_repeats=compression.collapse_repeats
+        )
+        if stats["original_tokens"]:
+            print(f"🗜️  Transcript compressed: {stats['original_tokens']} → {stats['compressed_tokens']} tokens "
+                  f"({stats['tokens_saved'] / stats['original_tokens']:.0%} saved)")
+        return {"text": text, "stats": stats}
+    
+    @staticmethod
+    def _as_coroutine(func):
+        """Wrap a synchronous stage function as a coroutine function for the async pipeline"""
+        async def run(**kwargs):
+            return func(**kwargs)
+        return run
+    
+    def _build_async_pipeline(self, audio_file_path, streams, memo=None):
+        """
+        Build the same stage graph as _build_pipeline from the agents' async methods
+        
+        Args:
+            audio_file_path (str): Path to the meeting audio file
+            streams (dict): Optional TokenStream per stage
+            memo (ChunkMemo): Map-step outputs by chunk, reused and recorded by the agents
             
-            # Compile results
-            results = {
-                "transcript": transcript,
-                "summary": summary,
-                "action_items": action_items,
-                "followup_message": followup_message
-            }
-            
-            print("\n🎉 Meeting analysis completed successfully!")
-            print("=" * 60)
-            
-            return results
-            
-        except Exception as e:
-            print(f"❌ Error during crew execution: {str(e)}")
-            raise e
+        Returns:
+            StagePipeline: Pipeline ready for arun()
+        """
+        pipeline = StagePipeline(parallel=self.parallel_processing, timeout=self.timeout_seconds)
+        title = os.path.splitext(os.path.basename(audio_file_path))[0]
+        
+        async def transcribe():
+            return await self.transcriber_agent.atranscribe_segments(audio_file_path)
+        
+        async def summarize(compressed_transcript):
+            return await self.summarizer_agent.asummarize_meeting(
+                compressed_transcript["text"], stream=streams.get("summary"), memo=memo
+            )
+        
+        async def extract(compressed_transcript):
+            return await self.extractor_agent.aextract_action_items(compressed_transcript["text"], memo=memo)
+        
+        async def followup(summary, action_items):
+            return await self.followup_agent.acreate_followup_message(
+                summary, action_items, stream=streams.get("followup_message"), title=title
+            )
+        
+        async def analyze(compressed_transcript):
+            return await self.analysis_agent.aanalyze_meeting(compressed_transcript["text"], memo=memo)
+        
+        pipeline.add_stage("segments", transcribe)
+        pipeline.add_stage("transcript", self._as_coroutine(self._segments_text), depends_on=["segments"])
+        pipeline.add_stage("compressed_transcript", self._as_coroutine(self._compress_transcript), depends_on=["transcript"])
+        if self.combined_analysis:
+            self._add_analysis_stages(pipeline, analyze, streams, is_async=True)
+        else:
+            pipeline.add_stage("summary", summarize, depends_on=["compressed_transcript"])
+            pipeline.add_stage("action_items", extract, depends_on=["compressed_transcript"])
+        pipeline.add_stage("followup_message", followup, depends_on=["summary", "action_items"])
+        
+        return pipeline
+    
+    def _cache_stats(self, spans):
+        """Cache size plus the hits and misses of this run's stages (the cache is shared by every crew)"""
+        stats = self.cache.stats()
+        stats["hits"] = {}
+        stats["misses"] = {}
+        for span in spans:
+            for key in ("hits", "misses"):
+                for stage, count in span[f"cache_{key}"].items():
+                    stats[key][stage] = stats[key].get(stage, 0) + count
+        return stats
+    
+    def _print_performance(self, performance, metrics):
+        """Print the stage timings, token usage and critical path of a run"""
+        mode = "parallel" if performance["parallel"] else "sequential"
+        print(f"\n⏱️  Pipeline timings ({mode}):")
+        for span in metrics["spans"]:
+            details = []
+            if span["prompt_tokens"] or span["completion_tokens"]:
+                details.append(f"{span['prompt_tokens']} in / {span['completion_tokens']} out tokens")
+            if span["audio_seconds"]:
+                details.append(f"{span['audio_seconds']:.0f}s audio")
+            if span["audio_bytes_saved"] or span["audio_seconds_trimmed"]:
+                details.append(f"{span['audio_bytes_saved'] / (1024 * 1024):.1f} MB / "
+                               f"{span['audio_seconds_trimmed']:.0f}s saved by pre-processing")
+            if span["retries"]:
+                details.append(f"{span['retries']} retries")
+            if span["hedges"]:
+                details.append(f"{span['hedges']} hedged")
+            if span["rate_limit_wait"] >= 0.01:
+                details.append(f"{span['rate_limit_wait']:.2f}s rate-limited")
+            print(f"   - {span['stage']}: {span['wall_time']:.2f}s" + (f" ({', '.join(details)})" if details else ""))
+        print(f"   Critical path: {' → '.join(performance['critical_path'])} "
+              f"({performance['critical_path_latency']:.2f}s, wall time {performance['wall_time']:.2f}s)")
+        if metrics["totals"]["cost_usd"]:
+            print(f"   Estimated API cost: ${metrics['totals']['cost_usd']:.4f}")
     
     def create_crew_with_tasks(self, audio_file_path):
         """
@@ -86,6 +574,8 @@ class MeetingSummarizerCrew:
         Returns:
             Crew: Configured CrewAI crew instance
         """
+        from crewai import Crew, Task
+        
         # Create tasks
         transcription_task = Task(
             description=f"Transcribe the audio file located at {audio_file_path} into clear, readable text",
@@ -120,12 +610,13 @@ class MeetingSummarizerCrew:
         
         return crew
     
-    def display_results(self, results):
+    def display_results(self, results, skip_sections=()):
         """
         Display the results in a formatted way
         
         Args:
             results (dict): Results from the crew execution
+            skip_sections (iterable): Result keys already shown (e.g. streamed to the console)
         """
         print("\n" + "=" * 80)
         print("📋 MEETING ANALYSIS RESULTS")
@@ -135,9 +626,10 @@ class MeetingSummarizerCrew:
         print("-" * 40)
         print(results["transcript"])
         
-        print("\n📋 SUMMARY:")
-        print("-" * 40)
-        print(results["summary"])
+        if "summary" not in skip_sections:
+            print("\n📋 SUMMARY:")
+            print("-" * 40)
+            print(results["summary"])
         
         print("\n🎯 ACTION ITEMS:")
         print("-" * 40)
@@ -153,8 +645,9 @@ class MeetingSummarizerCrew:
         else:
             print("No action items found.")
         
-        print("\n📧 FOLLOW-UP MESSAGE:")
-        print("-" * 40)
-        print(results["followup_message"])
+        if "followup_message" not in skip_sections:
+            print("\n📧 FOLLOW-UP MESSAGE:")
+            print("-" * 40)
+            print(results["followup_message"])
         
         print("\n" + "=" * 80)
@@ -0,0 +1,174 @@
+import os
+import sys
+import json
+import time
+import tempfile
+import threading
+from utils.audio import open_pcm_stream, write_wav
+from utils.transcript import merge_overlap, compress_transcript
+from utils.action_items import merge_action_items
+
+SAMPLE_RATE = 16000
+BYTES_PER_SECOND = SAMPLE_RATE * 2
+
+def print_event(event):
+    """Default event sink: one JSON object per line on stdout"""
+    sys.stdout.write(json.dumps(event, ensure_ascii=False) + "\n")
+    sys.stdout.flush()
+
+class LiveMeetingSession:
+    """
+    Incremental transcription and rolling analysis of a meeting in progress.
+
+    Audio is decoded as it arrives and cut into fixed windows (with a small
+    overlap). Each closed window is transcribed straight away. A background
+    analysis thread folds the new transcript text into a rolling summary and
+    action-item list. Every update is emitted as a JSON event, so the final
+    summary is ready right after the last window instead of minutes after
+    the meeting ends.
+
+    Event types: "transcript", "summary", "action_items", "final" and "error".
+    """
+
+    def __init__(self, crew, emit=None, window_seconds=None, overlap_seconds=None, idle_timeout=None):
+        """
+        Args:
+            crew (MeetingSummarizerCrew): Crew whose agents do the work
+            emit (callable): Receives each event dict (defaults to JSON lines on stdout)
+            window_seconds (float): Audio window length (defaults to live.window_seconds)
+            overlap_seconds (float): Overlap between windows (defaults to live.overlap_seconds)
+            idle_timeout (float): Seconds without new audio before a growing file counts as finished
+        """
+        live_settings = crew.settings.live
+        self.crew = crew
+        self.emit = emit or print_event
+        self.window_seconds = window_seconds or live_settings.window_seconds
+        self.overlap_seconds = overlap_seconds if overlap_seconds is not None else live_settings.overlap_seconds
+        self.idle_timeout = idle_timeout or live_settings.idle_timeout_seconds
+
+        self.transcript = ""
+        self.summary = ""
+        self.action_items = []
+        self._pending_text = []
+        self._finished = False
+        self._condition = threading.Condition()
+        self._started = None
+
+    def run(self, source):
+        """
+        Process a live source until it ends
+
+        Args:
+            source (str): Path of a recording that is still being written, or "-" for stdin
+
+        Returns:
+            dict: Final transcript, summary, action items and follow-up message
+        """
+        self._started = time.perf_counter()
+        analyzer = threading.Thread(target=self._analysis_loop, name="live-analysis", daemon=True)
+        analyzer.start()
+
+        process = open_pcm_stream(source, SAMPLE_RATE, self.idle_timeout)
+        window_bytes = int(self.window_seconds * BYTES_PER_SECOND)
+        overlap_bytes = int(self.overlap_seconds * BYTES_PER_SECOND)
+        # Keep frames aligned to whole 16-bit samples
+        overlap_bytes -= overlap_bytes % 2
+
+        try:
+            with tempfile.TemporaryDirectory(prefix="meeting_live_") as window_dir:
+                buffer = b""
+                window_index = 0
+                window_start = 0.0
+
+                while True:
+                    data = process.stdout.read(window_bytes - len(buffer))
+                    if data:
+                        buffer += data
+                    if len(buffer) >= window_bytes or (not data and len(buffer) > overlap_bytes):
+                        self._transcribe_window(window_dir, window_index, window_start, buffer)
+                        window_index += 1
+                        window_start += (len(buffer) - overlap_bytes) / BYTES_PER_SECOND
+                        buffer = buffer[-overlap_bytes:] if overlap_bytes and data else b""
+                    if not data:
+                        break
+        finally:
+            process.stdout.close()
+            process.wait()
+
+            with self._condition:
+                self._finished = True
+                self._condition.notify()
+            analyzer.join()
+
+        title = os.path.splitext(os.path.basename(source))[0] if source != "-" else None
+        followup_message = self.crew.followup_agent.create_followup_message(
+            self.summary, self.action_items, title=title
+        )
+        results = {
+            "transcript": self.transcript,
+            "summary": self.summary,
+            "action_items": self.action_items,
+            "followup_message": followup_message
+        }
+        self._emit("final", **results)
+        return results
+
+    def _transcribe_window(self, window_dir, index, start, pcm_bytes):
+        window_path = write_wav(os.path.join(window_dir, f"window_{index:05d}.wav"), pcm_bytes, SAMPLE_RATE)
+        try:
+            text = self.crew.transcriber_agent.transcribe_audio(window_path)
+        except Exception as e:
+            self._emit("error", window=index, error=str(e))
+            return
+        finally:
+            os.remove(window_path)
+
+        previous_words = self.transcript.split()
+        self.transcript = merge_overlap(self.transcript, text)
+
+        # Only the words the overlap merge actually added are new to the analysis
+        merged_words = self.transcript.split()
+        common = 0
+        while common < min(len(previous_words), len(merged_words)) and previous_words[common] == merged_words[common]:
+            common += 1
+        new_text = " ".join(merged_words[common:])
+
+        self._emit("transcript", window=index, start=start,
+                   end=start + len(pcm_bytes) / BYTES_PER_SECOND, text=new_text)
+
+        if new_text:
+            with self._condition:
+                self._pending_text.append(new_text)
+                self._condition.notify()
+
+    def _analysis_loop(self):
+        """Fold pending transcript text into the summary and action items, batching whatever piled up"""
+        while True:
+            with self._condition:
+                while not self._pending_text and not self._finished:
+                    self._condition.wait()
+                if not self._pending_text and self._finished:
+                    return
+                new_text = " ".join(self._pending_text)
+                self._pending_text = []
+
+            compression = self.crew.settings.compression
+            if compression.enabled:
+                new_text, _ = compress_transcript(new_text, compression.remove_fillers, compression.collapse_repeats)
+                if not new_text:
+                    continue
+
+            try:
+                self.summary = self.crew.summarizer_agent.update_summary(self.summary, new_text)
+                self._emit("summary", summary=self.summary)
+
+                new_items = self.crew.extractor_agent.extract_action_items(new_text)
+                self.action_items = merge_action_items([self.action_items, new_items])
+                self._emit("action_items", action_items=self.action_items)
+            except Exception as e:
+                self._emit("error", error=str(e))
+
+    def _emit(self, event_type, **fields):
+        event = {"type": event_type, "elapsed": round(time.perf_counter() - self._started, 3)}
+        event.update(fields)
+        self.emit(event)
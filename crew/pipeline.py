@@ -0,0 +1,432 @@
+import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from utils.metrics import StageSpan, activate_span
+
+class PipelineTimeout(TimeoutError):
+    """Raised when a pipeline run exceeds its time budget"""
+
+class PipelineStage:
+    """A single named step of the meeting pipeline and the stages it depends on"""
+
+    def __init__(self, name, func, depends_on=()):
+        self.name = name
+        self.func = func
+        self.depends_on = tuple(depends_on)
+
+class StagePipeline:
+    """
+    Small dependency-graph executor for the meeting pipeline.
+
+    Each stage receives the outputs of the stages it depends on as keyword
+    arguments named after those stages. Stages whose dependencies are all
+    satisfied run concurrently on a thread pool (or as asyncio tasks via
+    arun() when the stage functions are coroutines); with parallel=False they
+    run one at a time in the order they were added.
+
+    Every stage runs under a StageSpan, so API calls made inside it are
+    attributed to that stage (see utils/metrics.py).
+
+    Outputs of stages that already finished in an earlier run can be passed
+    to run()/arun() as `completed`; those stages are skipped. on_stage_complete
+    is called with (name, output) as each stage finishes, e.g. to checkpoint it.
+
+    With a timeout, the run raises PipelineTimeout once that many seconds have
+    passed. Stages still in flight are cancelled where possible (async) or
+    abandoned to finish in the background (threads).
+
+    An admission controller (e.g. crew.scheduler.MeetingScheduler) can gate
+    run() and arun() stage by stage: admission.acquire(name, remaining, stopped) blocks
+    until the stage may start and admission.release(name, span) is called once
+    it has finished. acquire() returns False to give up when remaining() - the
+    seconds left of the time budget, None without one - reaches 0, or when
+    stopped() reports that the run has failed. Time spent waiting for admission shows
+    up as the span's queue_wait; while every pending stage is waiting and none
+    is running, the run is parked and its timeout clock stops.
+    """
+
+    def __init__(self, parallel=True, max_workers=None, on_stage_complete=None, timeout=None, admission=None):
+        self.parallel = parallel
+        self.max_workers = max_workers
+        self.on_stage_complete = on_stage_complete
+        self.timeout = timeout or None
+        self.admission = admission
+        self.stages = {}
+        self._reset_clock()
+        self.timings = {}
+        self.spans = {}
+
+    def add_stage(self, name, func, depends_on=()):
+        """
+        Register a stage
+
+        Args:
+            name (str): Stage name, also used as the key of its output
+            func (callable): Called with the dependency outputs as keyword arguments
+            depends_on (iterable): Names of stages that must finish first
+        """
+        if name in self.stages:
+            raise ValueError(f"Stage already registered: {name}")
+        for dependency in depends_on:
+            if dependency not in self.stages:
+                raise ValueError(f"Stage '{name}' depends on unknown stage '{dependency}'")
+        self.stages[name] = PipelineStage(name, func, depends_on)
+
+    def run(self, completed=None):
+        """
+        Execute every stage, respecting dependencies
+
+        Args:
+            completed (dict): Outputs of stages to skip, keyed by stage name
+
+        Returns:
+            dict: Stage outputs keyed by stage name
+        """
+        self.timings = {}
+        self.spans = {}
+        self._reset_clock()
+        outputs = self._skip_completed(completed)
+
+        if self.parallel and len(self.stages) > 1:
+            outputs = self._run_parallel(outputs)
+        else:
+            outputs = self._run_sequential(outputs)
+
+        self.wall_time = time.perf_counter() - self._run_started
+        return outputs
+
+    async def arun(self, completed=None):
+        """
+        Execute every stage on the running event loop; stage functions must be coroutine functions
+
+        Args:
+            completed (dict): Outputs of stages to skip, keyed by stage name
+
+        Returns:
+            dict: Stage outputs keyed by stage name
+        """
+        self.timings = {}
+        self.spans = {}
+        self._reset_clock()
+        outputs = self._skip_completed(completed)
+
+        if self.parallel and len(self.stages) > 1:
+            outputs = await self._arun_parallel(outputs)
+        else:
+            for stage in self.stages.values():
+                if stage.name not in outputs:
+                    try:
+                        outputs[stage.name] = await self._arun_stage(stage, outputs, bounded=True)
+                    except asyncio.TimeoutError:
+                        raise PipelineTimeout(f"Pipeline exceeded its {self.timeout:g}s timeout")
+                    self._stage_completed(stage.name, outputs[stage.name])
+
+        self.wall_time = time.perf_counter() - self._run_started
+        return outputs
+
+    async def _arun_stage(self, stage, outputs, ready_at=None, bounded=False):
+        """Run one stage on the event loop; bounded cancels it once the time budget runs out"""
+        kwargs = {dependency: outputs[dependency] for dependency in stage.depends_on}
+        if self.admission is not None:
+            ready_at = ready_at or time.perf_counter()
+            await self._aadmit(stage)
+        span = self._start_span(stage, ready_at)
+        error = None
+        try:
+            with activate_span(span):
+                if bounded:
+                    return await asyncio.wait_for(stage.func(**kwargs), self._remaining())
+                return await stage.func(**kwargs)
+        except BaseException as e:
+            error = e
+            self._flag_failure(e)
+            raise
+        finally:
+            self._finish_span(span, error)
+            if self.admission is not None:
+                self._release(stage, span)
+
+    async def _aadmit(self, stage):
+        """Wait for the admission controller on a worker thread, so the event loop keeps running"""
+        admit = asyncio.ensure_future(asyncio.to_thread(self._admit, stage))
+        try:
+            await asyncio.shield(admit)
+        except asyncio.CancelledError:
+            # The waiting thread cannot be interrupted: make it give up, and hand back
+            # the slot if it was admitted anyway
+            self._aborted = True
+
+            def release_if_admitted(future):
+                if not future.cancelled() and future.exception() is None:
+                    self._release(stage, StageSpan(stage.name))
+
+            admit.add_done_callback(release_if_admitted)
+            raise
+
+    async def _arun_parallel(self, outputs):
+        pending = {name: stage for name, stage in self.stages.items() if name not in outputs}
+        running = {}
+
+        try:
+            while pending or running:
+                ready = [
+                    stage for stage in pending.values()
+                    if all(dependency in outputs for dependency in stage.depends_on)
+                ]
+                for stage in ready:
+                    del pending[stage.name]
+                    running[asyncio.ensure_future(
+                        self._arun_stage(stage, dict(outputs), time.perf_counter())
+                    )] = stage.name
+
+                done, _ = await asyncio.wait(running, timeout=self._remaining(), return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    self._remaining()
+                for task in done:
+                    name = running.pop(task)
+                    outputs[name] = task.result()
+                    self._stage_completed(name, outputs[name])
+        finally:
+            for task in running:
+                task.cancel()
+
+        return outputs
+
+    def _run_stage(self, stage, outputs, ready_at=None):
+        kwargs = {dependency: outputs[dependency] for dependency in stage.depends_on}
+        if self.admission is not None:
+            ready_at = ready_at or time.perf_counter()
+            self._admit(stage)
+        span = self._start_span(stage, ready_at)
+        error = None
+        try:
+            with activate_span(span):
+                return stage.func(**kwargs)
+        except BaseException as e:
+            error = e
+            self._flag_failure(e)
+            raise
+        finally:
+            self._finish_span(span, error)
+            if self.admission is not None:
+                self._release(stage, span)
+
+    def _flag_failure(self, error):
+        """Flag the failure before the stage's slot is released, so no waiting sibling takes it"""
+        if self._failure is None:
+            self._failure = error
+        self._aborted = True
+
+    def _release(self, stage, span):
+        self._count_stages(running=-1)
+        self.admission.release(stage.name, span)
+
+    def _admit(self, stage):
+        """Wait for the admission controller; raises PipelineTimeout if the run ends first"""
+        self._count_stages(waiting=1)
+        admitted = False
+        try:
+            admitted = self.admission.acquire(stage.name, self._admission_remaining, self._stopped)
+        finally:
+            self._count_stages(waiting=-1, running=1 if admitted else 0)
+        if not admitted:
+            if self._aborted:
+                raise PipelineTimeout(f"Pipeline stopped before stage '{stage.name}' was admitted")
+            raise PipelineTimeout(f"Pipeline exceeded its {self.timeout:g}s timeout before stage '{stage.name}' was admitted")
+
+    def _reset_clock(self):
+        self._run_started = time.perf_counter()
+        self._aborted = False
+        self._failure = None
+        self._clock_lock = threading.Lock()
+        self._waiting_stages = 0
+        self._running_stages = 0
+        self._parked_since = None
+        self._parked_total = 0.0
+
+    def _count_stages(self, waiting=0, running=0):
+        """Track stages waiting for admission and running; the run is parked while only waiting ones exist"""
+        with self._clock_lock:
+            now = time.perf_counter()
+            if self._parked_since is not None:
+                self._parked_total += now - self._parked_since
+                self._parked_since = None
+            self._waiting_stages += waiting
+            self._running_stages += running
+            if self._waiting_stages and not self._running_stages:
+                self._parked_since = now
+
+    def _elapsed(self):
+        """Seconds the run has been going, not counting time parked waiting for admission"""
+        with self._clock_lock:
+            now = time.perf_counter()
+            parked = self._parked_total + (now - self._parked_since if self._parked_since is not None else 0.0)
+            return now - self._run_started - parked
+
+    def _stopped(self):
+        """True once a stage failed or the run timed out; stages waiting for admission then give up"""
+        return self._aborted
+
+    def _admission_remaining(self):
+        if self.timeout is None:
+            return None
+        return max(0.0, self.timeout - self._elapsed())
+
+    def _start_span(self, stage, ready_at):
+        span = StageSpan(stage.name, ready_at)
+        self.spans[stage.name] = span
+        span.start()
+        return span
+
+    def _finish_span(self, span, error):
+        span.finish(error)
+        self.timings[span.stage] = {
+            "start": span.started_at - self._run_started,
+            "end": span.finished_at - self._run_started,
+            "duration": span.finished_at - span.started_at
+        }
+
+    def _remaining(self):
+        """Seconds left of the run's time budget (None without a timeout)"""
+        if self.timeout is None:
+            return None
+        remaining = self.timeout - self._elapsed()
+        if remaining <= 0:
+            raise PipelineTimeout(f"Pipeline exceeded its {self.timeout:g}s timeout")
+        return remaining
+
+    def _skip_completed(self, completed):
+        """Seed the outputs with already finished stages"""
+        return {name: value for name, value in (completed or {}).items() if name in self.stages}
+
+    def _stage_completed(self, name, output):
+        if self.on_stage_complete:
+            self.on_stage_complete(name, output)
+
+    def _run_sequential(self, outputs):
+        for stage in self.stages.values():
+            if stage.name not in outputs:
+                # Synchronous stages cannot be interrupted, so the budget is checked between them
+                self._remaining()
+                outputs[stage.name] = self._run_stage(stage, outputs)
+                self._stage_completed(stage.name, outputs[stage.name])
+        return outputs
+
+    def _run_parallel(self, outputs):
+        pending = {name: stage for name, stage in self.stages.items() if name not in outputs}
+        running = {}
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        abandoned = False
+        try:
+            while pending or running:
+                ready = [
+                    stage for stage in pending.values()
+                    if all(dependency in outputs for dependency in stage.depends_on)
+                ]
+                for stage in ready:
+                    del pending[stage.name]
+                    running[executor.submit(self._run_stage, stage, dict(outputs), time.perf_counter())] = stage.name
+
+                try:
+                    done, _ = wait(running, timeout=self._remaining(), return_when=FIRST_COMPLETED)
+                    if not done:
+                        self._remaining()
+                except PipelineTimeout:
+                    abandoned = True
+                    # Stages still waiting for admission give up instead of running for a dead run
+                    self._aborted = True
+                    raise
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        outputs[name] = future.result()
+                    except Exception:
+                        self._aborted = True
+                        abandoned = True
+                        for other in running:
+                            other.cancel()
+                        # Keep the outputs of siblings that already finished for a resume;
+                        # the ones still in flight are left to finish in the background
+                        for other, other_name in running.items():
+                            if other.done() and not other.cancelled() and other.exception() is None:
+                                self._stage_completed(other_name, other.result())
+                        # A sibling that gave up waiting for admission may be seen first; report the real failure
+                        if self._failure is not None:
+                            raise self._failure
+                        raise
+                    self._stage_completed(name, outputs[name])
+        finally:
+            # After a timeout or a failure, do not block on the stages still running
+            executor.shutdown(wait=not abandoned)
+
+        return outputs
+
+    def critical_path(self):
+        """
+        Find the chain of dependent stages with the largest total duration
+
+        Returns:
+            tuple: (list of stage names on the critical path, latency in seconds)
+        """
+        path_latency = {}
+        path_parent = {}
+
+        for stage in self.stages.values():
+            if stage.name not in self.timings:
+                continue
+            parent = None
+            parent_latency = 0.0
+            for dependency in stage.depends_on:
+                # Stages skipped on resume did not run, so they are not part of the path
+                if dependency not in path_latency:
+                    continue
+                if path_latency[dependency] > parent_latency or parent is None:
+                    parent = dependency
+                    parent_latency = path_latency[dependency]
+            path_latency[stage.name] = parent_latency + self.timings[stage.name]["duration"]
+            path_parent[stage.name] = parent
+
+        if not path_latency:
+            return [], 0.0
+
+        last = max(path_latency, key=path_latency.get)
+        path = []
+        node = last
+        while node is not None:
+            path.append(node)
+            node = path_parent.get(node)
+
+        return list(reversed(path)), path_latency[last]
+
+    def report(self):
+        """
+        Summarize the last run
+
+        Returns:
+            dict: Per-stage timings, wall time and critical path
+        """
+        path, latency = self.critical_path()
+        return {
+            "parallel": self.parallel and len(self.stages) > 1,
+            "wall_time": getattr(self, "wall_time", 0.0),
+            "critical_path": path,
+            "critical_path_latency": latency,
+            "stages": dict(self.timings)
+        }
+
+    def span_report(self, pricing=None):
+        """
+        Structured spans of the last run, in stage order
+
+        Args:
+            pricing (dict): Per-model prices used for the cost estimate
+
+        Returns:
+            list: One span dict per stage that ran
+        """
+        return [
+            self.spans[name].to_dict(pricing, origin=self._run_started)
+            for name in self.stages if name in self.spans
+        ]
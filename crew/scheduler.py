@@ -0,0 +1,530 @@
+import math
+import time
+import itertools
+import threading
+from config.settings import load_settings
+from crew.server import MeetingService, ServiceSaturated, Job
+from utils.checkpoint import new_run_id
+from utils.retry import LatencyTracker
+
+class TenantState:
+    """One tenant's job queue, recent API usage and wait statistics"""
+    
+    def __init__(self, name, weight=1.0, queue_size=16, window_seconds=60.0):
+        """
+        Args:
+            name (str): Tenant name
+            weight (float): Share of the API budget relative to the other tenants
+            queue_size (int): Jobs the tenant may have waiting
+            window_seconds (float): How far back usage counts towards the fair share
+        """
+        self.name = name
+        self.weight = float(weight)
+        self.queue_size = queue_size
+        self.window_seconds = window_seconds
+        self.queue = []
+        self.active_jobs = 0
+        self.running_stages = 0
+        self.waiting_stages = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.deadline_misses = 0
+        self.queue_waits = LatencyTracker(window=1000)
+        self.stage_waits = LatencyTracker(window=1000)
+        self.queue_wait_total = 0.0
+        self.stage_wait_total = 0.0
+        self.queue_wait_count = 0
+        self.stage_wait_count = 0
+        # (time, tokens, requests) of the stages finished within the window
+        self.usage = []
+        # Exponentially weighted share of the budget used by one stage; stands in
+        # for the usage of stages that are still running
+        self.stage_cost = 0.0
+    
+    def charge(self, now, tokens, requests, share):
+        """Account for a finished stage's API usage"""
+        if tokens or requests:
+            self.usage.append((now, tokens, requests))
+        self.stage_cost = 0.8 * self.stage_cost + 0.2 * share
+    
+    def window_usage(self, now):
+        """
+        Returns:
+            tuple: (tokens, requests) used within the window
+        """
+        cutoff = now - self.window_seconds
+        expired = next((index for index, (finished, _, _) in enumerate(self.usage) if finished > cutoff), len(self.usage))
+        del self.usage[:expired]
+        return sum(tokens for _, tokens, _ in self.usage), sum(requests for _, _, requests in self.usage)
+    
+    def record_queue_wait(self, seconds):
+        self.queue_waits.observe(seconds)
+        self.queue_wait_total += seconds
+        self.queue_wait_count += 1
+    
+    def record_stage_wait(self, seconds):
+        self.stage_waits.observe(seconds)
+        self.stage_wait_total += seconds
+        self.stage_wait_count += 1
+    
+    def to_dict(self, now, share):
+        tokens, requests = self.window_usage(now)
+        return {
+            "weight": self.weight,
+            "queued": len(self.queue),
+            "queue_capacity": self.queue_size,
+            "active_jobs": self.active_jobs,
+            "running_stages": self.running_stages,
+            "waiting_stages": self.waiting_stages,
+            "jobs_submitted": self.submitted,
+            "jobs_completed": self.completed,
+            "jobs_failed": self.failed,
+            "jobs_rejected": self.rejected,
+            "deadline_misses": self.deadline_misses,
+            "queue_wait": _wait_summary(self.queue_waits, self.queue_wait_count, self.queue_wait_total),
+            "stage_wait": _wait_summary(self.stage_waits, self.stage_wait_count, self.stage_wait_total),
+            "window_tokens": tokens,
+            "window_requests": requests,
+            "budget_share": share
+        }
+
+def _wait_summary(tracker, count, total):
+    """Count and mean over all waits, percentiles and maximum over the recent ones"""
+    return {
+        "count": count,
+        "mean": total / count if count else None,
+        "p50": tracker.percentile(0.50),
+        "p95": tracker.percentile(0.95),
+        "max": tracker.percentile(1.0)
+    }
+
+class _StageWaiter:
+    """A stage of a running job waiting for a stage slot"""
+    
+    def __init__(self, job, stage, sequence):
+        self.job = job
+        self.stage = stage
+        self.sequence = sequence
+
+class _JobAdmission:
+    """Admission controller passed to run_crew: every stage of the job asks the scheduler for a slot"""
+    
+    def __init__(self, scheduler, job):
+        self.scheduler = scheduler
+        self.job = job
+    
+    def acquire(self, stage, remaining=None, stopped=None):
+        return self.scheduler._acquire_stage(self.job, stage, remaining, stopped)
+    
+    def release(self, stage, span):
+        self.scheduler._release_stage(self.job, span)
+
+class MeetingScheduler(MeetingService):
+    """
+    Multi-tenant MeetingService: per-tenant queues with priorities and deadlines,
+    and weighted fair sharing of the API budget.
+
+    `workers` stages run at a time across all jobs, and a job gives up its stage
+    slot at every stage boundary. When a slot frees up it goes to the waiting
+    stage (or, for a new job, the queued job) that ranks first by:
+
+      1. priority: an urgent stand-up summary overtakes a bulk backfill at the
+         backfill's next stage boundary;
+      2. deadline: within a priority, jobs within deadline_margin_seconds of
+         their deadline go first, earliest deadline first;
+      3. fair share: the tenant's dominant share of the requests/min and
+         tokens/min budget used over the last window_seconds (plus an estimate
+         for its running stages), divided by its weight.
+
+    Up to max_active_jobs jobs are in flight, each on a warm crew; jobs that
+    are parked between stages hold no slot. The last reserved_jobs of those
+    places can only be taken by a job that outranks one already running, so a
+    backfill cannot occupy every crew. stats() reports queue and stage-admission
+    waits per tenant.
+    """
+    
+    def __init__(self, workers=2, queue_size=16, crew_kwargs=None, on_complete=None, keep_jobs=1000,
+                 runs_dir=None, stream_tokens=False, max_active_jobs=None, reserved_jobs=1, tenants=None,
+                 default_tenant="default", default_weight=1.0, tenant_queue_size=None, priorities=None,
+                 default_priority="normal", deadline_margin_seconds=300.0, window_seconds=60.0,
+                 requests_per_minute=0, tokens_per_minute=0, keep_runs=0):
+        """
+        Args:
+            workers (int): Stages that may run at the same time
+            queue_size (int): Jobs that may wait across all tenants before submissions are refused
+            crew_kwargs (dict): Keyword arguments for each MeetingSummarizerCrew
+            on_complete (callable): Called with (results, audio_file_path) after each successful job
+            keep_jobs (int): Finished jobs kept for status queries
+            runs_dir (str): Checkpoint directory
+            stream_tokens (bool): Stream summary and follow-up tokens as job events
+            max_active_jobs (int): Jobs in flight at once (defaults to twice workers)
+            reserved_jobs (int): In-flight places a job may only take by outranking a running job
+            tenants (dict): Per-tenant {"weight": ..., "queue_size": ...}
+            default_tenant (str): Tenant of submissions that name none
+            default_weight (float): Weight of tenants missing from `tenants`
+            tenant_queue_size (int): Jobs each tenant may have waiting (defaults to queue_size)
+            priorities (dict): Priority names and their levels; higher runs first
+            default_priority (str): Priority of submissions that name none
+            deadline_margin_seconds (float): How close to its deadline a job jumps the fair-share order
+            window_seconds (float): Usage window for the fair share
+            requests_per_minute (int): Shared request budget (0 when unlimited)
+            tokens_per_minute (int): Shared token budget (0 when unlimited)
+            keep_runs (int): Checkpointed runs kept in runs_dir (0 keeps all)
+        """
+        super().__init__(workers, queue_size, crew_kwargs, on_complete, keep_jobs, runs_dir, stream_tokens, keep_runs)
+        self.max_active_jobs = max(self.workers, max_active_jobs or 2 * self.workers)
+        self.reserved_jobs = min(max(0, reserved_jobs), self.max_active_jobs - 1)
+        self.worker_threads = self.max_active_jobs
+        self.tenant_config = tenants or {}
+        self.default_tenant = default_tenant
+        self.default_weight = default_weight
+        self.tenant_queue_size = tenant_queue_size or self.queue_size
+        self.priorities = dict(priorities or {"urgent": 2, "normal": 1, "bulk": 0})
+        self.default_priority = default_priority
+        self.deadline_margin_seconds = deadline_margin_seconds
+        self.window_seconds = window_seconds
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._tenants = {}
+        self._schedule = threading.Condition()
+        self._queued = 0
+        self._active_jobs = []
+        self._running_stages = 0
+        self._stage_waiters = []
+        self._sequence = itertools.count()
+        self._stopping = False
+    
+    @classmethod
+    def from_settings(cls, settings=None, **kwargs):
+        """
+        Create a scheduler from the server, scheduler and openai sections of config.yaml
+
+        Args:
+            settings (Settings): Typed configuration (defaults to load_settings())
+            **kwargs: Overrides, e.g. workers, crew_kwargs, on_complete or runs_dir
+
+        Returns:
+            MeetingScheduler: Scheduler ready to start
+        """
+        settings = settings or load_settings()
+        server = settings.server
+        scheduler = settings.scheduler
+        options = {
+            "workers": server.workers,
+            "queue_size": server.queue_size,
+            "keep_jobs": server.keep_jobs,
+            "stream_tokens": server.stream_tokens,
+            "max_active_jobs": scheduler.max_active_jobs,
+            "reserved_jobs": scheduler.reserved_jobs,
+            "tenants": scheduler.tenants,
+            "default_tenant": scheduler.default_tenant,
+            "default_weight": scheduler.default_weight,
+            "tenant_queue_size": scheduler.tenant_queue_size,
+            "priorities": scheduler.priorities,
+            "default_priority": scheduler.default_priority,
+            "deadline_margin_seconds": scheduler.deadline_margin_seconds,
+            "window_seconds": scheduler.window_seconds,
+            "requests_per_minute": settings.openai.requests_per_minute,
+            "tokens_per_minute": settings.openai.tokens_per_minute
+        }
+        options.update({name: value for name, value in kwargs.items() if value is not None})
+        return cls(**options)
+    
+    def stop(self, wait=True):
+        """Let queued jobs finish and stop the workers"""
+        with self._schedule:
+            self._stopping = True
+            self._schedule.notify_all()
+        if wait:
+            for thread in self._threads:
+                thread.join()
+        self._threads = []
+    
+    def resolve_priority(self, priority):
+        """
+        Args:
+            priority: Priority name, integer level, or None for the default
+
+        Returns:
+            int: Priority level
+
+        Raises:
+            ValueError: For an unknown priority name
+        """
+        if priority is None or priority == "":
+            return self.priorities[self.default_priority]
+        if isinstance(priority, int) and not isinstance(priority, bool):
+            return priority
+        name = str(priority).strip().lower()
+        if name in self.priorities:
+            return self.priorities[name]
+        try:
+            return int(name)
+        except ValueError:
+            raise ValueError(f"Unknown priority {priority!r}: use one of {', '.join(self.priorities)} or an integer")
+    
+    def submit(self, audio_file_path, cleanup=False, tenant=None, priority=None, deadline=None):
+        """
+        Queue a recording for a tenant
+
+        Args:
+            audio_file_path (str): Recording to process
+            cleanup (bool): Delete the recording once the job has finished
+            tenant (str): Team the job is processed for (defaults to default_tenant)
+            priority: Priority name or level (defaults to default_priority)
+            deadline (float): time.time() by which the results are wanted
+
+        Returns:
+            Job: The queued job
+
+        Raises:
+            ServiceSaturated: When the tenant's queue or the whole queue is full
+            ValueError: For an unknown priority name
+        """
+        job = Job(new_run_id(), audio_file_path, cleanup, tenant or self.default_tenant,
+                  self.resolve_priority(priority), deadline)
+        with self._schedule:
+            state = self._tenant(job.tenant)
+            saturated = self._saturation(state)
+            if saturated is not None:
+                raise saturated
+            
+            job.sequence = next(self._sequence)
+            job.submitted = time.monotonic()
+            with self._lock:
+                self._jobs[job.id] = job
+                self._forget_old_jobs()
+            job.emit("queued", queue_depth=self._queued + 1, tenant=job.tenant, priority=job.priority)
+            state.queue.append(job)
+            state.submitted += 1
+            self._queued += 1
+            self._schedule.notify_all()
+        return job
+    
+    def saturated(self, tenant=None):
+        """
+        Check for a full tenant queue or a full overall queue before taking on a submission
+
+        Args:
+            tenant (str): Tenant the submission is for (defaults to default_tenant)
+
+        Returns:
+            ServiceSaturated: Describes the full queue (the submission counts as rejected), or None
+        """
+        with self._schedule:
+            return self._saturation(self._tenant(tenant or self.default_tenant))
+    
+    def _saturation(self, state):
+        """ServiceSaturated for a submission to a full queue, counted as rejected, or None (call with _schedule held)"""
+        if len(state.queue) < state.queue_size and self._queued < self.queue_size:
+            return None
+        state.rejected += 1
+        with self._lock:
+            self._rejected += 1
+        if len(state.queue) >= state.queue_size:
+            return ServiceSaturated(len(state.queue), state.queue_size, self.retry_after())
+        return ServiceSaturated(self._queued, self.queue_size, self.retry_after())
+    
+    def queue_position(self, job):
+        """1-based position of a queued job in the current scheduling order, or None once it has started"""
+        if job.status != "queued":
+            return None
+        with self._schedule:
+            ranked = sorted(
+                (queued for state in self._tenants.values() for queued in state.queue),
+                key=self._job_rank(time.monotonic(), time.time())
+            )
+        return next((index for index, queued in enumerate(ranked, 1) if queued is job), None)
+    
+    def stats(self):
+        stats = super().stats()
+        with self._schedule:
+            now = time.monotonic()
+            stats.update({
+                "queue_depth": self._queued,
+                "active_jobs": len(self._active_jobs),
+                "max_active_jobs": self.max_active_jobs,
+                "stage_slots": self.workers,
+                "running_stages": self._running_stages,
+                "waiting_stages": len(self._stage_waiters),
+                "tenants": {
+                    name: state.to_dict(now, self._share(*state.window_usage(now)))
+                    for name, state in sorted(self._tenants.items())
+                }
+            })
+        return stats
+    
+    def _tenant(self, name):
+        """State of a tenant, created on its first submission (call with _schedule held)"""
+        if name not in self._tenants:
+            config = self.tenant_config.get(name) or {}
+            self._tenants[name] = TenantState(
+                name,
+                weight=config.get("weight", self.default_weight),
+                queue_size=config.get("queue_size", self.tenant_queue_size),
+                window_seconds=self.window_seconds
+            )
+        return self._tenants[name]
+    
+    def _share(self, tokens, requests):
+        """Dominant share of the window's request and token budget taken by `tokens` and `requests`"""
+        window_minutes = self.window_seconds / 60.0
+        shares = []
+        if self.tokens_per_minute:
+            shares.append(tokens / (self.tokens_per_minute * window_minutes))
+        if self.requests_per_minute:
+            shares.append(requests / (self.requests_per_minute * window_minutes))
+        # Without configured limits, tokens are what the tenants compete for
+        return max(shares) if shares else float(tokens)
+    
+    def _fair_share(self, state, now):
+        """Recent usage plus the expected usage of running stages, per unit of weight"""
+        usage = self._share(*state.window_usage(now)) + state.running_stages * state.stage_cost
+        return usage / state.weight
+    
+    def _job_rank(self, now, wall_time):
+        """Sort key ranking jobs (and their stages) by priority, deadline and tenant fair share"""
+        shares = {}
+        
+        def rank(job):
+            if job.tenant not in shares:
+                shares[job.tenant] = self._fair_share(self._tenants[job.tenant], now)
+            at_risk = job.deadline is not None and job.deadline - wall_time <= self.deadline_margin_seconds
+            return (
+                -job.priority,
+                not at_risk,
+                job.deadline if at_risk else shares[job.tenant],
+                self._tenants[job.tenant].running_stages,
+                job.deadline if job.deadline is not None else math.inf,
+                job.sequence
+            )
+        
+        return rank
+    
+    def _pick_job(self):
+        """The queued job a free worker should start, or None (call with _schedule held)"""
+        queued = [job for state in self._tenants.values() for job in state.queue]
+        if not queued:
+            return None
+        job = min(queued, key=self._job_rank(time.monotonic(), time.time()))
+        if len(self._active_jobs) >= self.max_active_jobs - self.reserved_jobs:
+            if job.priority <= min(active.priority for active in self._active_jobs):
+                return None
+        return job
+    
+    def _next_job(self):
+        """Block until a job may start; None once the scheduler is stopping and the queues are empty"""
+        with self._schedule:
+            while True:
+                job = self._pick_job()
+                if job is not None:
+                    break
+                if self._stopping and not self._queued:
+                    return None
+                self._schedule.wait()
+            
+            state = self._tenants[job.tenant]
+            state.queue.remove(job)
+            self._queued -= 1
+            state.active_jobs += 1
+            self._active_jobs.append(job)
+            state.record_queue_wait(time.monotonic() - job.submitted)
+            return job
+    
+    def _worker(self, crew_class, ready):
+        crew = crew_class(**self.crew_kwargs)
+        ready.wait()
+        while True:
+            job = self._next_job()
+            if job is None:
+                return
+            try:
+                self._run_job(crew, job)
+            finally:
+                self._job_finished(job)
+    
+    def _job_finished(self, job):
+        with self._schedule:
+            state = self._tenants[job.tenant]
+            self._active_jobs.remove(job)
+            state.active_jobs -= 1
+            if job.status == "succeeded":
+                state.completed += 1
+            else:
+                state.failed += 1
+            if job.deadline is not None and time.time() > job.deadline:
+                state.deadline_misses += 1
+            self._schedule.notify_all()
+    
+    def _admission(self, job):
+        return _JobAdmission(self, job)
+    
+    def _acquire_stage(self, job, stage, remaining=None, stopped=None):
+        """
+        Block until the stage ranks among the waiting stages that fit into the free slots
+
+        Args:
+            job (Job): Job the stage belongs to
+            stage (str): Stage name
+            remaining (callable): Seconds left of the job's time budget (None without one);
+                the wait is abandoned once it reaches 0
+            stopped (callable): True once the job's run has failed; the wait is abandoned then
+
+        Returns:
+            bool: True once admitted, False if the job ran out of time or failed first
+        """
+        ready = time.monotonic()
+        with self._schedule:
+            state = self._tenants[job.tenant]
+            waiter = _StageWaiter(job, stage, next(self._sequence))
+            self._stage_waiters.append(waiter)
+            state.waiting_stages += 1
+            admitted = True
+            try:
+                while True:
+                    if stopped is not None and stopped():
+                        admitted = False
+                        break
+                    if self._may_start(waiter):
+                        break
+                    left = remaining() if remaining else None
+                    if left is not None and left <= 0:
+                        admitted = False
+                        break
+                    # Wake up regularly to notice a run that failed or timed out meanwhile
+                    self._schedule.wait(min(left, 1.0) if left is not None else 1.0)
+            finally:
+                self._stage_waiters.remove(waiter)
+                state.waiting_stages -= 1
+            if not admitted:
+                # The waiter may have been holding up lower-ranked stages
+                self._schedule.notify_all()
+                return False
+            
+            self._running_stages += 1
+            state.running_stages += 1
+            waited = time.monotonic() - ready
+            state.record_stage_wait(waited)
+        if waited >= 0.01:
+            job.emit("admitted", stage=stage, waited=waited)
+        return True
+    
+    def _may_start(self, waiter):
+        free = self.workers - self._running_stages
+        if free <= 0:
+            return False
+        rank = self._job_rank(time.monotonic(), time.time())
+        ranked = sorted(self._stage_waiters, key=lambda other: rank(other.job) + (other.sequence,))
+        return waiter in ranked[:free]
+    
+    def _release_stage(self, job, span):
+        """Free the stage's slot and charge its API usage to the tenant"""
+        tokens = span.prompt_tokens + span.completion_tokens
+        with self._schedule:
+            state = self._tenants[job.tenant]
+            self._running_stages -= 1
+            state.running_stages -= 1
+            state.charge(time.monotonic(), tokens, span.requests, self._share(tokens, span.requests))
+            self._schedule.notify_all()
@@ -0,0 +1,643 @@
+import os
+import re
+import json
+import math
+import time
+import queue
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from urllib.parse import urlparse, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from config.settings import load_settings
+from utils.checkpoint import RunCheckpoint, new_run_id
+from utils.streaming import TokenStream
+
+TERMINAL_STATUSES = ("succeeded", "failed")
+
+class ServiceSaturated(Exception):
+    """Raised by MeetingService.submit when the job queue is full"""
+    
+    def __init__(self, queue_depth, queue_capacity, retry_after):
+        super().__init__(f"Job queue is full ({queue_depth}/{queue_capacity}); retry in {retry_after}s")
+        self.queue_depth = queue_depth
+        self.queue_capacity = queue_capacity
+        self.retry_after = retry_after
+
+class Job:
+    """One submitted meeting: its status, event log and, once finished, its results"""
+    
+    def __init__(self, job_id, audio_file_path, cleanup=False, tenant=None, priority=None, deadline=None):
+        """
+        Args:
+            job_id (str): Job id (also the checkpoint run id)
+            audio_file_path (str): Recording to process
+            cleanup (bool): Delete the recording when the job finishes (uploaded files)
+            tenant (str): Team the job is processed for
+            priority (int): Scheduling priority; higher runs first
+            deadline (float): time.time() by which the results are wanted
+        """
+        self.id = job_id
+        self.audio_file_path = audio_file_path
+        self.cleanup = cleanup
+        self.tenant = tenant
+        self.priority = priority
+        self.deadline = deadline
+        self.status = "queued"
+        self.created_at = datetime.now().isoformat(timespec="seconds")
+        self.started_at = None
+        self.finished_at = None
+        self.latency = None
+        self.results = None
+        self.error = None
+        self.events = []
+        self._condition = threading.Condition()
+    
+    def emit(self, event_type, **fields):
+        """Append an event to the job's log and wake up anyone streaming it"""
+        with self._condition:
+            event = {"id": len(self.events), "type": event_type, "time": time.time()}
+            event.update(fields)
+            self.events.append(event)
+            self._condition.notify_all()
+    
+    def finish(self, status, **fields):
+        """
+        Set the terminal status and emit its event in one step, so a client
+        that sees the status also finds the event in the log
+        """
+        with self._condition:
+            self.status = status
+            self.emit(status, **fields)
+    
+    def events_after(self, index, timeout=None):
+        """
+        Wait for events past `index`
+
+        Args:
+            index (int): Number of events already seen
+            timeout (float): Seconds to wait for a new event
+
+        Returns:
+            list: New events (empty on timeout)
+        """
+        with self._condition:
+            if len(self.events) <= index and self.status not in TERMINAL_STATUSES:
+                self._condition.wait(timeout)
+            return self.events[index:]
+    
+    def to_dict(self, include_results=True):
+        job = {
+            "job_id": self.id,
+            "status": self.status,
+            "source": self.audio_file_path,
+            "tenant": self.tenant,
+            "priority": self.priority,
+            "deadline": datetime.fromtimestamp(self.deadline).isoformat(timespec="seconds") if self.deadline else None,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "latency": self.latency,
+            "error": self.error
+        }
+        if include_results and self.results is not None:
+            job["results"] = self.results
+        return job
+
+class _EventSink:
+    """TokenStream sink that forwards streamed tokens as job events"""
+    
+    def __init__(self, job, stage):
+        self.job = job
+        self.stage = stage
+    
+    def write(self, text):
+        self.job.emit("token", stage=self.stage, text=text)
+    
+    def close(self):
+        pass
+
+class MeetingService:
+    """
+    Bounded job queue drained by a pool of warm MeetingSummarizerCrew workers.
+
+    Each worker thread builds its crew once at start-up and reuses it for every
+    job, so agents and API clients are never rebuilt per request. submit()
+    raises ServiceSaturated instead of queueing without bound, with a
+    Retry-After estimate from the recent job latency.
+    """
+    
+    def __init__(self, workers=2, queue_size=16, crew_kwargs=None, on_complete=None, keep_jobs=1000,
+                 runs_dir=None, stream_tokens=False, keep_runs=0):
+        """
+        Args:
+            workers (int): Number of crews processing jobs concurrently
+            queue_size (int): Jobs that may wait for a worker before submissions are refused
+            crew_kwargs (dict): Keyword arguments for each worker's MeetingSummarizerCrew
+            on_complete (callable): Called with (results, audio_file_path) after each successful job;
+                calls are serialised, so it may write to the action-item store and search index
+            keep_jobs (int): Finished jobs kept for status queries; the oldest are forgotten first
+            runs_dir (str): Checkpoint directory; failed jobs can be resumed with --resume <job_id>
+            stream_tokens (bool): Stream summary and follow-up tokens as job events
+            keep_runs (int): Checkpointed runs kept in runs_dir; older ones are deleted (0 keeps all)
+        """
+        self.workers = max(1, workers)
+        self.queue_size = max(1, queue_size)
+        self.crew_kwargs = crew_kwargs or {}
+        self.on_complete = on_complete
+        self.keep_jobs = max(1, keep_jobs)
+        self.runs_dir = runs_dir
+        self.keep_runs = keep_runs
+        self.stream_tokens = stream_tokens
+        # One warm crew per worker thread
+        self.worker_threads = self.workers
+        self._queue = queue.Queue(maxsize=self.queue_size)
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self._complete_lock = threading.Lock()
+        self._busy = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        # Exponentially weighted job latency, for Retry-After hints
+        self._average_latency = None
+        self._threads = []
+    
+    def start(self):
+        """Build the worker crews and start draining the queue; returns once every crew is ready"""
+        from crew.crew import MeetingSummarizerCrew
+        
+        ready = threading.Barrier(self.worker_threads + 1)
+        for index in range(self.worker_threads):
+            thread = threading.Thread(
+                target=self._worker, args=(MeetingSummarizerCrew, ready), name=f"meeting-worker-{index}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+        ready.wait()
+        return self
+    
+    def stop(self, wait=True):
+        """Let queued jobs finish and stop the workers"""
+        for _ in self._threads:
+            self._queue.put(None)
+        if wait:
+            for thread in self._threads:
+                thread.join()
+        self._threads = []
+    
+    def submit(self, audio_file_path, cleanup=False, tenant=None, priority=None, deadline=None):
+        """
+        Queue a recording. Jobs run first come, first served; tenant, priority
+        and deadline are only recorded (MeetingScheduler acts on them).
+
+        Args:
+            audio_file_path (str): Recording to process
+            cleanup (bool): Delete the recording once the job has finished
+            tenant (str): Team the job is processed for
+            priority: Scheduling priority
+            deadline (float): time.time() by which the results are wanted
+
+        Returns:
+            Job: The queued job
+
+        Raises:
+            ServiceSaturated: When the queue is full
+        """
+        job = Job(new_run_id(), audio_file_path, cleanup, tenant, priority, deadline)
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            with self._lock:
+                self._rejected += 1
+            raise ServiceSaturated(self._queue.qsize(), self.queue_size, self.retry_after())
+        
+        with self._lock:
+            self._jobs[job.id] = job
+            self._forget_old_jobs()
+        job.emit("queued", queue_depth=self._queue.qsize())
+        return job
+    
+    def saturated(self, tenant=None):
+        """
+        Check for a full queue before taking on a submission, e.g. before reading an upload
+
+        Args:
+            tenant (str): Tenant the submission is for
+
+        Returns:
+            ServiceSaturated: Describes the full queue (the submission counts as rejected), or None
+        """
+        if not self._queue.full():
+            return None
+        with self._lock:
+            self._rejected += 1
+        return ServiceSaturated(self._queue.qsize(), self.queue_size, self.retry_after())
+    
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+    
+    def queue_position(self, job):
+        """1-based position of a queued job, or None once it has started"""
+        if job.status != "queued":
+            return None
+        with self._queue.mutex:
+            waiting = list(self._queue.queue)
+        return next((index for index, queued in enumerate(waiting, 1) if queued is job), None)
+    
+    def retry_after(self):
+        """Seconds until a queue slot is likely to free up: one job finishes every latency / workers"""
+        average = self._average_latency or 30.0
+        return max(1, math.ceil(average / self.workers))
+    
+    def stats(self):
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "busy_workers": self._busy,
+                "queue_depth": self._queue.qsize(),
+                "queue_capacity": self.queue_size,
+                "jobs_completed": self._completed,
+                "jobs_failed": self._failed,
+                "jobs_rejected": self._rejected,
+                "average_latency": self._average_latency
+            }
+    
+    def _forget_old_jobs(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.status in TERMINAL_STATUSES]
+        for job_id in finished[:max(0, len(self._jobs) - self.keep_jobs)]:
+            del self._jobs[job_id]
+    
+    def _worker(self, crew_class, ready):
+        crew = crew_class(**self.crew_kwargs)
+        ready.wait()
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            try:
+                self._run_job(crew, job)
+            finally:
+                self._queue.task_done()
+    
+    def _run_job(self, crew, job):
+        with self._lock:
+            self._busy += 1
+        job.status = "running"
+        job.started_at = datetime.now().isoformat(timespec="seconds")
+        job.emit("running")
+        started = time.perf_counter()
+        status = "failed"
+        
+        streams = None
+        if self.stream_tokens:
+            streams = {stage: TokenStream(stage, [_EventSink(job, stage)]) for stage in ("summary", "followup_message")}
+        try:
+            checkpoint = RunCheckpoint.create(
+                self.runs_dir, job.audio_file_path, run_id=job.id, keep_runs=self.keep_runs
+            ) if self.runs_dir else None
+            results = crew.run_crew(
+                job.audio_file_path, streams=streams, checkpoint=checkpoint,
+                on_stage_complete=lambda stage, output: job.emit("stage", stage=stage),
+                admission=self._admission(job)
+            )
+            if self.on_complete:
+                with self._complete_lock:
+                    self.on_complete(results, job.audio_file_path)
+            job.results = results
+            status = "succeeded"
+        except Exception as e:
+            job.error = str(e)
+            status = "failed"
+        finally:
+            job.latency = time.perf_counter() - started
+            job.finished_at = datetime.now().isoformat(timespec="seconds")
+            if job.cleanup and os.path.exists(job.audio_file_path):
+                os.remove(job.audio_file_path)
+            with self._lock:
+                self._busy -= 1
+                if status == "succeeded":
+                    self._completed += 1
+                else:
+                    self._failed += 1
+                self._average_latency = job.latency if self._average_latency is None else (
+                    0.8 * self._average_latency + 0.2 * job.latency
+                )
+            job.finish(status, error=job.error, latency=job.latency)
+    
+    def _admission(self, job):
+        """Admission controller for the job's stages; a plain service runs them unhindered"""
+        return None
+
+def parse_deadline(value):
+    """
+    Args:
+        value: Seconds from now (a number or numeric string) or an ISO 8601 timestamp
+
+    Returns:
+        float: The deadline as a time.time() value
+
+    Raises:
+        ValueError: When the value is neither
+    """
+    try:
+        return time.time() + float(value)
+    except (TypeError, ValueError):
+        pass
+    try:
+        return datetime.fromisoformat(str(value)).timestamp()
+    except ValueError:
+        raise ValueError(f"Invalid deadline {value!r}: use seconds from now or an ISO 8601 timestamp")
+
+_JOB_PATH = re.compile(r"^/jobs/([\w-]+)(/events)?$")
+
+class MeetingRequestHandler(BaseHTTPRequestHandler):
+    """
+    POST /jobs                submit {"path": ...} as JSON, or upload the audio as the raw body
+                              (?filename=meeting.mp3); 202, or 429 when the queue is full.
+                              Optional tenant, priority and deadline (seconds from now or
+                              ISO 8601) go in the JSON body or the query string
+    GET  /jobs/<id>           job status, plus results once finished (?results=false to omit)
+    GET  /jobs/<id>/events    job events as a Server-Sent Events stream until the job finishes
+    GET  /health              queue depth and worker utilisation
+    """
+    
+    protocol_version = "HTTP/1.1"
+    
+    def log_message(self, format, *args):
+        # Job progress is printed by the crews; skip per-request access logs
+        pass
+    
+    @property
+    def service(self):
+        return self.server.service
+    
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path != "/jobs":
+            self._send_json(404, {"error": f"Unknown endpoint {url.path}"})
+            return
+        
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > self.server.max_upload_bytes:
+            self._send_json(413, {"error": f"Upload exceeds {self.server.max_upload_bytes} bytes"})
+            self.close_connection = True
+            return
+        
+        query = {name: values[0] for name, values in parse_qs(url.query).items()}
+        content_type = (self.headers.get("Content-Type") or "").split(";")[0].strip()
+        if content_type == "application/json":
+            try:
+                payload = json.loads(self.rfile.read(length) or b"{}")
+            except ValueError:
+                self._send_json(400, {"error": "Request body is not valid JSON"})
+                return
+            payload = payload if isinstance(payload, dict) else {}
+            audio_file_path = payload.get("path")
+            if not audio_file_path or not os.path.isfile(audio_file_path):
+                self._send_json(400, {"error": f"Recording not found: {audio_file_path}"})
+                return
+            fields = dict(query, **payload)
+            cleanup = False
+        else:
+            if not length:
+                self._send_json(400, {"error": "Send {\"path\": ...} as JSON or the recording as the request body"})
+                return
+            fields = query
+            audio_file_path = None
+            cleanup = True
+        
+        try:
+            options = self._scheduling_options(fields)
+        except ValueError as e:
+            self._send_json(400, {"error": str(e)})
+            self.close_connection = cleanup
+            return
+        if cleanup:
+            # Refuse before reading the body, so backpressure also spares the upload
+            saturated = self.service.saturated(options.get("tenant"))
+            if saturated is not None:
+                self._send_saturated(saturated)
+                self.close_connection = True
+                return
+            audio_file_path = self._save_upload(query.get("filename", "upload.mp3"), length)
+        
+        try:
+            job = self.service.submit(audio_file_path, cleanup=cleanup, **options)
+        except ValueError as e:
+            if cleanup:
+                os.remove(audio_file_path)
+            self._send_json(400, {"error": str(e)})
+            return
+        except ServiceSaturated as e:
+            if cleanup:
+                os.remove(audio_file_path)
+            self._send_saturated(e)
+            return
+        
+        self._send_json(202, {
+            "job_id": job.id,
+            "status": job.status,
+            "queue_position": self.service.queue_position(job),
+            "status_url": f"/jobs/{job.id}",
+            "events_url": f"/jobs/{job.id}/events"
+        }, {"Location": f"/jobs/{job.id}", "X-Queue-Depth": str(self.service.stats()["queue_depth"])})
+    
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/health":
+            self._send_json(200, dict(self.service.stats(), status="ok"))
+            return
+        
+        match = _JOB_PATH.match(url.path)
+        job = self.service.get(match.group(1)) if match else None
+        if job is None:
+            self._send_json(404, {"error": f"Unknown job or endpoint {url.path}"})
+            return
+        
+        if match.group(2):
+            self._stream_events(job)
+            return
+        include_results = parse_qs(url.query).get("results", ["true"])[0].lower() != "false"
+        status = job.to_dict(include_results)
+        status["queue_position"] = self.service.queue_position(job)
+        self._send_json(200, status)
+    
+    def _send_saturated(self, error):
+        self._send_json(429, {
+            "error": "Job queue is full",
+            "queue_depth": error.queue_depth,
+            "queue_capacity": error.queue_capacity,
+            "retry_after": error.retry_after
+        }, {"Retry-After": str(error.retry_after), "X-Queue-Depth": str(error.queue_depth)})
+    
+    @staticmethod
+    def _scheduling_options(fields):
+        """tenant, priority and deadline of a submission, from its JSON body or query string"""
+        options = {}
+        if fields.get("tenant"):
+            options["tenant"] = str(fields["tenant"])
+        if fields.get("priority") not in (None, ""):
+            options["priority"] = fields["priority"]
+        if fields.get("deadline") not in (None, ""):
+            options["deadline"] = parse_deadline(fields["deadline"])
+        return options
+    
+    def _save_upload(self, filename, length):
+        """Write the request body to the upload directory"""
+        extension = os.path.splitext(os.path.basename(filename))[1].lower() or ".mp3"
+        os.makedirs(self.server.upload_dir, exist_ok=True)
+        path = os.path.join(self.server.upload_dir, f"{new_run_id()}{extension}")
+        remaining = length
+        with open(path, "wb") as f:
+            while remaining:
+                chunk = self.rfile.read(min(remaining, 1024 * 1024))
+                if not chunk:
+                    break
+                f.write(chunk)
+                remaining -= len(chunk)
+        return path
+    
+    def _stream_events(self, job):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        
+        seen = 0
+        try:
+            while True:
+                events = job.events_after(seen, timeout=15)
+                if not events:
+                    # Comment line keeps proxies from closing an idle stream
+                    self.wfile.write(b": keep-alive\n\n")
+                for event in events:
+                    self.wfile.write(f"event: {event['type']}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n".encode("utf-8"))
+                seen += len(events)
+                self.wfile.flush()
+                # The succeeded/failed event is the last one a job emits
+                if any(event["type"] in TERMINAL_STATUSES for event in events):
+                    return
+        except (BrokenPipeError, ConnectionResetError):
+            return
+    
+    def _send_json(self, status, payload, headers=None):
+        # Results hold a SegmentStore, which serialises through its to_dict()
+        data = json.dumps(payload, ensure_ascii=False, default=lambda value: value.to_dict()).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+class MeetingServer:
+    """
+    HTTP front end of a MeetingService
+
+    Example:
+        with MeetingServer(MeetingService(workers=2, queue_size=8), port=0) as server:
+            print(server.url)
+    """
+    
+    def __init__(self, service, host="127.0.0.1", port=8080, upload_dir=".data/uploads", max_upload_mb=200):
+        """
+        Args:
+            service (MeetingService): Job queue and workers
+            host (str): Interface to bind
+            port (int): Port to bind (0 picks a free one)
+            upload_dir (str): Where uploaded recordings wait for their job
+            max_upload_mb (float): Largest accepted upload
+        """
+        self.service = service
+        self.httpd = ThreadingHTTPServer((host, port), MeetingRequestHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.service = service
+        self.httpd.upload_dir = upload_dir
+        self.httpd.max_upload_bytes = int(max_upload_mb * 1024 * 1024)
+        self._thread = None
+    
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def start(self):
+        """Warm up the workers, then serve requests on a background thread"""
+        self.service.start()
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="meeting-server", daemon=True)
+        self._thread.start()
+        return self
+    
+    def serve_forever(self):
+        """Warm up the workers and serve requests on the calling thread until interrupted"""
+        self.service.start()
+        try:
+            self.httpd.serve_forever()
+        finally:
+            self.httpd.server_close()
+            self.service.stop(wait=False)
+    
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread:
+            self._thread.join()
+        self.service.stop()
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+def build_server(crew_kwargs=None, on_complete=None, host=None, port=None, workers=None, checkpointing=True,
+                 settings=None):
+    """
+    Create a MeetingServer from the server section of config.yaml, backed by a
+    multi-tenant MeetingScheduler when scheduler.enabled is set
+
+    Args:
+        crew_kwargs (dict): Keyword arguments for each worker's MeetingSummarizerCrew
+        on_complete (callable): Called with (results, audio_file_path) after each successful job
+        host (str): Overrides server.host
+        port (int): Overrides server.port
+        workers (int): Overrides server.workers
+        checkpointing (bool): Checkpoint job stages when checkpoint.enabled is set
+        settings (Settings): Typed configuration (defaults to load_settings())
+
+    Returns:
+        MeetingServer: Server ready to start
+    """
+    settings = settings or load_settings()
+    server_settings = settings.server
+    runs_dir = settings.checkpoint.directory if checkpointing and settings.checkpoint.enabled else None
+    if settings.scheduler.enabled:
+        from crew.scheduler import MeetingScheduler
+        
+        service = MeetingScheduler.from_settings(
+            settings, workers=workers, crew_kwargs=crew_kwargs, on_complete=on_complete, runs_dir=runs_dir,
+            keep_runs=settings.checkpoint.keep_runs
+        )
+    else:
+        service = MeetingService(
+            workers=workers or server_settings.workers,
+            queue_size=server_settings.queue_size,
+            crew_kwargs=crew_kwargs,
+            on_complete=on_complete,
+            keep_jobs=server_settings.keep_jobs,
+            runs_dir=runs_dir,
+            stream_tokens=server_settings.stream_tokens,
+            keep_runs=settings.checkpoint.keep_runs
+        )
+    return MeetingServer(
+        service,
+        host=host or server_settings.host,
+        port=server_settings.port if port is None else port,
+        upload_dir=server_settings.upload_dir,
+        max_upload_mb=server_settings.max_upload_mb
+    )
@@ -9,16 +9,30 @@ This is the main entry point for the application.
 import os
 import sys
 import json
-from datetime import datetime
+import time
+import argparse
+import contextlib
+from datetime import datetime, date, timedelta
+from dataclasses import replace
 from crew.crew import MeetingSummarizerCrew
+from config.settings import load_settings, ConfigError
+from utils.checkpoint import RunCheckpoint, is_batch
+from utils.cache import STAGES
 from dotenv import load_dotenv
 
 def setup_environment():
     """Load environment variables and validate configuration"""
     load_dotenv()
     
+    # Settings are loaded after .env so that MEETING__* overrides in it apply
+    try:
+        settings = load_settings()
+    except ConfigError as e:
+        print(f"❌ Error: {str(e)}")
+        return False
+    
     # Check if OpenAI API key is set (unless in mock mode)
-    mock_mode = os.getenv("MOCK_MODE", "false").lower() == "true"
+    mock_mode = settings.mock_mode
     api_key = os.getenv("OPENAI_API_KEY")
     
     if not mock_mode and not api_key:
@@ -41,7 +55,7 @@ def validate_audio_file(file_path):
         return False
     
     # Check file extension
-    valid_extensions = ['.mp3', '.wav', '.m4a', '.flac']
+    valid_extensions = load_settings().file_processing.supported_audio_formats
     file_ext = os.path.splitext(file_path)[1].lower()
     
     if file_ext not in valid_extensions:
@@ -50,56 +64,570 @@ def validate_audio_file(file_path):
     
     return True
 
-def save_results_to_files(results, output_dir="output"):
+def output_timestamp():
+    """Suffix for output file names, or "" when output.timestamp_files is disabled"""
+    if not load_settings().output.timestamp_files:
+        return ""
+    return datetime.now().strftime("%Y%m%d_%H%M%S")
+
+def output_file_paths(output_dir, timestamp):
+    """Return the output file path for each result, keyed like the results dict"""
+    suffix = f"_{timestamp}" if timestamp else ""
+    return {
+        "transcript": f"{output_dir}/transcript{suffix}.txt",
+        "summary": f"{output_dir}/summary{suffix}.md",
+        "action_items": f"{output_dir}/action_items{suffix}.json",
+        "followup_message": f"{output_dir}/followup{suffix}.txt"
+    }
+
+def save_output_enabled():
+    """SAVE_OUTPUT in the environment wins over output.save_to_files"""
+    if "SAVE_OUTPUT" in os.environ:
+        return os.environ["SAVE_OUTPUT"].lower() == "true"
+    return load_settings().output.save_to_files
+
+def save_results_to_files(results, output_dir="output", timestamp=None):
     """Save results to individual files"""
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
     
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    timestamp = output_timestamp() if timestamp is None else timestamp
+    paths = output_file_paths(output_dir, timestamp)
     
     try:
         # Save transcript
-        with open(f"{output_dir}/transcript_{timestamp}.txt", "w", encoding="utf-8") as f:
+        with open(paths["transcript"], "w", encoding="utf-8") as f:
             f.write(results["transcript"])
         
         # Save summary
-        with open(f"{output_dir}/summary_{timestamp}.md", "w", encoding="utf-8") as f:
+        with open(paths["summary"], "w", encoding="utf-8") as f:
             f.write(results["summary"])
         
         # Save action items
-        with open(f"{output_dir}/action_items_{timestamp}.json", "w", encoding="utf-8") as f:
+        with open(paths["action_items"], "w", encoding="utf-8") as f:
             json.dump(results["action_items"], f, indent=2, ensure_ascii=False)
         
         # Save follow-up message
-        with open(f"{output_dir}/followup_{timestamp}.txt", "w", encoding="utf-8") as f:
+        with open(paths["followup_message"], "w", encoding="utf-8") as f:
             f.write(results["followup_message"])
         
-        print(f"\n💾 Results saved to {output_dir}/ directory with timestamp {timestamp}")
+        if timestamp:
+            print(f"\n💾 Results saved to {output_dir}/ directory with timestamp {timestamp}")
+        else:
+            print(f"\n💾 Results saved to {output_dir}/ directory")
         
     except Exception as e:
         print(f"⚠️  Warning: Could not save results to files: {str(e)}")
 
+def meeting_key(audio_file_path, transcript=None):
+    """
+    Stable id of a meeting for the action-item store and search index: the
+    recording's content hash, so re-running a recording updates its entries
+
+    Args:
+        audio_file_path (str): The recording
+        transcript (str): Hashed instead when there is no recording file (live audio from stdin)
+
+    Returns:
+        str: The key, or None when the meeting cannot be identified
+    """
+    import hashlib
+    from utils.cache import file_hash
+    
+    if os.path.isfile(audio_file_path):
+        return file_hash(audio_file_path)
+    if transcript:
+        return "transcript:" + hashlib.sha256(transcript.encode("utf-8")).hexdigest()
+    return None
+
+def storable_meeting_key(audio_file_path, key=None):
+    """
+    Key to record a meeting under, or None when it must not be recorded: mock
+    results are not real meetings, and a meeting without a stable key would be
+    added again on every run
+    """
+    if load_settings().mock_mode:
+        return None
+    return key or meeting_key(audio_file_path)
+
+def record_action_items(results, audio_file_path, key=None):
+    """Upsert a meeting's action items into the action-item store (action_store in config.yaml)"""
+    from utils.action_store import ActionItemStore
+    
+    store_settings = load_settings().action_store
+    key = storable_meeting_key(audio_file_path, key)
+    if not store_settings.enabled or key is None:
+        return
+    
+    try:
+        with ActionItemStore(store_settings.path, store_settings.similarity) as store:
+            counts = store.record_meeting(
+                key, results["action_items"],
+                title=os.path.splitext(os.path.basename(audio_file_path))[0], source=audio_file_path
+            )
+        print(f"🗃️  Action-item store: {counts['inserted']} new, {counts['updated']} updated ({store_settings.path})")
+    except Exception as e:
+        print(f"⚠️  Warning: Could not record action items: {str(e)}")
+
+def index_meeting(results, audio_file_path, key=None):
+    """Add a meeting's transcript and summary to the full-text search index (search_index in config.yaml)"""
+    from utils.search_index import SearchIndex
+    
+    index_settings = load_settings().search_index
+    key = storable_meeting_key(audio_file_path, key)
+    if not index_settings.enabled or key is None:
+        return
+    
+    try:
+        with SearchIndex(index_settings.directory, index_settings.merge_factor) as index:
+            index.add_meeting(
+                key, results["transcript"], results["summary"],
+                title=os.path.splitext(os.path.basename(audio_file_path))[0],
+                date=datetime.now().strftime("%Y-%m-%d"), source=audio_file_path
+            )
+        print(f"🔎 Meeting added to the search index ({index_settings.directory})")
+    except Exception as e:
+        print(f"⚠️  Warning: Could not index the meeting: {str(e)}")
+
+def store_meeting(results, audio_file_path, key=None):
+    """Record a finished meeting in the action-item store and the search index (skipped for mock runs)"""
+    key = storable_meeting_key(audio_file_path, key)
+    if key is None:
+        if not load_settings().mock_mode:
+            print(f"⚠️  {audio_file_path} is not a recording file; the meeting is not stored")
+        return
+    record_action_items(results, audio_file_path, key)
+    index_meeting(results, audio_file_path, key)
+
+def parse_args(argv=None):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="Meeting Summarizer & Action Tracker")
+    parser.add_argument("audio_file", nargs="?", help="Path to the meeting audio file")
+    parser.add_argument("--batch", metavar="SOURCE",
+                        help="Process a directory, glob pattern or JSONL manifest of recordings")
+    parser.add_argument("--workers", type=int,
+                        help="Batch pool size (defaults to performance.batch_size in config.yaml)")
+    parser.add_argument("--processes", action="store_true",
+                        help="Use a process pool instead of a thread pool for batch runs")
+    parser.add_argument("--output-dir",
+                        help="Directory for saved results and batch reports (defaults to output.output_directory)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Bypass the on-disk stage cache for this run")
+    parser.add_argument("--refresh-stage", action="append", default=[],
+                        choices=STAGES,
+                        help="Recompute a stage even if it is cached (repeatable)")
+    parser.add_argument("--stream", action="store_true",
+                        help="Stream the summary and follow-up message to the console (and output files) as they are generated")
+    parser.add_argument("--live", metavar="SOURCE",
+                        help="Live meeting mode: follow a growing recording (or '-' for stdin) "
+                             "and stream JSON events")
+    parser.add_argument("--window-seconds", type=float,
+                        help="Live mode audio window length (defaults to live.window_seconds)")
+    parser.add_argument("--team",
+                        help="Use this team's follow-up template overrides (followup.templates_dir/teams/TEAM/)")
+    parser.add_argument("--llm-followup", action="store_true",
+                        help="Have the model write the follow-up message instead of rendering the local template")
+    parser.add_argument("--resume", metavar="RUN_ID",
+                        help="Resume a failed or interrupted run (or batch) from its checkpoints")
+    parser.add_argument("--revise", metavar="RUN_ID",
+                        help="Re-process a checkpointed run with a corrected transcript (--transcript), "
+                             "re-running only the chunks the corrections touched")
+    parser.add_argument("--transcript", metavar="FILE",
+                        help="Corrected transcript for --revise")
+    parser.add_argument("--no-checkpoint", action="store_true",
+                        help="Do not checkpoint stage outputs for this run")
+    parser.add_argument("--metrics-dir", metavar="DIR",
+                        help="Append per-stage spans to DIR/stage_spans.jsonl and write Prometheus "
+                             "metrics to DIR/metrics.prom")
+    
+    items = parser.add_argument_group("action-item store", "Query the action items of all processed meetings")
+    items.add_argument("--items", action="store_true",
+                       help="List stored action items instead of processing a recording")
+    items.add_argument("--owner", help="Only items owned by this person (a first name matches full names)")
+    items.add_argument("--status", default="open", choices=["open", "done", "cancelled", "all"],
+                       help="Only items with this status (default: open)")
+    items.add_argument("--due-within", type=int, metavar="DAYS",
+                       help="Only items due within DAYS days, overdue ones included")
+    items.add_argument("--priority", choices=["High", "Medium", "Low"], help="Only items with this priority")
+    items.add_argument("--limit", type=int,
+                       help="Maximum number of items or search results listed (default: 50 items, 10 meetings)")
+    items.add_argument("--json", action="store_true", help="Print the items or search results as JSON")
+    items.add_argument("--complete", type=int, action="append", default=[], metavar="ITEM_ID",
+                       help="Mark a stored action item as done (repeatable)")
+    items.add_argument("--cancel", type=int, action="append", default=[], metavar="ITEM_ID",
+                       help="Mark a stored action item as cancelled (repeatable)")
+    
+    search = parser.add_argument_group("search", "Full-text search over processed meetings")
+    search.add_argument("--search", metavar="QUERY",
+                        help="Rank processed meetings by relevance to QUERY and show snippets")
+    search.add_argument("--index-outputs", metavar="DIR",
+                        help="Add the transcript/summary files saved under DIR to the search index")
+    
+    serve = parser.add_argument_group("service mode", "Accept recordings over HTTP and process them on a worker pool")
+    serve.add_argument("--serve", action="store_true",
+                       help="Run the HTTP job service (POST /jobs, GET /jobs/<id>, GET /jobs/<id>/events); "
+                            "--workers sets the pool size")
+    serve.add_argument("--host", help="Interface to bind (defaults to server.host)")
+    serve.add_argument("--port", type=int, help="Port to listen on (defaults to server.port)")
+    return parser.parse_args(argv)
+
+def crew_options(args):
+    """Translate cache and follow-up CLI flags into MeetingSummarizerCrew keyword arguments"""
+    options = {"refresh_stages": tuple(args.refresh_stage)}
+    if args.no_cache:
+        options["use_cache"] = False
+    if args.team or args.llm_followup:
+        settings = load_settings()
+        followup = replace(
+            settings.followup,
+            team=args.team or settings.followup.team,
+            mode="llm" if args.llm_followup else settings.followup.mode
+        )
+        options["settings"] = replace(settings, followup=followup)
+    return options
+
+def load_stage_metrics(metrics_dir):
+    """Return StageMetrics holding the counters saved by earlier exports to metrics_dir"""
+    from utils.metrics import StageMetrics
+    
+    stage_metrics = StageMetrics()
+    stage_metrics.load_state(os.path.join(metrics_dir, "metrics_state.json"))
+    return stage_metrics
+
+def export_metrics(metrics_dir, stage_metrics, spans, **labels):
+    """Append a run's spans (failed runs included) to the JSON-lines log and update the counters"""
+    from utils.metrics import write_spans_jsonl
+    
+    write_spans_jsonl(os.path.join(metrics_dir, "stage_spans.jsonl"), spans, **labels)
+    stage_metrics.observe(spans)
+    stage_metrics.save_state(os.path.join(metrics_dir, "metrics_state.json"))
+    stage_metrics.write_prometheus(os.path.join(metrics_dir, "metrics.prom"))
+
+def checkpoint_settings(args):
+    """
+    Returns:
+        tuple: (checkpointing enabled, directory holding the run checkpoints)
+    """
+    checkpoint = load_settings().checkpoint
+    enabled = checkpoint.enabled and not args.no_checkpoint
+    return enabled or bool(args.resume), checkpoint.directory
+
+def run_batch(args):
+    """Process every recording in a batch source and write a status/latency report"""
+    from crew.batch import BatchRunner, collect_recordings, write_batch_report
+    from utils.checkpoint import create_batch, load_batch
+    
+    checkpointing, runs_dir = checkpoint_settings(args)
+    batch_dir = None
+    if args.resume:
+        batch_dir, recordings = load_batch(runs_dir, args.resume)
+        print(f"♻️  Resuming batch {args.resume}")
+    else:
+        recordings = collect_recordings(args.batch)
+    if not recordings:
+        print(f"❌ Error: No recordings found for {args.batch}")
+        sys.exit(1)
+    if checkpointing and batch_dir is None:
+        batch_dir = create_batch(runs_dir, recordings, keep_runs=load_settings().checkpoint.keep_runs)
+    if batch_dir:
+        print(f"🗂️  Batch id: {os.path.basename(batch_dir)} (checkpoints in {batch_dir})")
+    
+    runner = BatchRunner(workers=args.workers, use_processes=args.processes, crew_kwargs=crew_options(args))
+    print(f"\n🚀 Processing {len(recordings)} recordings with {runner.workers} "
+          f"{'process' if args.processes else 'thread'} worker(s)")
+    print("-" * 60)
+    
+    save_output = save_output_enabled()
+    stage_metrics = load_stage_metrics(args.metrics_dir) if args.metrics_dir else None
+    
+    def save_entry(index, entry):
+        if entry["status"] != "ok":
+            if args.metrics_dir and entry.get("spans"):
+                export_metrics(args.metrics_dir, stage_metrics, entry["spans"], meeting=entry["path"])
+            return
+        store_meeting(entry["results"], entry["path"])
+        if save_output:
+            stem = os.path.splitext(os.path.basename(entry["path"]))[0]
+            save_results_to_files(entry["results"], os.path.join(args.output_dir, f"{index:04d}_{stem}"))
+        if args.metrics_dir:
+            export_metrics(args.metrics_dir, stage_metrics, entry["results"]["metrics"]["spans"], meeting=entry["path"])
+    
+    report = runner.run(recordings, on_result=save_entry, batch_dir=batch_dir)
+    report_path = write_batch_report(report, args.output_dir)
+    
+    print(f"\n📊 Batch completed: {report['succeeded']}/{report['total']} succeeded "
+          f"in {report['wall_time']:.1f}s ({report['meetings_per_minute']:.2f} meetings/min)")
+    print(f"💾 Batch report saved to {report_path}")
+    
+    if report["failed"]:
+        if batch_dir:
+            print(f"💡 Retry the failed recordings with: python main.py --resume {os.path.basename(batch_dir)}")
+        sys.exit(1)
+
+def run_items(args):
+    """Update and list action items in the action-item store"""
+    from utils.action_store import ActionItemStore
+    
+    load_dotenv()
+    try:
+        store_settings = load_settings().action_store
+    except ConfigError as e:
+        print(f"❌ Error: {str(e)}")
+        sys.exit(1)
+    
+    with ActionItemStore(store_settings.path, store_settings.similarity) as store:
+        for status, item_ids in (("done", args.complete), ("cancelled", args.cancel)):
+            for item_id in item_ids:
+                if store.set_status(item_id, status):
+                    print(f"✅ Item {item_id} marked {status}")
+                else:
+                    print(f"⚠️  No action item with id {item_id}")
+        if (args.complete or args.cancel) and not args.items:
+            return
+        
+        due_before = date.today() + timedelta(days=args.due_within) if args.due_within is not None else None
+        items = store.query(
+            owner=args.owner,
+            status=None if args.status == "all" else args.status,
+            due_before=due_before,
+            priority=args.priority,
+            limit=args.limit or 50
+        )
+    
+    if args.json:
+        print(json.dumps(items, indent=2, ensure_ascii=False))
+        return
+    
+    if not items:
+        print("📭 No matching action items")
+        return
+    print(f"📌 {len(items)} action item(s):")
+    for item in items:
+        due = item["deadline_date"] or item["deadline"] or "no deadline"
+        print(f"   #{item['id']} [{item['status']}] {item['task']}")
+        print(f"      Owner: {item['owner'] or 'Not assigned'} | Due: {due} | Priority: {item['priority'] or '-'} "
+              f"| Meeting: {item['meeting_title']} ({item['meeting_date']})")
+
+def run_search(args):
+    """Search the full-text index, or add saved output files to it"""
+    from utils.search_index import SearchIndex
+    
+    load_dotenv()
+    try:
+        index_settings = load_settings().search_index
+    except ConfigError as e:
+        print(f"❌ Error: {str(e)}")
+        sys.exit(1)
+    
+    with SearchIndex(index_settings.directory, index_settings.merge_factor) as index:
+        if args.index_outputs:
+            added = index_output_files(index, args.index_outputs)
+            print(f"🔎 Indexed {added} saved meeting(s) from {args.index_outputs}")
+        if not args.search:
+            return
+        
+        started = time.perf_counter()
+        results = index.search(args.search, limit=args.limit or 10)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+    
+    if args.json:
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+        return
+    
+    if not results:
+        print(f"📭 No meetings match \"{args.search}\"")
+        return
+    print(f"🔎 {len(results)} meeting(s) for \"{args.search}\" ({elapsed_ms:.1f} ms):")
+    for rank, result in enumerate(results, 1):
+        print(f"\n{rank}. {result['title']} ({result['date']}) - score {result['score']:.2f}")
+        print(f"   {result['snippet']}")
+        print(f"   Source: {result['source']}")
+
+def index_output_files(index, output_dir):
+    """
+    Add meetings saved by save_results_to_files (transcript_<ts>.txt with its
+    summary_<ts>.md) under output_dir to the search index
+
+    Returns:
+        int: Number of meetings indexed
+    """
+    added = 0
+    for directory, _, files in os.walk(output_dir):
+        for name in sorted(files):
+            if not (name.startswith("transcript") and name.endswith(".txt")):
+                continue
+            suffix = name[len("transcript"):-len(".txt")]
+            transcript_path = os.path.join(directory, name)
+            summary_path = os.path.join(directory, f"summary{suffix}.md")
+            with open(transcript_path, "r", encoding="utf-8") as f:
+                transcript = f.read()
+            summary = ""
+            if os.path.isfile(summary_path):
+                with open(summary_path, "r", encoding="utf-8") as f:
+                    summary = f.read()
+            
+            try:
+                date = datetime.strptime(suffix.lstrip("_"), "%Y%m%d_%H%M%S").strftime("%Y-%m-%d")
+            except ValueError:
+                date = datetime.fromtimestamp(os.path.getmtime(transcript_path)).strftime("%Y-%m-%d")
+            # Keyed by path, so indexing the same directory again replaces rather than duplicates
+            index.add_meeting(
+                f"file:{os.path.abspath(transcript_path)}", transcript, summary,
+                title=f"{os.path.basename(os.path.abspath(directory))}{suffix}", date=date, source=transcript_path
+            )
+            added += 1
+    return added
+
+def build_streams(output_dir, timestamp, save_output):
+    """Create token streams that echo the summary and follow-up to the console and their output files"""
+    from utils.streaming import TokenStream, ConsoleSink, FileSink
+    
+    paths = output_file_paths(output_dir, timestamp)
+    if save_output and not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+    
+    streams = {}
+    for stage, header in (("summary", "📋 SUMMARY (streaming):"), ("followup_message", "📧 FOLLOW-UP MESSAGE (streaming):")):
+        sinks = [ConsoleSink(header)]
+        if save_output:
+            sinks.append(FileSink(paths[stage]))
+        streams[stage] = TokenStream(stage, sinks)
+    return streams
+
+def run_revision(args):
+    """Apply a corrected transcript to a checkpointed run and save the revised results"""
+    checkpointing, runs_dir = checkpoint_settings(args)
+    if not args.transcript:
+        print("❌ Error: --revise needs the corrected transcript (--transcript FILE)")
+        sys.exit(1)
+    try:
+        previous = RunCheckpoint.open(runs_dir, args.revise)
+        with open(args.transcript, "r", encoding="utf-8") as f:
+            transcript = f.read()
+    except (FileNotFoundError, OSError) as e:
+        print(f"❌ Error: {str(e)}")
+        sys.exit(1)
+    
+    # The revision is a new run, so it can itself be revised or resumed later (no pruning
+    # here: the run being revised may be the oldest one)
+    checkpoint = RunCheckpoint.create(runs_dir, previous.audio_file) if checkpointing else None
+    if checkpoint is not None:
+        print(f"🗂️  Run id: {checkpoint.run_id}")
+    
+    save_output = save_output_enabled()
+    timestamp = output_timestamp()
+    streams = build_streams(args.output_dir, timestamp, save_output) if args.stream else None
+    
+    crew = MeetingSummarizerCrew(**crew_options(args))
+    results = crew.revise(previous, transcript, checkpoint=checkpoint, streams=streams)
+    crew.display_results(results, skip_sections=streams or ())
+    
+    if save_output:
+        save_results_to_files(results, args.output_dir, timestamp)
+    store_meeting(results, previous.audio_file)
+    print("\n✅ Revised meeting analysis completed successfully!")
+
+def run_live(args):
+    """Follow a meeting in progress and stream transcript/summary/action-item events as JSON lines"""
+    from crew.live import LiveMeetingSession
+    
+    crew = MeetingSummarizerCrew(**crew_options(args))
+    session = LiveMeetingSession(crew, window_seconds=args.window_seconds)
+    results = session.run(args.live)
+    
+    save_output = save_output_enabled()
+    with contextlib.redirect_stdout(sys.stderr):
+        if save_output:
+            save_results_to_files(results, args.output_dir)
+        store_meeting(results, args.live, meeting_key(args.live, results["transcript"]))
+
+def run_server(args):
+    """Serve the job API until interrupted, saving and storing each finished meeting"""
+    from crew.server import build_server
+    from crew.scheduler import MeetingScheduler
+    
+    save_output = save_output_enabled()
+    
+    def on_complete(results, audio_file_path):
+        if save_output:
+            save_results_to_files(results, args.output_dir)
+        store_meeting(results, audio_file_path)
+    
+    checkpointing, _ = checkpoint_settings(args)
+    server = build_server(crew_kwargs=crew_options(args), on_complete=on_complete, host=args.host,
+                          port=args.port, workers=args.workers, checkpointing=checkpointing)
+    service = server.service
+    print(f"\n🌐 Serving on {server.url} with {service.workers} worker(s), queue of {service.queue_size}")
+    if isinstance(service, MeetingScheduler):
+        print(f"   Multi-tenant scheduling: {service.workers} stage slot(s), up to {service.max_active_jobs} "
+              f"active jobs, priorities {', '.join(service.priorities)}")
+    print("   POST /jobs · GET /jobs/<id> · GET /jobs/<id>/events · GET /health (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Server stopped")
+
 def main():
     """Main application entry point"""
-    print("🎯 Meeting Summarizer & Action Tracker")
-    print("=" * 60)
-    print("A CrewAI-powered system for meeting analysis and action item tracking")
-    print()
+    args = parse_args()
     
-    # Setup environment
-    if not setup_environment():
-        sys.exit(1)
+    # Store and index queries need no API key and print nothing else
+    if args.items or args.complete or args.cancel:
+        run_items(args)
+        return
+    if args.search or args.index_outputs:
+        run_search(args)
+        return
+    
+    # Live mode streams JSON events on stdout, so its banner goes to stderr
+    with contextlib.redirect_stdout(sys.stderr if args.live else sys.stdout):
+        print("🎯 Meeting Summarizer & Action Tracker")
+        print("=" * 60)
+        print("A CrewAI-powered system for meeting analysis and action item tracking")
+        print()
+        
+        # Setup environment
+        if not setup_environment():
+            sys.exit(1)
+    
+    if args.output_dir is None:
+        args.output_dir = load_settings().output.output_directory
+    
+    if args.live:
+        run_live(args)
+        return
+    if args.serve:
+        run_server(args)
+        return
+    if args.revise:
+        run_revision(args)
+        return
+    
+    checkpointing, runs_dir = checkpoint_settings(args)
+    if args.batch or (args.resume and is_batch(runs_dir, args.resume)):
+        run_batch(args)
+        return
+    
+    checkpoint = None
+    if args.resume:
+        try:
+            checkpoint = RunCheckpoint.open(runs_dir, args.resume)
+        except FileNotFoundError as e:
+            print(f"❌ Error: {str(e)}")
+            sys.exit(1)
     
     # Determine audio file path
-    if len(sys.argv) > 1:
-        audio_file_path = sys.argv[1]
+    if args.audio_file:
+        audio_file_path = args.audio_file
+    elif checkpoint is not None:
+        audio_file_path = checkpoint.audio_file
     else:
         # Use default sample file
         audio_file_path = "sample_data/meeting_sample.mp3"
         print(f"No audio file specified, using default: {audio_file_path}")
     
     # Validate audio file (in mock mode, this will fail but that's OK)
-    mock_mode = os.getenv("MOCK_MODE", "false").lower() == "true"
+    mock_mode = load_settings().mock_mode
     if not mock_mode and not validate_audio_file(audio_file_path):
         print("\n💡 To test without an audio file, set MOCK_MODE=true in your .env file")
         sys.exit(1)
@@ -109,16 +637,34 @@ def main():
         print(f"\n🚀 Processing audio file: {audio_file_path}")
         print("-" * 60)
         
-        crew = MeetingSummarizerCrew()
-        results = crew.run_crew(audio_file_path)
+        save_output = save_output_enabled()
+        timestamp = output_timestamp()
+        streams = build_streams(args.output_dir, timestamp, save_output) if args.stream else None
         
-        # Display results
-        crew.display_results(results)
+        if checkpoint is not None:
+            # Reopening with the recording discards the checkpoints if the file changed
+            checkpoint = RunCheckpoint(checkpoint.run_dir, audio_file_path)
+        elif checkpointing:
+            checkpoint = RunCheckpoint.create(runs_dir, audio_file_path, keep_runs=load_settings().checkpoint.keep_runs)
+        if checkpoint is not None:
+            print(f"🗂️  Run id: {checkpoint.run_id}")
+        
+        crew = MeetingSummarizerCrew(**crew_options(args))
+        results = crew.run_crew(audio_file_path, streams=streams, checkpoint=checkpoint)
+        
+        # Display results (streamed sections were already shown as they arrived)
+        crew.display_results(results, skip_sections=streams or ())
         
         # Save results to files (optional)
-        save_output = os.getenv("SAVE_OUTPUT", "false").lower() == "true"
         if save_output:
-            save_results_to_files(results)
+            save_results_to_files(results, args.output_dir, timestamp)
+        store_meeting(results, audio_file_path)
+        
+        if args.metrics_dir:
+            export_metrics(args.metrics_dir, load_stage_metrics(args.metrics_dir), results["metrics"]["spans"],
+                           meeting=audio_file_path,
+                           run=timestamp or datetime.now().strftime("%Y%m%d_%H%M%S"))
+            print(f"📈 Stage metrics written to {args.metrics_dir}/")
         
         print("\n✅ Meeting analysis completed successfully!")
         print("\n💡 Next steps:")
@@ -131,6 +677,12 @@ def main():
         sys.exit(0)
     except Exception as e:
         print(f"\n❌ Error: {str(e)}")
+        if args.metrics_dir and getattr(e, "spans", None):
+            # The stages that ran, including the failed one, still count towards the metrics
+            export_metrics(args.metrics_dir, load_stage_metrics(args.metrics_dir), e.spans,
+                           meeting=audio_file_path, run=datetime.now().strftime("%Y%m%d_%H%M%S"))
+        if checkpoint is not None:
+            print(f"\n💡 Completed stages were saved. Resume with: python main.py --resume {checkpoint.run_id}")
         print("\n🔧 Troubleshooting:")
         print("   - Check your OPENAI_API_KEY in the .env file")
         print("   - Verify the audio file path and format")
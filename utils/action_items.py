@@ -0,0 +1,178 @@
+import re
+from datetime import date, timedelta
+from difflib import SequenceMatcher
+
+PRIORITY_RANK = {"high": 3, "medium": 2, "low": 1}
+UNSPECIFIED = {"", "not specified", "not assigned", "no deadline", "no deadline specified", "none", "n/a", "tbd"}
+
+def normalize_text(text):
+    """Lowercase, strip punctuation and collapse whitespace for comparisons"""
+    return " ".join(re.sub(r"[^\w\s]", " ", str(text or "").lower()).split())
+
+def is_unspecified(value):
+    """True for empty placeholders such as "Not specified" or "Not assigned" """
+    return normalize_text(value) in UNSPECIFIED
+
+def similar_items(first, second, similarity=0.8):
+    """
+    Decide whether two action items describe the same commitment
+
+    Items match when their owners agree (or one is unspecified) and their task
+    descriptions are at least `similarity` alike.
+
+    Args:
+        first (dict): Action item
+        second (dict): Action item
+        similarity (float): Minimum task similarity ratio
+
+    Returns:
+        bool: True when the items are duplicates
+    """
+    first_owner = normalize_text(first.get("owner"))
+    second_owner = normalize_text(second.get("owner"))
+    if first_owner != second_owner and not (is_unspecified(first_owner) or is_unspecified(second_owner)):
+        return False
+
+    first_task = normalize_text(first.get("task"))
+    second_task = normalize_text(second.get("task"))
+    if first_task == second_task:
+        return True
+    return SequenceMatcher(None, first_task, second_task).ratio() >= similarity
+
+def merge_item(kept, duplicate):
+    """Fill gaps in `kept` from `duplicate` and keep the higher priority"""
+    for field in ("owner", "deadline", "context"):
+        if is_unspecified(kept.get(field)) and not is_unspecified(duplicate.get(field)):
+            kept[field] = duplicate[field]
+
+    kept_rank = PRIORITY_RANK.get(normalize_text(kept.get("priority")), 0)
+    duplicate_rank = PRIORITY_RANK.get(normalize_text(duplicate.get("priority")), 0)
+    if duplicate_rank > kept_rank:
+        kept["priority"] = duplicate["priority"]
+    return kept
+
+def merge_action_items(item_lists, similarity=0.8):
+    """
+    Concatenate action-item lists and drop near-duplicates, keeping first-seen order
+
+    Args:
+        item_lists (list): Lists of action item dicts (e.g. one per transcript chunk)
+        similarity (float): Minimum task similarity ratio for two items to be merged
+
+    Returns:
+        list: De-duplicated action items
+    """
+    merged = []
+    for items in item_lists:
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            for kept in merged:
+                if similar_items(kept, item, similarity):
+                    merge_item(kept, item)
+                    break
+            else:
+                merged.append(dict(item))
+    return merged
+
+def normalize_owner(owner):
+    """Owner key used for matching and lookups: normalized text, "" when unassigned"""
+    owner = normalize_text(owner)
+    return "" if owner in UNSPECIFIED else owner
+
+_WEEKDAYS = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+_MONTHS = ("january", "february", "march", "april", "may", "june", "july",
+           "august", "september", "october", "november", "december")
+_MONTH_PATTERN = (r"(january|february|march|april|may|june|july|august|september|october|november|december"
+                  r"|jan|feb|mar|apr|jun|jul|aug|sept|sep|oct|nov|dec)")
+_WEEKDAY_PATTERN = r"(monday|tuesday|wednesday|thursday|friday|saturday|sunday|mon|tues|tue|wed|thurs|thur|thu|fri|sat|sun)"
+
+def _month_number(name):
+    return next(index for index, month in enumerate(_MONTHS, 1) if month.startswith(name[:3]))
+
+def _month_end(year, month):
+    following = date(year + (month == 12), month % 12 + 1, 1)
+    return following - timedelta(days=1)
+
+def _build_date(year, month, day, reference, year_given):
+    try:
+        parsed = date(year, month, day)
+    except ValueError:
+        return None
+    # "June 14" said in December means next June
+    if not year_given and parsed < reference:
+        try:
+            parsed = date(year + 1, month, day)
+        except ValueError:
+            pass
+    return parsed
+
+def parse_deadline(deadline, reference=None):
+    """
+    Turn a free-text deadline such as "Friday", "next Monday", "June 14",
+    "2024-06-14", "end of month" or "in 2 weeks" into a date
+
+    Args:
+        deadline (str): Deadline as extracted from the meeting
+        reference (date): Meeting date that relative deadlines count from (defaults to today)
+
+    Returns:
+        date: The deadline, or None when it cannot be resolved
+    """
+    if is_unspecified(deadline):
+        return None
+    reference = reference or date.today()
+    text = str(deadline).lower()
+
+    match = re.search(r"\b(\d{4})-(\d{1,2})-(\d{1,2})\b", text)
+    if match:
+        return _build_date(int(match.group(1)), int(match.group(2)), int(match.group(3)), reference, True)
+
+    match = re.search(r"\b(\d{1,2})/(\d{1,2})(?:/(\d{2,4}))?\b", text)
+    if match:
+        year = int(match.group(3)) if match.group(3) else reference.year
+        year += 2000 if year < 100 else 0
+        return _build_date(year, int(match.group(1)), int(match.group(2)), reference, bool(match.group(3)))
+
+    match = (re.search(rf"\b{_MONTH_PATTERN}\.?\s+(\d{{1,2}})(?:st|nd|rd|th)?\b(?:,?\s+(\d{{4}}))?", text)
+             or re.search(rf"\b(\d{{1,2}})(?:st|nd|rd|th)?\s+(?:of\s+)?{_MONTH_PATTERN}\b\.?(?:,?\s+(\d{{4}}))?", text))
+    if match:
+        first, second, year = match.groups()
+        month_name, day = (first, second) if not first.isdigit() else (second, first)
+        year_given = year is not None
+        return _build_date(int(year) if year_given else reference.year, _month_number(month_name), int(day),
+                           reference, year_given)
+
+    # A weekday wins over a time of day ("Thursday EOD")
+    match = re.search(rf"\b(next\s+)?{_WEEKDAY_PATTERN}\b", text)
+    if match:
+        weekday = next(index for index, name in enumerate(_WEEKDAYS) if name.startswith(match.group(2)[:3]))
+        days = (weekday - reference.weekday()) % 7
+        if days == 0 and match.group(1):
+            days = 7
+        return reference + timedelta(days=days)
+
+    if re.search(r"\b(today|tonight|eod|end of (the )?day)\b", text):
+        return reference
+    if re.search(r"\btomorrow\b", text):
+        return reference + timedelta(days=1)
+
+    match = re.search(r"\b(?:in|within)\s+(\d+|a|one|two|three|four)\s+(day|week|month)s?\b", text)
+    if match:
+        count = {"a": 1, "one": 1, "two": 2, "three": 3, "four": 4}.get(match.group(1))
+        count = count or int(match.group(1))
+        days = {"day": 1, "week": 7, "month": 30}[match.group(2)] * count
+        return reference + timedelta(days=days)
+
+    friday = reference + timedelta(days=(4 - reference.weekday()) % 7)
+    if re.search(r"\b(end of (the )?week|eow|this week)\b", text):
+        return friday
+    if re.search(r"\bnext week\b", text):
+        return friday + timedelta(days=7)
+    if re.search(r"\b(end of (the )?month|eom|this month)\b", text):
+        return _month_end(reference.year, reference.month)
+    if re.search(r"\bnext month\b", text):
+        following = _month_end(reference.year, reference.month) + timedelta(days=1)
+        return _month_end(following.year, following.month)
+
+    return None
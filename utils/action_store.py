@@ -0,0 +1,295 @@
+import os
+import sqlite3
+import threading
+from datetime import date, datetime
+from difflib import SequenceMatcher
+from utils.action_items import (
+    PRIORITY_RANK, normalize_text, normalize_owner, is_unspecified, parse_deadline
+)
+
+STATUSES = ("open", "done", "cancelled")
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meetings (
+    id INTEGER PRIMARY KEY,
+    meeting_key TEXT NOT NULL UNIQUE,
+    title TEXT,
+    source TEXT,
+    meeting_date TEXT NOT NULL,
+    recorded_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS action_items (
+    id INTEGER PRIMARY KEY,
+    task TEXT NOT NULL,
+    task_norm TEXT NOT NULL,
+    owner TEXT,
+    owner_norm TEXT NOT NULL,
+    deadline TEXT,
+    deadline_date TEXT,
+    priority TEXT,
+    priority_rank INTEGER NOT NULL DEFAULT 0,
+    context TEXT,
+    status TEXT NOT NULL DEFAULT 'open',
+    meeting_id INTEGER NOT NULL REFERENCES meetings(id),
+    meetings_seen INTEGER NOT NULL DEFAULT 1,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS action_item_sources (
+    item_id INTEGER NOT NULL REFERENCES action_items(id),
+    meeting_id INTEGER NOT NULL REFERENCES meetings(id),
+    PRIMARY KEY (item_id, meeting_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_items_status_owner_deadline ON action_items (status, owner_norm, deadline_date);
+CREATE INDEX IF NOT EXISTS idx_items_status_deadline ON action_items (status, deadline_date);
+CREATE INDEX IF NOT EXISTS idx_items_owner ON action_items (owner_norm);
+CREATE INDEX IF NOT EXISTS idx_items_deadline ON action_items (deadline_date);
+CREATE INDEX IF NOT EXISTS idx_items_meeting ON action_items (meeting_id);
+"""
+
+_ITEM_COLUMNS = """
+    i.id, i.task, i.owner, i.deadline, i.deadline_date, i.priority, i.context, i.status,
+    i.meetings_seen, i.created_at, i.updated_at, m.meeting_key, m.title AS meeting_title, m.meeting_date
+"""
+
+def _now():
+    return datetime.now().isoformat(timespec="seconds")
+
+class ActionItemStore:
+    """
+    SQLite store of the action items extracted from every processed meeting.
+
+    Items are upserted per meeting: an item that matches an open item (same
+    owner, or either unassigned, and a similar task) updates it instead of
+    being added again, so the store holds one row per commitment. Owner,
+    deadline date and status are indexed for fast lookups such as "what does
+    Lisa owe this week".
+    """
+
+    def __init__(self, path, similarity=0.8):
+        """
+        Args:
+            path (str): SQLite database file (created with its directory if missing)
+            similarity (float): Minimum task similarity for an item to match an open one
+        """
+        self.path = path
+        self.similarity = similarity
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+        # WAL lets queries run while a batch worker is writing
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute("PRAGMA foreign_keys=ON")
+        with self._connection:
+            self._connection.executescript(_SCHEMA)
+            self._connection.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+    def close(self):
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def record_meeting(self, meeting_key, action_items, title=None, source=None, meeting_date=None):
+        """
+        Upsert the action items of one meeting. Recording the same meeting again
+        updates its items rather than duplicating them.
+
+        Args:
+            meeting_key (str): Stable id of the meeting (e.g. the recording's content hash)
+            action_items (list): Action item dicts from the extractor
+            title (str): Display name of the meeting
+            source (str): Where the meeting came from (e.g. the recording path)
+            meeting_date (date): Date relative deadlines such as "Friday" count from (defaults to today)
+
+        Returns:
+            dict: {"meeting_id", "inserted", "updated"}
+        """
+        meeting_date = meeting_date or date.today()
+        now = _now()
+        inserted = updated = 0
+
+        with self._lock, self._connection:
+            connection = self._connection
+            connection.execute(
+                "INSERT INTO meetings (meeting_key, title, source, meeting_date, recorded_at) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(meeting_key) DO UPDATE SET title = excluded.title, source = excluded.source, "
+                "recorded_at = excluded.recorded_at",
+                (meeting_key, title, source, meeting_date.isoformat(), now)
+            )
+            meeting_id = connection.execute(
+                "SELECT id FROM meetings WHERE meeting_key = ?", (meeting_key,)
+            ).fetchone()["id"]
+
+            for item in action_items or []:
+                if not isinstance(item, dict) or is_unspecified(item.get("task")):
+                    continue
+                match = self._find_open_match(item)
+                if match is None:
+                    self._insert_item(item, meeting_id, meeting_date, now)
+                    inserted += 1
+                else:
+                    self._update_item(match, item, meeting_id, meeting_date, now)
+                    updated += 1
+
+        return {"meeting_id": meeting_id, "inserted": inserted, "updated": updated}
+
+    def _find_open_match(self, item):
+        """Return the open row describing the same commitment as `item`, if any"""
+        owner_norm = normalize_owner(item.get("owner"))
+        task_norm = normalize_text(item.get("task"))
+        if owner_norm:
+            rows = self._connection.execute(
+                "SELECT * FROM action_items WHERE status = 'open' AND owner_norm IN (?, '')", (owner_norm,)
+            )
+        else:
+            rows = self._connection.execute("SELECT * FROM action_items WHERE status = 'open'")
+
+        best = None
+        best_ratio = self.similarity
+        # The new task is the second sequence, so its analysis is reused across rows
+        matcher = SequenceMatcher(None, "", task_norm)
+        for row in rows:
+            if row["task_norm"] == task_norm:
+                return row
+            matcher.set_seq1(row["task_norm"])
+            # The cheap upper bounds rule out most rows before the full comparison
+            if matcher.real_quick_ratio() < best_ratio or matcher.quick_ratio() < best_ratio:
+                continue
+            ratio = matcher.ratio()
+            if ratio >= best_ratio:
+                best, best_ratio = row, ratio
+        return best
+
+    def _insert_item(self, item, meeting_id, meeting_date, now):
+        deadline = item.get("deadline")
+        deadline_date = parse_deadline(deadline, meeting_date)
+        cursor = self._connection.execute(
+            "INSERT INTO action_items (task, task_norm, owner, owner_norm, deadline, deadline_date, priority, "
+            "priority_rank, context, meeting_id, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                item["task"], normalize_text(item["task"]),
+                item.get("owner"), normalize_owner(item.get("owner")),
+                deadline, deadline_date.isoformat() if deadline_date else None,
+                item.get("priority"), PRIORITY_RANK.get(normalize_text(item.get("priority")), 0),
+                item.get("context"), meeting_id, now, now
+            )
+        )
+        self._connection.execute(
+            "INSERT INTO action_item_sources (item_id, meeting_id) VALUES (?, ?)", (cursor.lastrowid, meeting_id)
+        )
+
+    def _update_item(self, row, item, meeting_id, meeting_date, now):
+        """Fill gaps in a stored item from a later mention and keep the higher priority"""
+        updates = {}
+        if not row["owner_norm"] and normalize_owner(item.get("owner")):
+            updates["owner"] = item["owner"]
+            updates["owner_norm"] = normalize_owner(item["owner"])
+        if not is_unspecified(item.get("deadline")):
+            deadline_date = parse_deadline(item["deadline"], meeting_date)
+            # A later meeting that names a concrete date refines or moves the deadline
+            if deadline_date is not None or is_unspecified(row["deadline"]):
+                updates["deadline"] = item["deadline"]
+                updates["deadline_date"] = deadline_date.isoformat() if deadline_date else None
+        if is_unspecified(row["context"]) and not is_unspecified(item.get("context")):
+            updates["context"] = item["context"]
+        rank = PRIORITY_RANK.get(normalize_text(item.get("priority")), 0)
+        if rank > row["priority_rank"]:
+            updates["priority"] = item["priority"]
+            updates["priority_rank"] = rank
+
+        linked = self._connection.execute(
+            "INSERT OR IGNORE INTO action_item_sources (item_id, meeting_id) VALUES (?, ?)", (row["id"], meeting_id)
+        ).rowcount
+        assignments = [f"{column} = ?" for column in updates] + ["meetings_seen = meetings_seen + ?", "updated_at = ?"]
+        self._connection.execute(
+            f"UPDATE action_items SET {', '.join(assignments)} WHERE id = ?",
+            list(updates.values()) + [linked, now, row["id"]]
+        )
+
+    def query(self, owner=None, status="open", due_before=None, due_after=None, priority=None,
+              meeting_key=None, limit=100):
+        """
+        Look up action items, soonest deadline first (undated items last)
+
+        Args:
+            owner (str): Owner name; "lisa" also matches "Lisa Chen"
+            status (str): "open", "done", "cancelled", or None for all
+            due_before (date): Only items due on or before this date
+            due_after (date): Only items due on or after this date
+            priority (str): "High", "Medium" or "Low"
+            meeting_key (str): Only items first raised in this meeting
+            limit (int): Maximum rows returned
+
+        Returns:
+            list: Action item dicts with their meeting's key, title and date
+        """
+        conditions = []
+        params = []
+        if status:
+            conditions.append("i.status = ?")
+            params.append(status)
+        if owner:
+            owner_norm = normalize_owner(owner)
+            # Range instead of LIKE so the owner index is used for first-name lookups
+            conditions.append("(i.owner_norm = ? OR (i.owner_norm >= ? AND i.owner_norm < ?))")
+            params += [owner_norm, owner_norm + " ", owner_norm + "!"]
+        if due_before:
+            conditions.append("i.deadline_date <= ?")
+            params.append(due_before.isoformat())
+        if due_after:
+            conditions.append("i.deadline_date >= ?")
+            params.append(due_after.isoformat())
+        if priority:
+            conditions.append("i.priority_rank = ?")
+            params.append(PRIORITY_RANK.get(normalize_text(priority), 0))
+        if meeting_key:
+            conditions.append("m.meeting_key = ?")
+            params.append(meeting_key)
+
+        sql = f"SELECT {_ITEM_COLUMNS} FROM action_items i JOIN meetings m ON m.id = i.meeting_id"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY i.deadline_date IS NULL, i.deadline_date, i.priority_rank DESC, i.id LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            return [dict(row) for row in self._connection.execute(sql, params)]
+
+    def set_status(self, item_id, status):
+        """
+        Mark an action item open, done or cancelled
+
+        Args:
+            item_id (int): Item id as returned by query()
+            status (str): One of STATUSES
+
+        Returns:
+            bool: False when no item has that id
+        """
+        if status not in STATUSES:
+            raise ValueError(f"Unknown status {status!r}; expected one of {', '.join(STATUSES)}")
+        with self._lock, self._connection:
+            cursor = self._connection.execute(
+                "UPDATE action_items SET status = ?, updated_at = ? WHERE id = ?", (status, _now(), item_id)
+            )
+        return cursor.rowcount > 0
+
+    def stats(self):
+        """
+        Returns:
+            dict: Meeting count and item counts per status
+        """
+        with self._lock:
+            meetings = self._connection.execute("SELECT COUNT(*) FROM meetings").fetchone()[0]
+            items = dict(self._connection.execute("SELECT status, COUNT(*) FROM action_items GROUP BY status").fetchall())
+        return {"meetings": meetings, "items": {status: items.get(status, 0) for status in STATUSES}}
@@ -0,0 +1,258 @@
+import os
+import re
+import sys
+import wave
+import shutil
+import subprocess
+
+def require_ffmpeg():
+    """Raise a helpful error when the ffmpeg/ffprobe binaries are not installed"""
+    missing = [tool for tool in ("ffmpeg", "ffprobe") if shutil.which(tool) is None]
+    if missing:
+        raise RuntimeError(
+            f"{' and '.join(missing)} not found on PATH; install ffmpeg to process long recordings"
+        )
+
+def probe_duration(audio_file_path):
+    """
+    Read the duration of an audio file with ffprobe
+
+    Args:
+        audio_file_path (str): Path to the audio file
+
+    Returns:
+        float: Duration in seconds
+    """
+    require_ffmpeg()
+    output = subprocess.run(
+        [
+            "ffprobe", "-v", "error",
+            "-show_entries", "format=duration",
+            "-of", "default=noprint_wrappers=1:nokey=1",
+            audio_file_path
+        ],
+        check=True, capture_output=True, text=True
+    ).stdout.strip()
+    return float(output)
+
+def audio_duration(audio_file_path):
+    """
+    Best-effort duration of a recording: WAV headers are read directly, other
+    formats need ffprobe
+
+    Args:
+        audio_file_path (str): Path to the audio file
+
+    Returns:
+        float: Duration in seconds, or None when it cannot be determined
+    """
+    try:
+        with wave.open(audio_file_path, "rb") as wav_file:
+            return wav_file.getnframes() / float(wav_file.getframerate())
+    except (wave.Error, EOFError):
+        pass
+    if shutil.which("ffprobe") is None:
+        return None
+    try:
+        return probe_duration(audio_file_path)
+    except (subprocess.CalledProcessError, ValueError):
+        return None
+
+def plan_chunks(duration, chunk_seconds, overlap_seconds):
+    """
+    Split a recording's timeline into overlapping windows
+
+    Args:
+        duration (float): Total length in seconds
+        chunk_seconds (float): Length of each window
+        overlap_seconds (float): Overlap between consecutive windows
+
+    Returns:
+        list: (start, end) tuples in seconds
+    """
+    if overlap_seconds >= chunk_seconds:
+        raise ValueError("Chunk overlap must be shorter than the chunk duration")
+
+    chunks = []
+    start = 0.0
+    step = chunk_seconds - overlap_seconds
+    while start < duration:
+        end = min(start + chunk_seconds, duration)
+        chunks.append((start, end))
+        if end >= duration:
+            break
+        start += step
+    return chunks
+
+def extract_chunk(audio_file_path, start, end, output_path, sample_rate=16000, bitrate="64k"):
+    """
+    Cut [start, end) out of a recording as a compact mono MP3
+
+    Args:
+        audio_file_path (str): Source recording
+        start (float): Window start in seconds
+        end (float): Window end in seconds
+        output_path (str): Destination file
+        sample_rate (int): Output sample rate
+        bitrate (str): Output bitrate passed to ffmpeg
+
+    Returns:
+        str: The output path
+    """
+    require_ffmpeg()
+    subprocess.run(
+        [
+            "ffmpeg", "-v", "error", "-y",
+            "-ss", f"{start:.3f}", "-t", f"{end - start:.3f}",
+            "-i", audio_file_path,
+            "-ac", "1", "-ar", str(sample_rate), "-b:a", bitrate,
+            output_path
+        ],
+        check=True, capture_output=True
+    )
+    return output_path
+
+def split_audio(audio_file_path, output_dir, chunk_seconds=600, overlap_seconds=5):
+    """
+    Split a recording into overlapping chunk files
+
+    Args:
+        audio_file_path (str): Source recording
+        output_dir (str): Directory that receives the chunk files
+        chunk_seconds (float): Length of each chunk
+        overlap_seconds (float): Overlap between consecutive chunks
+
+    Returns:
+        list: (start, end, chunk_path) tuples in timeline order
+    """
+    duration = probe_duration(audio_file_path)
+    chunks = []
+    for index, (start, end) in enumerate(plan_chunks(duration, chunk_seconds, overlap_seconds)):
+        chunk_path = os.path.join(output_dir, f"chunk_{index:04d}.mp3")
+        extract_chunk(audio_file_path, start, end, chunk_path)
+        chunks.append((start, end, chunk_path))
+    return chunks
+
+def open_pcm_stream(source, sample_rate=16000, idle_timeout=15):
+    """
+    Start decoding a recording that may still be growing (or stdin when source
+    is "-") into raw 16-bit mono PCM on the process's stdout
+
+    Args:
+        source (str): Path of the recording being written, or "-" for stdin
+        sample_rate (int): Output sample rate
+        idle_timeout (float): Seconds without new data after which a growing file is considered finished
+
+    Returns:
+        subprocess.Popen: The running ffmpeg process
+    """
+    require_ffmpeg()
+    if source == "-":
+        input_args = ["-i", "pipe:0"]
+        stdin = sys.stdin.buffer
+    else:
+        input_args = ["-nostdin", "-follow", "1", "-rw_timeout", str(int(idle_timeout * 1000000)), "-i", f"file:{source}"]
+        stdin = subprocess.DEVNULL
+
+    return subprocess.Popen(
+        ["ffmpeg", "-v", "error"] + input_args + ["-f", "s16le", "-ac", "1", "-ar", str(sample_rate), "pipe:1"],
+        stdin=stdin, stdout=subprocess.PIPE
+    )
+
+def write_wav(output_path, pcm_bytes, sample_rate=16000):
+    """
+    Write raw 16-bit mono PCM to a WAV file
+
+    Args:
+        output_path (str): Destination file
+        pcm_bytes (bytes): Little-endian 16-bit samples
+        sample_rate (int): Sample rate of the samples
+
+    Returns:
+        str: The output path
+    """
+    with wave.open(output_path, "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(pcm_bytes)
+    return output_path
+
+_SILENCE_START = re.compile(r"silence_start:\s*(-?[\d.]+)")
+_SILENCE_END = re.compile(r"silence_end:\s*(-?[\d.]+)")
+
+def detect_silence(audio_file_path, threshold_db=-40.0, min_silence_seconds=1.0, sample_rate=16000):
+    """
+    Find the silent stretches of a recording with ffmpeg's energy-based silencedetect filter
+
+    Args:
+        audio_file_path (str): Source recording
+        threshold_db (float): Level below which audio counts as silence
+        min_silence_seconds (float): Shortest silence reported
+        sample_rate (int): Rate the (mono) audio is analyzed at
+
+    Returns:
+        list: (start, end) tuples in seconds; a trailing silence ends at None
+    """
+    require_ffmpeg()
+    output = subprocess.run(
+        [
+            "ffmpeg", "-hide_banner", "-nostats", "-nostdin", "-v", "info",
+            "-i", audio_file_path,
+            "-ac", "1", "-ar", str(sample_rate),
+            "-af", f"silencedetect=noise={threshold_db}dB:d={min_silence_seconds}",
+            "-f", "null", "-"
+        ],
+        check=True, capture_output=True, text=True
+    ).stderr
+
+    silences = []
+    start = None
+    for line in output.splitlines():
+        match = _SILENCE_START.search(line)
+        if match:
+            start = max(0.0, float(match.group(1)))
+            continue
+        match = _SILENCE_END.search(line)
+        if match and start is not None:
+            silences.append((start, float(match.group(1))))
+            start = None
+    if start is not None:
+        silences.append((start, None))
+    return silences
+
+def encode_segments(audio_file_path, segments, output_path, sample_rate=16000, channels=1, bitrate="32k"):
+    """
+    Re-encode the given stretches of a recording, back to back, as a compact MP3
+
+    Args:
+        audio_file_path (str): Source recording
+        segments (list): (start, end) tuples in seconds to keep, in order; None keeps everything
+        output_path (str): Destination file
+        sample_rate (int): Output sample rate
+        channels (int): Output channel count (1 downmixes to mono)
+        bitrate (str): Output bitrate passed to ffmpeg
+
+    Returns:
+        str: The output path
+    """
+    require_ffmpeg()
+    layout = "mono" if channels == 1 else "stereo"
+    # Convert first and cut in 10 ms frames, so the kept stretches line up with
+    # the offset map to within one frame
+    filters = [f"aformat=sample_rates={sample_rate}:channel_layouts={layout}"]
+    if segments is not None:
+        selection = "+".join(f"between(t,{start:.3f},{end:.3f})" for start, end in segments)
+        filters += [f"asetnsamples=n={max(1, sample_rate // 100)}", f"aselect='{selection}'", "asetpts=N/SR/TB"]
+
+    subprocess.run(
+        [
+            "ffmpeg", "-v", "error", "-y", "-nostdin",
+            "-i", audio_file_path,
+            "-af", ",".join(filters),
+            "-ac", str(channels), "-ar", str(sample_rate), "-b:a", bitrate,
+            output_path
+        ],
+        check=True, capture_output=True
+    )
+    return output_path
@@ -0,0 +1,297 @@
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from utils.metrics import current_span
+
+# Every stage name the agents cache under, in pipeline order
+STAGES = (
+    "transcript",
+    "summary", "summary_chunk", "summary_update",
+    "action_items", "action_items_chunk",
+    "analysis", "analysis_chunk",
+    "followup_message"
+)
+
+# Refreshing a stage also refreshes the map and incremental steps that feed it
+RELATED_STAGES = {
+    "summary": ("summary_chunk", "summary_update"),
+    "action_items": ("action_items_chunk",),
+    "analysis": ("analysis_chunk",)
+}
+
+def expand_refresh_stages(stages):
+    """
+    Args:
+        stages (iterable): Stage names requested for a refresh
+
+    Returns:
+        set: The stages together with their related map and update stages
+    """
+    expanded = set()
+    for stage in stages:
+        expanded.add(stage)
+        expanded.update(RELATED_STAGES.get(stage, ()))
+    return expanded
+
+def file_hash(file_path, block_size=1024 * 1024):
+    """
+    Compute the SHA-256 of a file's contents
+
+    Args:
+        file_path (str): Path to the file
+        block_size (int): Read size in bytes
+
+    Returns:
+        str: Hex digest
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def request_key(*parts, **params):
+    """
+    Hash the inputs that determine a stage's output (prompt messages, model,
+    temperature, max_tokens, ...) into a cache key
+
+    Returns:
+        str: Hex digest
+    """
+    payload = json.dumps({"parts": parts, "params": params}, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class _CacheIndex:
+    """LRU order, total size and process-wide hit/miss counters of one cache directory"""
+
+    def __init__(self, cache_dir, max_size_bytes):
+        self.cache_dir = cache_dir
+        self.max_size_bytes = max_size_bytes
+        self.hits = {}
+        self.misses = {}
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.total_size = 0
+
+    def load(self):
+        """Rebuild the LRU order from the entry files' modification times"""
+        if not os.path.isdir(self.cache_dir):
+            return
+
+        found = []
+        for stage in os.listdir(self.cache_dir):
+            stage_dir = os.path.join(self.cache_dir, stage)
+            if not os.path.isdir(stage_dir):
+                continue
+            for name in os.listdir(stage_dir):
+                path = os.path.join(stage_dir, name)
+                stat = os.stat(path)
+                found.append((stat.st_mtime, path, stat.st_size))
+
+        for _, path, size in sorted(found):
+            self.entries[path] = size
+            self.total_size += size
+
+class StageCache:
+    """
+    Content-addressed on-disk cache for pipeline stage outputs.
+
+    Entries are JSON files under <cache_dir>/<stage>/<key>.json. The total size
+    is bounded by max_size_mb; the least recently used entries are evicted
+    first. Hit/miss counters are kept per stage, both for the whole process
+    (stats()) and on the span of the stage that made the lookup, so each run
+    can report its own.
+    """
+
+    def __init__(self, cache_dir=".cache/stages", max_size_mb=500, enabled=True, refresh_stages=(), index=None):
+        """
+        Args:
+            cache_dir (str): Directory holding the cache entries
+            max_size_mb (float): Upper bound on the total size of all entries
+            enabled (bool): When False every lookup is a miss and nothing is stored
+            refresh_stages (iterable): Stages whose cached entries are ignored and overwritten
+                (a top-level stage such as "summary" includes its chunk stages)
+            index (_CacheIndex): LRU index shared with other caches on the same directory
+                (see get_stage_cache); a new one is loaded from disk when omitted
+        """
+        self.cache_dir = cache_dir
+        self.enabled = enabled
+        self.refresh_stages = expand_refresh_stages(refresh_stages)
+        if index is None:
+            index = _CacheIndex(cache_dir, int(max_size_mb * 1024 * 1024))
+            if self.enabled:
+                index.load()
+        self._index = index
+
+    def _entry_path(self, stage, key):
+        return os.path.join(self.cache_dir, stage, f"{key}.json")
+
+    def get(self, stage, key):
+        """
+        Look up a cached stage output
+
+        Args:
+            stage (str): Stage name
+            key (str): Cache key from file_hash/request_key
+
+        Returns:
+            tuple: (found, value)
+        """
+        if not self.enabled or stage in self.refresh_stages:
+            self._count(stage, hit=False)
+            return False, None
+
+        path = self._entry_path(stage, key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                value = json.load(f)["value"]
+        except (OSError, ValueError, KeyError):
+            self._count(stage, hit=False)
+            return False, None
+
+        with self._index.lock:
+            if path in self._index.entries:
+                self._index.entries.move_to_end(path)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self._count(stage, hit=True)
+        return True, value
+
+    def set(self, stage, key, value):
+        """
+        Store a stage output and evict old entries if the cache is over its size limit
+
+        Args:
+            stage (str): Stage name
+            key (str): Cache key
+            value: JSON-serializable stage output
+        """
+        if not self.enabled:
+            return
+
+        path = self._entry_path(stage, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Write to a temporary file first so concurrent readers never see partial JSON
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"stage": stage, "value": value}, f, ensure_ascii=False)
+        os.replace(temp_path, path)
+        size = os.path.getsize(path)
+
+        index = self._index
+        with index.lock:
+            index.total_size -= index.entries.pop(path, 0)
+            index.entries[path] = size
+            index.total_size += size
+            self._evict()
+
+    def _evict(self):
+        index = self._index
+        while index.total_size > index.max_size_bytes and len(index.entries) > 1:
+            path, size = index.entries.popitem(last=False)
+            index.total_size -= size
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def get_or_compute(self, stage, key, compute, on_hit=None):
+        """
+        Return the cached output for a stage, computing and storing it on a miss
+
+        Args:
+            stage (str): Stage name
+            key (str): Cache key
+            compute (callable): Produces the stage output when it is not cached
+            on_hit (callable): Optional callback receiving the cached value on a hit
+
+        Returns:
+            The stage output
+        """
+        found, value = self.get(stage, key)
+        if found:
+            if on_hit:
+                on_hit(value)
+            return value
+
+        value = compute()
+        self.set(stage, key, value)
+        return value
+
+    async def aget_or_compute(self, stage, key, compute, on_hit=None):
+        """
+        Async variant of get_or_compute
+
+        Args:
+            stage (str): Stage name
+            key (str): Cache key
+            compute (callable): Returns an awaitable producing the stage output
+            on_hit (callable): Optional callback receiving the cached value on a hit
+
+        Returns:
+            The stage output
+        """
+        found, value = self.get(stage, key)
+        if found:
+            if on_hit:
+                on_hit(value)
+            return value
+
+        value = await compute()
+        self.set(stage, key, value)
+        return value
+
+    def _count(self, stage, hit):
+        counter = self._index.hits if hit else self._index.misses
+        with self._index.lock:
+            counter[stage] = counter.get(stage, 0) + 1
+        span = current_span()
+        if span is not None:
+            span.record_cache(stage, hit)
+
+    def stats(self):
+        """
+        Report cache effectiveness
+
+        Returns:
+            dict: Process-wide hit/miss counters per stage, entry count and total size
+        """
+        index = self._index
+        with index.lock:
+            return {
+                "enabled": self.enabled,
+                "hits": dict(index.hits),
+                "misses": dict(index.misses),
+                "entries": len(index.entries),
+                "size_bytes": index.total_size
+            }
+
+_shared_indexes = {}
+_shared_lock = threading.Lock()
+
+def get_stage_cache(cache_dir=".cache/stages", max_size_mb=500, refresh_stages=()):
+    """
+    Return a cache on a directory that shares one LRU index and one set of
+    process-wide counters with every other crew using that directory
+
+    Args:
+        cache_dir (str): Directory holding the cache entries
+        max_size_mb (float): Upper bound on the total size of all entries
+        refresh_stages (iterable): Stages this cache recomputes instead of reading
+            (other crews sharing the directory are not affected)
+
+    Returns:
+        StageCache: A cache over the shared index
+    """
+    with _shared_lock:
+        if cache_dir not in _shared_indexes:
+            index = _CacheIndex(cache_dir, int(max_size_mb * 1024 * 1024))
+            index.load()
+            _shared_indexes[cache_dir] = index
+        index = _shared_indexes[cache_dir]
+    return StageCache(cache_dir, max_size_mb, refresh_stages=refresh_stages, index=index)
@@ -0,0 +1,244 @@
+import os
+import json
+import uuid
+import shutil
+import threading
+from datetime import datetime
+from utils.cache import file_hash
+
+MANIFEST_NAME = "run.json"
+BATCH_MANIFEST_NAME = "batch.json"
+
+def new_run_id():
+    """
+    Returns:
+        str: A sortable, unique run id such as 20240613_101500_3fa2c1
+    """
+    return f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+
+def _json_default(value):
+    # Stage outputs such as SegmentStore provide their own JSON form
+    if hasattr(value, "to_dict"):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def _write_json(path, payload):
+    # Write to a temporary file first so a crash never leaves a half-written checkpoint
+    temp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2, ensure_ascii=False, default=_json_default)
+    os.replace(temp_path, path)
+
+def _read_json(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def _safe_hash(audio_file_path):
+    if audio_file_path and os.path.isfile(audio_file_path):
+        return file_hash(audio_file_path)
+    return None
+
+class RunCheckpoint:
+    """
+    Durable record of one pipeline run.
+
+    Each stage output is written to <run_dir>/<stage>.json as soon as the stage
+    finishes. run.json tracks the recording, the completed stages and the run
+    status, so a failed or interrupted run can restart from the first stage
+    that did not finish.
+    """
+
+    def __init__(self, run_dir, audio_file=None):
+        """
+        Args:
+            run_dir (str): Directory of this run (created if missing)
+            audio_file (str): Recording being processed; required for a new run
+        """
+        self.run_dir = run_dir
+        self.run_id = os.path.basename(os.path.normpath(run_dir))
+        self._lock = threading.Lock()
+        self.manifest_path = os.path.join(run_dir, MANIFEST_NAME)
+
+        if os.path.isfile(self.manifest_path):
+            self.manifest = _read_json(self.manifest_path)
+            if audio_file and not self._same_recording(audio_file):
+                print(f"⚠️  Recording changed since run {self.run_id} was checkpointed; starting it over")
+                self._reset(audio_file)
+        else:
+            os.makedirs(run_dir, exist_ok=True)
+            self._reset(audio_file)
+
+    @classmethod
+    def create(cls, runs_dir, audio_file, run_id=None, keep_runs=0):
+        """
+        Start a new checkpointed run
+
+        Args:
+            runs_dir (str): Directory holding all runs
+            audio_file (str): Recording being processed
+            run_id (str): Explicit run id (defaults to new_run_id())
+            keep_runs (int): Runs and batches to keep, this one included; older ones
+                are deleted (0 keeps all)
+
+        Returns:
+            RunCheckpoint: The new run
+        """
+        checkpoint = cls(os.path.join(runs_dir, run_id or new_run_id()), audio_file)
+        prune_runs(runs_dir, keep_runs)
+        return checkpoint
+
+    @classmethod
+    def open(cls, runs_dir, run_id):
+        """
+        Reopen an existing run for resuming
+
+        Returns:
+            RunCheckpoint: The stored run
+
+        Raises:
+            FileNotFoundError: When no such run exists
+        """
+        run_dir = os.path.join(runs_dir, run_id)
+        if not os.path.isfile(os.path.join(run_dir, MANIFEST_NAME)):
+            raise FileNotFoundError(f"No checkpointed run '{run_id}' in {runs_dir}")
+        return cls(run_dir)
+
+    @property
+    def audio_file(self):
+        return self.manifest.get("audio_file")
+
+    @property
+    def status(self):
+        return self.manifest.get("status")
+
+    def _reset(self, audio_file):
+        for stage in (self.manifest.get("stages", {}) if hasattr(self, "manifest") else {}):
+            try:
+                os.remove(self._stage_path(stage))
+            except OSError:
+                pass
+        self.manifest = {
+            "run_id": self.run_id,
+            "audio_file": audio_file,
+            "audio_hash": _safe_hash(audio_file),
+            "created_at": datetime.now().isoformat(),
+            "status": "running",
+            "stages": {},
+            "error": None
+        }
+        _write_json(self.manifest_path, self.manifest)
+
+    def _same_recording(self, audio_file):
+        stored_hash = self.manifest.get("audio_hash")
+        if stored_hash is None:
+            return os.path.abspath(audio_file) == os.path.abspath(self.manifest.get("audio_file") or "")
+        return _safe_hash(audio_file) in (stored_hash, None)
+
+    def _stage_path(self, stage):
+        return os.path.join(self.run_dir, f"{stage}.json")
+
+    def completed_outputs(self):
+        """
+        Load the outputs of every stage that already finished
+
+        Returns:
+            dict: Stage outputs keyed by stage name
+        """
+        outputs = {}
+        for stage in self.manifest.get("stages", {}):
+            try:
+                outputs[stage] = _read_json(self._stage_path(stage))["value"]
+            except (OSError, ValueError, KeyError):
+                # A missing or damaged stage file just means that stage runs again
+                continue
+        return outputs
+
+    def save_stage(self, stage, value):
+        """
+        Persist one stage's output as soon as it is available
+
+        Args:
+            stage (str): Stage name
+            value: JSON-serializable stage output (or an object with to_dict())
+        """
+        _write_json(self._stage_path(stage), {"stage": stage, "value": value})
+        with self._lock:
+            self.manifest["stages"][stage] = {"completed_at": datetime.now().isoformat()}
+            self.manifest["status"] = "running"
+            _write_json(self.manifest_path, self.manifest)
+
+    def mark_completed(self):
+        self._set_status("completed", None)
+
+    def mark_failed(self, error):
+        self._set_status("failed", str(error))
+
+    def _set_status(self, status, error):
+        with self._lock:
+            self.manifest["status"] = status
+            self.manifest["error"] = error
+            self.manifest["updated_at"] = datetime.now().isoformat()
+            _write_json(self.manifest_path, self.manifest)
+
+def create_batch(runs_dir, recordings, batch_id=None, keep_runs=0):
+    """
+    Record the recordings of a new batch so it can be resumed as a whole
+
+    Args:
+        runs_dir (str): Directory holding all runs
+        recordings (list): Recording paths in batch order
+        batch_id (str): Explicit batch id (defaults to new_run_id())
+        keep_runs (int): Runs and batches to keep, this one included (0 keeps all)
+
+    Returns:
+        str: Directory of the batch; each recording's run lives underneath it
+    """
+    batch_dir = os.path.join(runs_dir, batch_id or new_run_id())
+    os.makedirs(batch_dir, exist_ok=True)
+    _write_json(os.path.join(batch_dir, BATCH_MANIFEST_NAME), {
+        "batch_id": os.path.basename(batch_dir),
+        "created_at": datetime.now().isoformat(),
+        "recordings": list(recordings)
+    })
+    prune_runs(runs_dir, keep_runs)
+    return batch_dir
+
+def prune_runs(runs_dir, keep_runs):
+    """
+    Delete all but the keep_runs most recently updated runs and batches
+
+    Args:
+        runs_dir (str): Directory holding all runs
+        keep_runs (int): Runs and batches to keep (0 keeps all)
+    """
+    if keep_runs <= 0 or not os.path.isdir(runs_dir):
+        return
+    runs = []
+    for name in os.listdir(runs_dir):
+        run_dir = os.path.join(runs_dir, name)
+        if os.path.isfile(os.path.join(run_dir, MANIFEST_NAME)) or os.path.isfile(os.path.join(run_dir, BATCH_MANIFEST_NAME)):
+            try:
+                # Every checkpoint write replaces a file in the run's directory, updating its mtime
+                runs.append((os.path.getmtime(run_dir), run_dir))
+            except OSError:
+                continue
+    runs.sort(reverse=True)
+    for _, run_dir in runs[keep_runs:]:
+        shutil.rmtree(run_dir, ignore_errors=True)
+
+def is_batch(runs_dir, run_id):
+    """True when run_id names a batch rather than a single run"""
+    return os.path.isfile(os.path.join(runs_dir, run_id, BATCH_MANIFEST_NAME))
+
+def load_batch(runs_dir, batch_id):
+    """
+    Returns:
+        tuple: (batch directory, recording paths)
+    """
+    batch_dir = os.path.join(runs_dir, batch_id)
+    return batch_dir, _read_json(os.path.join(batch_dir, BATCH_MANIFEST_NAME))["recordings"]
+
+def batch_run_dir(batch_dir, index, audio_file_path):
+    """Directory of one recording's run inside a batch"""
+    stem = os.path.splitext(os.path.basename(audio_file_path))[0]
+    return os.path.join(batch_dir, f"{index:04d}_{stem}")
@@ -0,0 +1,111 @@
+import threading
+from utils.cache import request_key
+
+class ChunkMemo:
+    """
+    Map-step outputs of one meeting, keyed by chunk content, together with the
+    chunking each agent used for its transcript.
+
+    A checkpointed run saves its memo as the "chunk_memo" stage. When the
+    transcript is corrected, the agents chunk the new version along the old
+    boundaries (utils.transcript.anchor_chunks) and take the notes and action
+    items of every unchanged chunk from the memo, so only the edited chunks
+    and the reduce step reach the API.
+    """
+
+    def __init__(self, payload=None, enabled=True):
+        """
+        Args:
+            payload (dict): to_dict() output of an earlier run (empty memo when omitted)
+            enabled (bool): When False, nothing is recorded and every lookup computes
+        """
+        payload = payload or {}
+        self.enabled = enabled
+        self.chunks = {agent: list(chunks) for agent, chunks in payload.get("chunks", {}).items()}
+        self.outputs = {stage: dict(entries) for stage, entries in payload.get("outputs", {}).items()}
+        self.hits = 0
+        self.misses = 0
+        self._used = {}
+        self._lock = threading.Lock()
+
+    def previous_chunks(self, agent):
+        """
+        Args:
+            agent (str): "summary", "action_items" or "analysis"
+
+        Returns:
+            list: Chunks the agent used for the previous version, or None
+        """
+        if not self.enabled:
+            return None
+        return self.chunks.get(agent)
+
+    def record_chunks(self, agent, chunks):
+        if self.enabled:
+            with self._lock:
+                self.chunks[agent] = list(chunks)
+
+    def _lookup(self, stage, key):
+        with self._lock:
+            self._used.setdefault(stage, set()).add(key)
+            entries = self.outputs.get(stage, {})
+            if key in entries:
+                self.hits += 1
+                return True, entries[key]
+            self.misses += 1
+            return False, None
+
+    def _store(self, stage, key, value):
+        with self._lock:
+            self.outputs.setdefault(stage, {})[key] = value
+
+    def get_or_compute(self, stage, chunk, compute, **params):
+        """
+        Return the memoized map output for a chunk, computing and recording it on a miss
+
+        Args:
+            stage (str): Map step, e.g. "summary_chunk"
+            chunk (str): Chunk text
+            compute (callable): Produces the output on a miss
+            **params: Request settings that change the output (model, temperature)
+
+        Returns:
+            The map output
+        """
+        if not self.enabled:
+            return compute()
+        key = request_key(chunk, **params)
+        found, value = self._lookup(stage, key)
+        if found:
+            return value
+        value = compute()
+        self._store(stage, key, value)
+        return value
+
+    async def aget_or_compute(self, stage, chunk, compute, **params):
+        """Async variant of get_or_compute; compute returns an awaitable"""
+        if not self.enabled:
+            return await compute()
+        key = request_key(chunk, **params)
+        found, value = self._lookup(stage, key)
+        if found:
+            return value
+        value = await compute()
+        self._store(stage, key, value)
+        return value
+
+    def stats(self):
+        return {"reused": self.hits, "recomputed": self.misses}
+
+    def to_dict(self):
+        """
+        JSON-serialisable form. Outputs of chunks this run no longer uses are
+        dropped, so the memo does not grow with every revision.
+        """
+        with self._lock:
+            outputs = {
+                stage: {key: value for key, value in entries.items() if key in self._used[stage]}
+                if stage in self._used else dict(entries)
+                for stage, entries in self.outputs.items()
+            }
+            return {"chunks": dict(self.chunks), "outputs": outputs}
@@ -0,0 +1,403 @@
+import os
+import sys
+import time
+import asyncio
+import threading
+import weakref
+from config.settings import load_settings
+from utils.metrics import current_span
+from utils.retry import RetryPolicy, Hedger, is_retryable
+
+def estimate_tokens(messages, max_tokens=0):
+    """
+    Cheap token estimate for rate limiting (about four characters per token)
+
+    Args:
+        messages (list): Chat messages
+        max_tokens (int): Completion budget reserved for the response
+
+    Returns:
+        int: Estimated prompt plus completion tokens
+    """
+    characters = sum(len(message.get("content") or "") for message in messages)
+    return characters // 4 + len(messages) * 4 + (max_tokens or 0)
+
+class TokenBucket:
+    """Continuously refilling bucket holding up to `capacity` units per minute"""
+
+    def __init__(self, per_minute):
+        self.capacity = float(per_minute)
+        self.available = float(per_minute)
+        self.refill_rate = float(per_minute) / 60.0
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        self.available = min(self.capacity, self.available + (now - self.updated) * self.refill_rate)
+        self.updated = now
+
+    def reserve(self, amount, now):
+        """
+        Take `amount` units, going into debt if necessary
+
+        Returns:
+            float: Seconds to wait before the reservation is covered
+        """
+        self._refill(now)
+        # A single request larger than the bucket would otherwise wait forever
+        amount = min(amount, self.capacity)
+        self.available -= amount
+        if self.available >= 0:
+            return 0.0
+        return -self.available / self.refill_rate
+
+    def refund(self, amount):
+        self.available = min(self.capacity, self.available + amount)
+
+class RateLimiter:
+    """
+    Token-bucket limiter for both requests/min and tokens/min, shared by every
+    agent and crew in the process. A limit of 0 disables that bucket.
+    """
+
+    def __init__(self, requests_per_minute=0, tokens_per_minute=0):
+        self.request_bucket = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.token_bucket = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens):
+        now = time.monotonic()
+        with self._lock:
+            wait_seconds = 0.0
+            if self.request_bucket:
+                wait_seconds = max(wait_seconds, self.request_bucket.reserve(1, now))
+            if self.token_bucket and tokens:
+                wait_seconds = max(wait_seconds, self.token_bucket.reserve(tokens, now))
+            return wait_seconds
+
+    def acquire(self, tokens=0):
+        """
+        Block until one request using `tokens` tokens fits in the budget
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        wait_seconds = self._reserve(tokens)
+        if wait_seconds:
+            time.sleep(wait_seconds)
+        return wait_seconds
+
+    async def aacquire(self, tokens=0):
+        """
+        Async variant of acquire that yields to the event loop while waiting
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        wait_seconds = self._reserve(tokens)
+        if wait_seconds:
+            await asyncio.sleep(wait_seconds)
+        return wait_seconds
+
+    def reconcile(self, estimated_tokens, actual_tokens):
+        """Correct the token bucket once the response reports real usage"""
+        if not self.token_bucket or actual_tokens is None:
+            return
+        with self._lock:
+            self.token_bucket.refund(estimated_tokens - actual_tokens)
+class ClientRegistry:
+    """
+    Process-wide OpenAI clients with a tuned keep-alive connection pool and a
+    shared rate limiter. Every agent routes its API calls through one registry,
+    so a process holds one connection pool per client type no matter how many
+    agents or crews it creates (async clients get one pool per event loop, since
+    httpx connections cannot be shared across loops). The registry also owns the retry policy (the
+    SDK's own retries are disabled) and optional request hedging.
+    """
+
+    def __init__(self, api_key=None, settings=None, base_url=None):
+        """
+        Args:
+            api_key (str): OpenAI API key (defaults to OPENAI_API_KEY)
+            settings (Settings): Typed configuration (defaults to load_settings())
+            base_url (str): API endpoint override, e.g. a local fake server (defaults to
+                openai.base_url, then the OPENAI_BASE_URL environment variable)
+        """
+        settings = settings or load_settings()
+        openai_settings = settings.openai
+        self.api_key = api_key or os.getenv("OPENAI_API_KEY")
+        self.base_url = base_url or openai_settings.base_url
+        self.pool_limits = {
+            "max_connections": openai_settings.max_connections,
+            "max_keepalive_connections": openai_settings.max_keepalive_connections,
+            "keepalive_expiry": openai_settings.keepalive_expiry
+        }
+        self.timeout = openai_settings.request_timeout
+        self.limiter = RateLimiter(openai_settings.requests_per_minute, openai_settings.tokens_per_minute)
+        self.retry_policy = RetryPolicy.from_settings(settings.error_handling)
+        self.transcription_retry_policy = RetryPolicy.from_settings(
+            settings.error_handling, retries=settings.agent("transcriber").max_retries
+        )
+        self.hedger = Hedger.from_settings(settings.error_handling.hedging)
+        self._client = None
+        self._async_clients = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        """Synchronous OpenAI client, created on first use"""
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    # openai/httpx are imported here so that mock runs and CLI startup skip them
+                    import httpx
+                    from openai import OpenAI, DefaultHttpxClient
+                    
+                    self._client = OpenAI(
+                        api_key=self.api_key,
+                        base_url=self.base_url,
+                        timeout=self.timeout,
+                        max_retries=0,
+                        http_client=DefaultHttpxClient(limits=httpx.Limits(**self.pool_limits))
+                    )
+        return self._client
+
+    @property
+    def async_client(self):
+        """
+        Asynchronous OpenAI client of the running event loop, created on first use.
+        Each asyncio.run() gets its own client; it is dropped together with its loop.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._async_clients.get(loop)
+            if client is None:
+                import httpx
+                from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+                
+                client = AsyncOpenAI(
+                    api_key=self.api_key,
+                    base_url=self.base_url,
+                    timeout=self.timeout,
+                    max_retries=0,
+                    http_client=DefaultAsyncHttpxClient(limits=httpx.Limits(**self.pool_limits))
+                )
+                self._async_clients[loop] = client
+        return client
+
+    async def aclose(self):
+        """Close the running event loop's async client (call before the loop ends)"""
+        with self._lock:
+            client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.close()
+
+    def create_chat_completion(self, **params):
+        """Rate-limited, retried (and optionally hedged) chat.completions.create"""
+        estimated = estimate_tokens(params.get("messages", []), params.get("max_tokens"))
+        waits = []
+
+        def attempt():
+            waits.append(self.limiter.acquire(estimated))
+            try:
+                response = self.client.chat.completions.create(**params)
+            except Exception:
+                # A rejected request consumed no tokens
+                self.limiter.reconcile(estimated, 0)
+                raise
+            self._reconcile(estimated, response)
+            return response
+
+        response = self._call("chat", attempt, self.retry_policy)
+        self._record(params.get("model"), sum(waits), getattr(response, "usage", None))
+        return response
+
+    async def acreate_chat_completion(self, **params):
+        """Async variant of create_chat_completion"""
+        estimated = estimate_tokens(params.get("messages", []), params.get("max_tokens"))
+        waits = []
+
+        async def attempt():
+            waits.append(await self.limiter.aacquire(estimated))
+            try:
+                response = await self.async_client.chat.completions.create(**params)
+            except Exception:
+                self.limiter.reconcile(estimated, 0)
+                raise
+            self._reconcile(estimated, response)
+            return response
+
+        response = await self._acall("chat", attempt, self.retry_policy)
+        self._record(params.get("model"), sum(waits), getattr(response, "usage", None))
+        return response
+
+    def stream_chat_completion(self, token_stream, **params):
+        """
+        Rate-limited streaming chat completion; fragments are pushed to token_stream as they arrive.
+        A failed attempt is only retried if it had not emitted anything yet.
+
+        Args:
+            token_stream (TokenStream): Receives each content fragment
+            **params: chat.completions.create parameters
+
+        Returns:
+            str: The complete response text
+        """
+        estimated = estimate_tokens(params.get("messages", []), params.get("max_tokens"))
+        waits = []
+
+        def attempt():
+            waits.append(self.limiter.acquire(estimated))
+            token_stream.start()
+            parts = []
+            usage = None
+            try:
+                response = self.client.chat.completions.create(
+                    stream=True, stream_options={"include_usage": True}, **params
+                )
+                for chunk in response:
+                    usage = getattr(chunk, "usage", None) or usage
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        parts.append(chunk.choices[0].delta.content)
+                        token_stream.write(chunk.choices[0].delta.content)
+            except Exception:
+                # Give back the reservation of a failed attempt, as the non-streaming path does
+                self.limiter.reconcile(estimated, 0)
+                raise
+            finally:
+                token_stream.finish()
+            return "".join(parts), usage
+
+        text, usage = self.retry_policy.call(
+            attempt,
+            should_retry=lambda error: token_stream.chunks == 0 and is_retryable(error),
+            on_retry=self._on_retry(current_span())
+        )
+        if usage is not None:
+            self.limiter.reconcile(estimated, getattr(usage, "total_tokens", None))
+        self._record(params.get("model"), sum(waits), usage)
+        return text
+
+    async def astream_chat_completion(self, token_stream, **params):
+        """Async variant of stream_chat_completion"""
+        estimated = estimate_tokens(params.get("messages", []), params.get("max_tokens"))
+        waits = []
+
+        async def attempt():
+            waits.append(await self.limiter.aacquire(estimated))
+            token_stream.start()
+            parts = []
+            usage = None
+            try:
+                response = await self.async_client.chat.completions.create(
+                    stream=True, stream_options={"include_usage": True}, **params
+                )
+                async for chunk in response:
+                    usage = getattr(chunk, "usage", None) or usage
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        parts.append(chunk.choices[0].delta.content)
+                        token_stream.write(chunk.choices[0].delta.content)
+            except Exception:
+                self.limiter.reconcile(estimated, 0)
+                raise
+            finally:
+                token_stream.finish()
+            return "".join(parts), usage
+
+        text, usage = await self.retry_policy.acall(
+            attempt,
+            should_retry=lambda error: token_stream.chunks == 0 and is_retryable(error),
+            on_retry=self._on_retry(current_span())
+        )
+        if usage is not None:
+            self.limiter.reconcile(estimated, getattr(usage, "total_tokens", None))
+        self._record(params.get("model"), sum(waits), usage)
+        return text
+
+    def create_transcription(self, **params):
+        """Rate-limited, retried audio.transcriptions.create (counts against requests/min only)"""
+        params = self._buffer_upload(params)
+        waits = []
+
+        def attempt():
+            waits.append(self.limiter.acquire())
+            return self.client.audio.transcriptions.create(**params)
+
+        response = self._call("transcription", attempt, self.transcription_retry_policy)
+        self._record(params.get("model"), sum(waits))
+        return response
+
+    async def acreate_transcription(self, **params):
+        """Async variant of create_transcription"""
+        params = self._buffer_upload(params)
+        waits = []
+
+        async def attempt():
+            waits.append(await self.limiter.aacquire())
+            return await self.async_client.audio.transcriptions.create(**params)
+
+        response = await self._acall("transcription", attempt, self.transcription_retry_policy)
+        self._record(params.get("model"), sum(waits))
+        return response
+
+    def _buffer_upload(self, params):
+        """Read an open audio file into memory so retries and hedges can each send it in full"""
+        upload = params.get("file")
+        if hasattr(upload, "read"):
+            params = dict(params, file=(os.path.basename(getattr(upload, "name", "audio")), upload.read()))
+        return params
+
+    def _call(self, operation, attempt, policy):
+        span = current_span()
+        on_hedge = span.record_hedge if span is not None else None
+        return policy.call(
+            lambda: self.hedger.call(operation, attempt, on_hedge),
+            on_retry=self._on_retry(span)
+        )
+
+    async def _acall(self, operation, attempt, policy):
+        span = current_span()
+        on_hedge = span.record_hedge if span is not None else None
+        return await policy.acall(
+            lambda: self.hedger.acall(operation, attempt, on_hedge),
+            on_retry=self._on_retry(span)
+        )
+
+    def _on_retry(self, span):
+        def on_retry(retry_number, error, delay):
+            if span is not None:
+                span.record_retry()
+            print(f"   ⚠️  API call failed ({str(error)}); retry {retry_number} in {delay:.1f}s", file=sys.stderr)
+        return on_retry
+
+    def _record(self, model, waited, usage=None):
+        """Attribute a finished API call to the running stage's span"""
+        span = current_span()
+        if span is not None:
+            span.record_request(model, waited, usage)
+
+    def _reconcile(self, estimated, response):
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            self.limiter.reconcile(estimated, getattr(usage, "total_tokens", None))
+
+_registry = None
+_registry_lock = threading.Lock()
+
+def get_client_registry():
+    """
+    Return the process-wide client registry, creating it on first use
+
+    Returns:
+        ClientRegistry: The shared registry
+    """
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ClientRegistry()
+        return _registry
+
+def set_client_registry(registry):
+    """Install a custom registry (e.g. pointing at a different endpoint) for the whole process"""
+    global _registry
+    with _registry_lock:
+        _registry = registry
@@ -0,0 +1,125 @@
+import os
+import re
+import threading
+from datetime import datetime
+
+BUILTIN_TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config", "templates")
+TEMPLATE_NAME = "followup.txt.j2"
+
+_HEADING = re.compile(r"^(#{1,6})\s+(.+?)\s*#*\s*$")
+
+def section_key(heading):
+    """Turn a markdown heading such as "Key Discussion Points" into "key_discussion_points" """
+    return "_".join(re.sub(r"[^\w\s]", " ", heading.lower()).split())
+
+def summary_sections(summary):
+    """
+    Split a markdown summary into its sections
+
+    Args:
+        summary (str): Summary with "## Section" headings
+
+    Returns:
+        dict: Section body keyed by section_key(heading); text before the first
+            heading is stored under "preamble"
+    """
+    sections = {}
+    key = "preamble"
+    lines = []
+    for line in (summary or "").splitlines():
+        match = _HEADING.match(line)
+        # A lone top-level title ("# Meeting Summary") is not a section of its own
+        if match and len(match.group(1)) > 1:
+            sections[key] = "\n".join(lines).strip()
+            key = section_key(match.group(2))
+            lines = []
+        elif not match:
+            lines.append(line)
+    sections[key] = "\n".join(lines).strip()
+    return {name: body for name, body in sections.items() if body}
+
+class FollowupRenderer:
+    """
+    Renders the follow-up email locally from a Jinja template, with no API call.
+
+    Templates are looked up in <templates_dir>/teams/<team>/, then <templates_dir>/,
+    then the built-in config/templates/. A team template can replace the whole
+    email or extend "builtin/followup.txt.j2" and override single blocks
+    (subject, greeting, highlights, decisions, action_items, next_steps, closing).
+    """
+
+    def __init__(self, templates_dir=None, team=None, sender="Meeting Coordinator", recipients="Team"):
+        """
+        Args:
+            templates_dir (str): Directory with template overrides (defaults to the built-in templates)
+            team (str): Team whose overrides under <templates_dir>/teams/<team>/ take precedence
+            sender (str): Name used to sign the email
+            recipients (str): Name used in the greeting
+        """
+        self.templates_dir = templates_dir
+        self.team = team
+        self.sender = sender
+        self.recipients = recipients
+        self._environment = None
+        self._lock = threading.Lock()
+
+    def search_path(self):
+        """
+        Returns:
+            list: Existing template directories, highest precedence first
+        """
+        paths = []
+        if self.templates_dir:
+            if self.team:
+                paths.append(os.path.join(self.templates_dir, "teams", self.team))
+            paths.append(self.templates_dir)
+        paths.append(BUILTIN_TEMPLATE_DIR)
+        return [path for path in paths if os.path.isdir(path)]
+
+    @property
+    def environment(self):
+        """Jinja environment, created on first use"""
+        if self._environment is None:
+            with self._lock:
+                if self._environment is None:
+                    # jinja2 is only needed when a follow-up is rendered
+                    from jinja2 import Environment, FileSystemLoader, ChoiceLoader, PrefixLoader
+
+                    self._environment = Environment(
+                        loader=ChoiceLoader([
+                            FileSystemLoader(self.search_path()),
+                            PrefixLoader({"builtin": FileSystemLoader(BUILTIN_TEMPLATE_DIR)})
+                        ]),
+                        autoescape=False,
+                        keep_trailing_newline=False
+                    )
+        return self._environment
+
+    def render(self, summary, action_items, action_items_text, title="Team Meeting", date=None, **extra):
+        """
+        Render the follow-up email
+
+        Args:
+            summary (str): Markdown meeting summary
+            action_items (list): Action item dicts
+            action_items_text (str): The action items as a numbered list
+            title (str): Meeting name used in the subject
+            date (str): Meeting date (defaults to today)
+            **extra: Additional template variables
+
+        Returns:
+            str: The follow-up email
+        """
+        context = {
+            "summary": summary,
+            "sections": summary_sections(summary),
+            "action_items": action_items or [],
+            "action_items_text": action_items_text,
+            "title": title,
+            "date": date or datetime.now().strftime("%B %d, %Y"),
+            "team": self.team,
+            "sender": self.sender,
+            "recipients": self.recipients
+        }
+        context.update(extra)
+        return self.environment.get_template(TEMPLATE_NAME).render(context).strip()
@@ -0,0 +1,368 @@
+import os
+import json
+import time
+import threading
+import contextvars
+from contextlib import contextmanager
+
+# The span of the pipeline stage running in the current thread/task. API calls
+# made anywhere below a stage (agents, map-reduce workers, the client
+# registry) are attributed to it.
+_current_span = contextvars.ContextVar("meeting_stage_span", default=None)
+
+DURATION_BUCKETS = (0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+class StageSpan:
+    """Timing, token, retry and audio accounting for one pipeline stage run"""
+
+    def __init__(self, stage, ready_at=None):
+        """
+        Args:
+            stage (str): Stage name
+            ready_at (float): perf_counter() value when the stage's dependencies were met
+        """
+        self.stage = stage
+        self.ready_at = ready_at
+        self.started_at = None
+        self.finished_at = None
+        self.status = "ok"
+        self.error = None
+        self.requests = 0
+        self.retries = 0
+        self.hedges = 0
+        self.rate_limit_wait = 0.0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        # Upload savings from audio pre-processing
+        self.audio_bytes_saved = 0
+        self.audio_seconds_trimmed = 0.0
+        # model -> {"prompt_tokens", "completion_tokens", "audio_seconds"} for costing
+        self.models = {}
+        # Stage cache lookups made by this stage, keyed by cache stage (e.g. "summary_chunk")
+        self.cache_hits = {}
+        self.cache_misses = {}
+        self._lock = threading.Lock()
+
+    def start(self):
+        self.started_at = time.perf_counter()
+        if self.ready_at is None:
+            self.ready_at = self.started_at
+
+    def finish(self, error=None):
+        self.finished_at = time.perf_counter()
+        if error is not None:
+            self.status = "error"
+            self.error = str(error)
+
+    def record_request(self, model, rate_limit_wait=0.0, usage=None):
+        """
+        Account for one API call made on behalf of this stage
+
+        Args:
+            model (str): Model the call used
+            rate_limit_wait (float): Seconds spent waiting on the client-side rate limiter
+            usage (object): The response's usage block (prompt_tokens/completion_tokens), if any
+        """
+        prompt_tokens = getattr(usage, "prompt_tokens", None) or 0
+        completion_tokens = getattr(usage, "completion_tokens", None) or 0
+        with self._lock:
+            self.requests += 1
+            self.rate_limit_wait += rate_limit_wait or 0.0
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+            model_usage = self._model_usage(model)
+            model_usage["prompt_tokens"] += prompt_tokens
+            model_usage["completion_tokens"] += completion_tokens
+
+    def record_retry(self):
+        """Count one retried API call"""
+        with self._lock:
+            self.retries += 1
+
+    def record_hedge(self):
+        """Count one duplicate (hedged) request"""
+        with self._lock:
+            self.hedges += 1
+
+    def record_audio(self, model, seconds):
+        """Account for audio sent to a transcription model"""
+        if not seconds:
+            return
+        with self._lock:
+            self._model_usage(model)["audio_seconds"] += seconds
+
+    def record_preprocessing(self, bytes_saved, seconds_trimmed):
+        """Account for audio that pre-processing kept out of the upload"""
+        with self._lock:
+            self.audio_bytes_saved += bytes_saved or 0
+            self.audio_seconds_trimmed += seconds_trimmed or 0.0
+
+    def record_cache(self, stage, hit):
+        """Count one stage cache lookup"""
+        counter = self.cache_hits if hit else self.cache_misses
+        with self._lock:
+            counter[stage] = counter.get(stage, 0) + 1
+
+    def _model_usage(self, model):
+        if model not in self.models:
+            self.models[model] = {"prompt_tokens": 0, "completion_tokens": 0, "audio_seconds": 0.0}
+        return self.models[model]
+
+    @property
+    def audio_seconds(self):
+        return sum(usage["audio_seconds"] for usage in self.models.values())
+
+    def to_dict(self, pricing=None, origin=None):
+        """
+        Args:
+            pricing (dict): Per-model prices (see the pricing section of config.yaml)
+            origin (float): perf_counter() value that start/end offsets are relative to
+
+        Returns:
+            dict: JSON-serialisable span
+        """
+        origin = origin if origin is not None else self.ready_at or 0.0
+        finished_at = self.finished_at or time.perf_counter()
+        started_at = self.started_at or finished_at
+        return {
+            "stage": self.stage,
+            "status": self.status,
+            "error": self.error,
+            "start": started_at - origin,
+            "end": finished_at - origin,
+            "wall_time": finished_at - started_at,
+            "queue_wait": max(0.0, started_at - (self.ready_at or started_at)),
+            "rate_limit_wait": self.rate_limit_wait,
+            "requests": self.requests,
+            "retries": self.retries,
+            "hedges": self.hedges,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "audio_seconds": self.audio_seconds,
+            "audio_bytes_saved": self.audio_bytes_saved,
+            "audio_seconds_trimmed": self.audio_seconds_trimmed,
+            "cost_usd": estimate_cost(self.models, pricing),
+            "models": {model: dict(usage) for model, usage in self.models.items()},
+            "cache_hits": dict(self.cache_hits),
+            "cache_misses": dict(self.cache_misses)
+        }
+
+def estimate_cost(models, pricing):
+    """
+    Price per-model usage
+
+    Args:
+        models (dict): model -> {"prompt_tokens", "completion_tokens", "audio_seconds"}
+        pricing (dict): model -> {"input_per_million", "output_per_million", "per_audio_minute"}
+
+    Returns:
+        float: Estimated cost in USD (models without a price count as zero)
+    """
+    cost = 0.0
+    for model, usage in models.items():
+        prices = (pricing or {}).get(model) or {}
+        cost += usage["prompt_tokens"] / 1e6 * prices.get("input_per_million", 0.0)
+        cost += usage["completion_tokens"] / 1e6 * prices.get("output_per_million", 0.0)
+        cost += usage["audio_seconds"] / 60.0 * prices.get("per_audio_minute", 0.0)
+    return cost
+
+def current_span():
+    """
+    Returns:
+        StageSpan: The span of the stage running in this thread/task, or None
+    """
+    return _current_span.get()
+
+@contextmanager
+def activate_span(span):
+    """Make `span` the current span for the duration of the block"""
+    token = _current_span.set(span)
+    try:
+        yield span
+    finally:
+        _current_span.reset(token)
+
+def bind_current_span(func):
+    """
+    Wrap `func` so that it runs under the caller's current span, for work
+    handed to a thread pool (context variables do not follow executor.map)
+    """
+    span = _current_span.get()
+
+    def run_in_span(*args, **kwargs):
+        with activate_span(span):
+            return func(*args, **kwargs)
+
+    return run_in_span
+
+def summarize_spans(spans):
+    """
+    Totals across the spans of one meeting
+
+    Args:
+        spans (list): Span dicts
+
+    Returns:
+        dict: Summed requests, retries, hedges, tokens, audio seconds, waits and cost
+    """
+    totals = {"requests": 0, "retries": 0, "hedges": 0, "prompt_tokens": 0, "completion_tokens": 0,
+              "audio_seconds": 0.0, "queue_wait": 0.0, "rate_limit_wait": 0.0, "cost_usd": 0.0}
+    for span in spans:
+        for key in totals:
+            totals[key] += span.get(key) or 0
+    return totals
+
+def write_spans_jsonl(path, spans, **labels):
+    """
+    Append spans to a JSON-lines file, one object per stage
+
+    Args:
+        path (str): Destination file
+        spans (list): Span dicts
+        **labels: Extra fields added to every line (e.g. meeting=path)
+    """
+    directory = os.path.dirname(path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+    with open(path, "a", encoding="utf-8") as f:
+        for span in spans:
+            line = dict(labels)
+            line.update(span)
+            f.write(json.dumps(line, ensure_ascii=False) + "\n")
+
+class StageMetrics:
+    """
+    Aggregates span dicts from any number of meetings into Prometheus counters
+    and a duration histogram per stage
+    """
+
+    COUNTERS = (
+        ("queue_wait", "meeting_stage_queue_wait_seconds_total", "Seconds stages waited for a worker after their inputs were ready"),
+        ("rate_limit_wait", "meeting_stage_rate_limit_wait_seconds_total", "Seconds stages waited on the client-side rate limiter"),
+        ("requests", "meeting_stage_requests_total", "API requests made by stages"),
+        ("retries", "meeting_stage_retries_total", "API request retries made by stages"),
+        ("hedges", "meeting_stage_hedges_total", "Duplicate (hedged) API requests sent by stages"),
+        ("audio_seconds", "meeting_stage_audio_seconds_total", "Seconds of audio sent for transcription"),
+        ("audio_bytes_saved", "meeting_stage_audio_bytes_saved_total", "Upload bytes saved by audio pre-processing"),
+        ("audio_seconds_trimmed", "meeting_stage_audio_seconds_trimmed_total", "Seconds of silence trimmed before transcription"),
+        ("cost_usd", "meeting_stage_cost_usd_total", "Estimated API cost of stages in USD")
+    )
+
+    def __init__(self, buckets=DURATION_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.stages = {}
+        self._lock = threading.Lock()
+
+    def observe(self, spans):
+        """Add one meeting's span dicts"""
+        with self._lock:
+            for span in spans:
+                stage = self.stages.setdefault(span["stage"], {
+                    "runs": 0, "failures": 0, "duration_sum": 0.0,
+                    "bucket_counts": [0] * len(self.buckets),
+                    "prompt_tokens": 0, "completion_tokens": 0,
+                    **{key: 0 for key, _, _ in self.COUNTERS}
+                })
+                stage["runs"] += 1
+                if span.get("status") != "ok":
+                    stage["failures"] += 1
+                stage["duration_sum"] += span["wall_time"]
+                for index, bound in enumerate(self.buckets):
+                    if span["wall_time"] <= bound:
+                        stage["bucket_counts"][index] += 1
+                stage["prompt_tokens"] += span.get("prompt_tokens") or 0
+                stage["completion_tokens"] += span.get("completion_tokens") or 0
+                for key, _, _ in self.COUNTERS:
+                    stage[key] += span.get(key) or 0
+
+    def load_state(self, path):
+        """
+        Restore counters saved by save_state, so they keep counting across
+        processes instead of restarting at zero
+
+        Args:
+            path (str): State file (ignored when missing, unreadable or saved with other buckets)
+        """
+        if not os.path.exists(path):
+            return
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return
+        if not isinstance(state, dict) or state.get("buckets") != list(self.buckets):
+            return
+        with self._lock:
+            self.stages = state.get("stages") or {}
+
+    def save_state(self, path):
+        """
+        Write the aggregated counters atomically for a later load_state
+
+        Args:
+            path (str): Destination JSON file
+        """
+        with self._lock:
+            state = {"buckets": list(self.buckets), "stages": self.stages}
+            payload = json.dumps(state)
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(payload)
+        os.replace(temp_path, path)
+
+    def to_prometheus(self):
+        """
+        Returns:
+            str: Metrics in the Prometheus text exposition format
+        """
+        with self._lock:
+            stages = {name: dict(values) for name, values in sorted(self.stages.items())}
+
+        lines = [
+            "# HELP meeting_stage_duration_seconds Wall time of pipeline stages",
+            "# TYPE meeting_stage_duration_seconds histogram"
+        ]
+        for name, values in stages.items():
+            for bound, count in zip(self.buckets, values["bucket_counts"]):
+                lines.append(f'meeting_stage_duration_seconds_bucket{{stage="{name}",le="{bound}"}} {count}')
+            lines.append(f'meeting_stage_duration_seconds_bucket{{stage="{name}",le="+Inf"}} {values["runs"]}')
+            lines.append(f'meeting_stage_duration_seconds_sum{{stage="{name}"}} {values["duration_sum"]}')
+            lines.append(f'meeting_stage_duration_seconds_count{{stage="{name}"}} {values["runs"]}')
+
+        lines += [
+            "# HELP meeting_stage_failures_total Stage runs that raised an error",
+            "# TYPE meeting_stage_failures_total counter"
+        ]
+        lines += [f'meeting_stage_failures_total{{stage="{name}"}} {values["failures"]}' for name, values in stages.items()]
+
+        lines += [
+            "# HELP meeting_stage_tokens_total Prompt and completion tokens used by stages",
+            "# TYPE meeting_stage_tokens_total counter"
+        ]
+        for name, values in stages.items():
+            lines.append(f'meeting_stage_tokens_total{{stage="{name}",direction="prompt"}} {values["prompt_tokens"]}')
+            lines.append(f'meeting_stage_tokens_total{{stage="{name}",direction="completion"}} {values["completion_tokens"]}')
+
+        for key, metric, description in self.COUNTERS:
+            lines += [f"# HELP {metric} {description}", f"# TYPE {metric} counter"]
+            lines += [f'{metric}{{stage="{name}"}} {values[key]}' for name, values in stages.items()]
+
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        """
+        Write the metrics atomically (safe for a node_exporter textfile collector)
+
+        Args:
+            path (str): Destination .prom file
+        """
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus())
+        os.replace(temp_path, path)
@@ -0,0 +1,141 @@
+import os
+from bisect import bisect_right
+from utils.audio import audio_duration, probe_duration, detect_silence, encode_segments
+
+class OffsetMap:
+    """
+    Maps times in a pre-processed (silence-trimmed) recording back to the
+    original one. The kept stretches of the original are laid back to back,
+    so a time in the processed audio falls in exactly one of them.
+    """
+
+    def __init__(self, segments):
+        """
+        Args:
+            segments (list): (original_start, original_end) tuples of the kept audio, in order
+        """
+        self.segments = [(float(start), float(end)) for start, end in segments]
+        # Where each kept stretch starts in the processed audio
+        self.processed_starts = []
+        position = 0.0
+        for start, end in self.segments:
+            self.processed_starts.append(position)
+            position += end - start
+        self.processed_duration = position
+
+    @classmethod
+    def identity(cls, duration):
+        """Map for a recording that was not trimmed"""
+        return cls([(0.0, duration or 0.0)])
+
+    def original_time(self, seconds):
+        """
+        Args:
+            seconds (float): Time in the processed audio
+
+        Returns:
+            float: The same moment in the original recording
+        """
+        if not self.segments:
+            return seconds
+        index = max(0, bisect_right(self.processed_starts, seconds) - 1)
+        start, end = self.segments[index]
+        return min(start + max(0.0, seconds - self.processed_starts[index]), end)
+
+    def to_list(self):
+        """JSON-serialisable form, e.g. for checkpoints"""
+        return [[start, end] for start, end in self.segments]
+
+    @classmethod
+    def from_list(cls, segments):
+        return cls(segments)
+
+def plan_speech_segments(silences, duration, padding_seconds=0.25, max_segments=1000):
+    """
+    Turn detected silences into the stretches of audio worth keeping
+
+    Args:
+        silences (list): (start, end) silences from detect_silence(); end may be None at the end of the file
+        duration (float): Length of the recording in seconds
+        padding_seconds (float): Audio kept on each side of speech so words are not clipped
+        max_segments (int): Upper bound on kept stretches; the shortest gaps are kept when there would be more
+
+    Returns:
+        list: (start, end) tuples to keep, in order
+    """
+    gaps = []
+    for start, end in silences:
+        end = duration if end is None else min(end, duration)
+        # Leading and trailing silence is dropped entirely, pauses keep their padding
+        gap_start = start if start <= 0 else start + padding_seconds
+        gap_end = end if end >= duration else end - padding_seconds
+        if gap_end > gap_start:
+            gaps.append((gap_start, gap_end))
+
+    # Every gap cut adds a term to the ffmpeg select expression; keep it bounded
+    if len(gaps) >= max_segments:
+        gaps = sorted(sorted(gaps, key=lambda gap: gap[1] - gap[0], reverse=True)[:max_segments - 1])
+
+    segments = []
+    position = 0.0
+    for gap_start, gap_end in gaps:
+        if gap_start > position:
+            segments.append((position, gap_start))
+        position = max(position, gap_end)
+    if position < duration:
+        segments.append((position, duration))
+    return segments
+
+def preprocess_audio(audio_file_path, output_path, trim_silence=True, threshold_db=-40.0,
+                     min_silence_seconds=1.0, padding_seconds=0.25, sample_rate=16000, channels=1, bitrate="32k"):
+    """
+    Prepare a recording for upload: trim long silences, downmix, resample and
+    re-encode it compactly
+
+    Args:
+        audio_file_path (str): Original recording
+        output_path (str): Destination of the processed MP3
+        trim_silence (bool): Cut pauses longer than min_silence_seconds
+        threshold_db (float): Level below which audio counts as silence
+        min_silence_seconds (float): Shortest pause that is cut
+        padding_seconds (float): Audio kept on each side of speech
+        sample_rate (int): Output sample rate (Whisper works at 16 kHz)
+        channels (int): Output channel count
+        bitrate (str): Output bitrate passed to ffmpeg
+
+    Returns:
+        tuple: (path to upload, OffsetMap, stats dict with original/processed bytes and
+            seconds, bytes_saved and seconds_saved). The original path and an identity
+            map are returned when processing would not make the upload smaller.
+    """
+    original_bytes = os.path.getsize(audio_file_path)
+    original_seconds = audio_duration(audio_file_path)
+    if original_seconds is None:
+        original_seconds = probe_duration(audio_file_path)
+
+    segments = None
+    if trim_silence:
+        silences = detect_silence(audio_file_path, threshold_db, min_silence_seconds, sample_rate)
+        segments = plan_speech_segments(silences, original_seconds, padding_seconds)
+        # A recording that is silence throughout is sent as it is and left to Whisper
+        if not segments or segments == [(0.0, original_seconds)]:
+            segments = None
+
+    encode_segments(audio_file_path, segments, output_path, sample_rate, channels, bitrate)
+    offset_map = OffsetMap(segments) if segments else OffsetMap.identity(original_seconds)
+
+    upload_path = output_path
+    processed_bytes = os.path.getsize(output_path)
+    if processed_bytes >= original_bytes and segments is None:
+        # Already compact and nothing to trim: re-encoding would only cost quality
+        upload_path = audio_file_path
+        processed_bytes = original_bytes
+
+    return upload_path, offset_map, {
+        "original_bytes": original_bytes,
+        "processed_bytes": processed_bytes,
+        "bytes_saved": original_bytes - processed_bytes,
+        "original_seconds": original_seconds,
+        "processed_seconds": offset_map.processed_duration,
+        "seconds_saved": original_seconds - offset_map.processed_duration
+    }
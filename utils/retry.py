@@ -0,0 +1,381 @@
+import time
+import random
+import asyncio
+import threading
+from collections import deque
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from concurrent.futures import Future, ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+RETRYABLE_STATUS_CODES = (408, 409, 429, 500, 502, 503, 504)
+# openai exception classes are matched by name so this module does not need the SDK
+RETRYABLE_ERROR_NAMES = ("APIConnectionError", "APITimeoutError", "InternalServerError", "RateLimitError")
+
+def is_retryable(error):
+    """
+    Decide whether a failed API call is worth repeating
+
+    Args:
+        error (Exception): The raised error
+
+    Returns:
+        bool: True for timeouts, connection failures, 429 and 5xx responses
+    """
+    status_code = getattr(error, "status_code", None)
+    if status_code is not None:
+        return status_code in RETRYABLE_STATUS_CODES
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    return any(cls.__name__ in RETRYABLE_ERROR_NAMES for cls in type(error).__mro__)
+
+def retry_after_seconds(error):
+    """
+    Read the server's requested back-off from a failed response
+
+    Args:
+        error (Exception): The raised error (openai errors carry the httpx response)
+
+    Returns:
+        float: Seconds to wait, or None when the server did not say
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return float(retry_after_ms) / 1000.0
+        except ValueError:
+            pass
+
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+    try:
+        return float(retry_after)
+    except ValueError:
+        pass
+    try:
+        # HTTP-date form
+        return max(0.0, (parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+class RetryPolicy:
+    """
+    Exponential back-off with jitter that honors Retry-After.
+
+    The n-th retry waits base_delay * 2**(n-1) seconds, capped at max_delay.
+    The `jitter` fraction of that delay is randomized so that concurrent
+    workers hitting the same limit do not retry in lockstep. A Retry-After
+    header from the server takes precedence (still capped at max_delay).
+    """
+
+    def __init__(self, retries=3, base_delay=2.0, max_delay=30.0, jitter=1.0, rng=None):
+        """
+        Args:
+            retries (int): Retries after the first attempt (0 disables retrying)
+            base_delay (float): Delay before the first retry, in seconds
+            max_delay (float): Upper bound for any single delay
+            jitter (float): Fraction of the delay that is randomized (1.0 = full jitter)
+            rng (random.Random): Source of randomness
+        """
+        self.retries = max(0, int(retries))
+        self.base_delay = float(base_delay)
+        self.max_delay = float(max_delay)
+        self.jitter = min(1.0, max(0.0, float(jitter)))
+        self.rng = rng or random.Random()
+
+    @classmethod
+    def from_settings(cls, error_handling, retries=None):
+        """
+        Build a policy from the error_handling section of the settings
+
+        Args:
+            error_handling (ErrorHandlingSettings): Typed error_handling settings
+            retries (int): Override for error_handling.retry_attempts
+
+        Returns:
+            RetryPolicy: Configured policy
+        """
+        return cls(
+            retries=retries if retries is not None else error_handling.retry_attempts,
+            base_delay=error_handling.retry_delay,
+            max_delay=error_handling.max_retry_delay,
+            jitter=error_handling.retry_jitter
+        )
+
+    def delay(self, retry_number, error=None):
+        """
+        Seconds to wait before a retry
+
+        Args:
+            retry_number (int): 1 for the first retry, 2 for the second, ...
+            error (Exception): The error that triggered the retry
+
+        Returns:
+            float: Delay in seconds
+        """
+        server_delay = retry_after_seconds(error) if error is not None else None
+        if server_delay is not None:
+            return min(server_delay, self.max_delay)
+
+        delay = min(self.base_delay * 2 ** (retry_number - 1), self.max_delay)
+        return delay * (1.0 - self.jitter * self.rng.random())
+
+    def call(self, func, should_retry=is_retryable, on_retry=None):
+        """
+        Call func(), retrying transient failures
+
+        Args:
+            func (callable): The operation
+            should_retry (callable): Receives the error and decides whether to retry
+            on_retry (callable): Called with (retry_number, error, delay) before each retry
+
+        Returns:
+            object: func's return value
+        """
+        retry_number = 0
+        while True:
+            try:
+                return func()
+            except Exception as e:
+                if retry_number >= self.retries or not should_retry(e):
+                    raise
+                retry_number += 1
+                delay = self.delay(retry_number, e)
+                if on_retry:
+                    on_retry(retry_number, e, delay)
+                time.sleep(delay)
+
+    async def acall(self, func, should_retry=is_retryable, on_retry=None):
+        """
+        Async variant of call; func is a coroutine function
+
+        Returns:
+            object: The awaited result of func()
+        """
+        retry_number = 0
+        while True:
+            try:
+                return await func()
+            except Exception as e:
+                if retry_number >= self.retries or not should_retry(e):
+                    raise
+                retry_number += 1
+                delay = self.delay(retry_number, e)
+                if on_retry:
+                    on_retry(retry_number, e, delay)
+                await asyncio.sleep(delay)
+
+class LatencyTracker:
+    """Rolling window of call latencies used to pick the hedging delay"""
+
+    def __init__(self, window=200):
+        self.samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def observe(self, seconds):
+        with self._lock:
+            self.samples.append(seconds)
+
+    def percentile(self, fraction):
+        """
+        Returns:
+            float: The requested percentile of the window, or None while it is empty
+        """
+        with self._lock:
+            ordered = sorted(self.samples)
+        if not ordered:
+            return None
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def __len__(self):
+        return len(self.samples)
+
+class Hedger:
+    """
+    Hedged requests: when a call is still running after the p95 latency of its
+    operation, a duplicate is sent and whichever answers first wins. This cuts
+    the latency tail at the price of a few extra requests, which are capped per
+    minute and by the size of the hedge pool so they cannot eat the rate limit.
+    """
+
+    def __init__(self, enabled=False, operations=("chat",), percentile=0.95, initial_delay=10.0,
+                 min_samples=20, max_workers=16, max_per_minute=30):
+        """
+        Args:
+            enabled (bool): Hedge at all
+            operations (iterable): Operations to hedge ("chat", "transcription")
+            percentile (float): Latency percentile after which the duplicate is sent
+            initial_delay (float): Hedging delay used until min_samples latencies were seen
+            min_samples (int): Observations needed before the percentile is trusted
+            max_workers (int): Size of the thread pool running synchronous hedges, and so the
+                number of hedges in flight at once
+            max_per_minute (int): Hedges sent per rolling minute (0 for no cap)
+        """
+        self.enabled = enabled
+        self.operations = set(operations)
+        self.percentile = percentile
+        self.initial_delay = initial_delay
+        self.min_samples = min_samples
+        self.max_workers = max_workers
+        self.max_per_minute = max_per_minute
+        self.trackers = {}
+        self._executor = None
+        self._hedges_sent = deque()
+        self._hedges_running = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, hedging):
+        """Build a hedger from the typed error_handling.hedging settings"""
+        return cls(
+            enabled=hedging.enabled,
+            operations=hedging.operations,
+            percentile=hedging.percentile,
+            initial_delay=hedging.initial_delay_seconds,
+            min_samples=hedging.min_samples,
+            max_per_minute=hedging.max_per_minute
+        )
+
+    def applies_to(self, operation):
+        return self.enabled and operation in self.operations
+
+    def tracker(self, operation):
+        with self._lock:
+            if operation not in self.trackers:
+                self.trackers[operation] = LatencyTracker()
+            return self.trackers[operation]
+
+    def hedge_delay(self, operation):
+        """
+        Returns:
+            float: Seconds to wait for the primary request before sending the duplicate
+        """
+        tracker = self.tracker(operation)
+        if len(tracker) < self.min_samples:
+            return self.initial_delay
+        return tracker.percentile(self.percentile)
+
+    def _pool(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="hedge")
+            return self._executor
+
+    def _take_hedge(self):
+        """
+        Returns:
+            bool: True when a hedge may be sent now (a slot is taken until _hedge_done)
+        """
+        now = time.monotonic()
+        with self._lock:
+            while self._hedges_sent and now - self._hedges_sent[0] >= 60.0:
+                self._hedges_sent.popleft()
+            if self._hedges_running >= self.max_workers:
+                return False
+            if self.max_per_minute and len(self._hedges_sent) >= self.max_per_minute:
+                return False
+            self._hedges_sent.append(now)
+            self._hedges_running += 1
+            return True
+
+    def _hedge_done(self, _=None):
+        with self._lock:
+            self._hedges_running -= 1
+
+    @staticmethod
+    def _start_thread(func):
+        """Run func() on its own thread; unlike a shared pool, this puts no cap on concurrent calls"""
+        future = Future()
+        future.set_running_or_notify_cancel()
+
+        def run():
+            try:
+                future.set_result(func())
+            except BaseException as e:
+                future.set_exception(e)
+
+        threading.Thread(target=run, name="hedged-request", daemon=True).start()
+        return future
+
+    def call(self, operation, func, on_hedge=None):
+        """
+        Run func(), sending a duplicate if it is slower than the hedging delay
+
+        Args:
+            operation (str): Operation name used for latency tracking
+            func (callable): The request; must be safe to run twice concurrently
+            on_hedge (callable): Called when the duplicate is sent
+
+        Returns:
+            object: The first successful result
+        """
+        started = time.perf_counter()
+        if not self.applies_to(operation):
+            result = func()
+            self.tracker(operation).observe(time.perf_counter() - started)
+            return result
+
+        # The primary gets its own thread, so calls that are never hedged do not
+        # compete for the hedge pool; only the duplicates run there
+        futures = [self._start_thread(func)]
+        done, _ = wait(futures, timeout=self.hedge_delay(operation))
+        if not done and self._take_hedge():
+            if on_hedge:
+                on_hedge()
+            hedge = self._pool().submit(func)
+            hedge.add_done_callback(self._hedge_done)
+            futures.append(hedge)
+
+        error = None
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    # The slower request finishes in the background and is discarded
+                    self.tracker(operation).observe(time.perf_counter() - started)
+                    return future.result()
+                error = future.exception()
+        raise error
+
+    async def acall(self, operation, func, on_hedge=None):
+        """
+        Async variant of call; func is a coroutine function. The losing request is cancelled.
+
+        Returns:
+            object: The first successful result
+        """
+        started = time.perf_counter()
+        if not self.applies_to(operation):
+            result = await func()
+            self.tracker(operation).observe(time.perf_counter() - started)
+            return result
+
+        tasks = [asyncio.ensure_future(func())]
+        done, _ = await asyncio.wait(tasks, timeout=self.hedge_delay(operation))
+        if not done and self._take_hedge():
+            if on_hedge:
+                on_hedge()
+            hedge = asyncio.ensure_future(func())
+            hedge.add_done_callback(self._hedge_done)
+            tasks.append(hedge)
+
+        error = None
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        self.tracker(operation).observe(time.perf_counter() - started)
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
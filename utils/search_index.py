@@ -0,0 +1,531 @@
+import os
+import re
+import json
+import math
+import mmap
+import zlib
+import heapq
+import struct
+import threading
+from array import array
+from bisect import bisect_right
+from collections import Counter
+
+MANIFEST_NAME = "index.json"
+KEYS_NAME = "keys.json"
+DOCS_NAME = "docs.dat"
+DOC_INDEX_NAME = "docs.idx"
+FORMAT_VERSION = 1
+
+# Lexicon header: magic, format version, number of terms
+_LEXICON_HEADER = struct.Struct("<4sII")
+# One lexicon entry: term offset in the term blob, term length, document frequency, postings offset
+_LEXICON_ENTRY = struct.Struct("<QHIQ")
+# One document: offset and size of its compressed record in docs.dat, its length in tokens
+_DOC_ENTRY = struct.Struct("<QII")
+_MAGIC = b"MSIX"
+
+# Words too common in meetings to help ranking
+STOPWORDS = frozenset("""
+a about after all also am an and any are as at be because been but by can could did do does
+for from had has have he her here him his how i if in into is it its just let me more my no
+not now of on or our out over she so some than that the their them then there these they this
+to up us was we well were what when where which who will with would yes you your okay ok so
+""".split())
+
+_TOKEN = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+def _stem(token):
+    """Fold plural and possessive forms ("schemas", "team's") onto one term"""
+    if token.endswith("'s"):
+        token = token[:-2]
+    if len(token) > 4 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if len(token) > 3 and token.endswith("s") and not token.endswith(("ss", "us", "is")):
+        return token[:-1]
+    return token
+
+def tokenize(text):
+    """
+    Split text into index terms: lowercase words with stopwords removed and plurals folded
+
+    Args:
+        text (str): Text to tokenize
+
+    Returns:
+        list: Terms in order of appearance
+    """
+    return [_stem(token) for token in _TOKEN.findall((text or "").lower()) if token not in STOPWORDS]
+
+def _write_json(path, payload):
+    temp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(payload, f)
+    os.replace(temp_path, path)
+
+def _read_json(path, default):
+    if not os.path.isfile(path):
+        return default
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def _write_segment(directory, name, postings):
+    """
+    Write an immutable segment
+
+    Args:
+        directory (str): Index directory
+        name (str): Segment name
+        postings (iterable): (term bytes, doc id array, term frequency array) in term byte order
+
+    Returns:
+        int: Number of distinct documents in the segment
+    """
+    post_path = os.path.join(directory, f"{name}.post")
+    lex_path = os.path.join(directory, f"{name}.lex")
+    entries = []
+    blob = bytearray()
+    documents = set()
+
+    with open(f"{post_path}.tmp", "wb") as post_file:
+        offset = 0
+        for term, doc_ids, frequencies in postings:
+            entries.append((len(blob), len(term), len(doc_ids), offset))
+            blob += term
+            # Doc ids (uint32) followed by their term frequencies (uint16)
+            post_file.write(doc_ids.tobytes())
+            post_file.write(frequencies.tobytes())
+            offset += len(doc_ids) * (doc_ids.itemsize + frequencies.itemsize)
+            documents.update(doc_ids)
+
+    with open(f"{lex_path}.tmp", "wb") as lex_file:
+        lex_file.write(_LEXICON_HEADER.pack(_MAGIC, FORMAT_VERSION, len(entries)))
+        for entry in entries:
+            lex_file.write(_LEXICON_ENTRY.pack(*entry))
+        lex_file.write(blob)
+
+    os.replace(f"{post_path}.tmp", post_path)
+    os.replace(f"{lex_path}.tmp", lex_path)
+    return len(documents)
+
+class _Segment:
+    """Read-only view of one segment; the lexicon and postings are memory-mapped"""
+
+    def __init__(self, directory, name):
+        self.name = name
+        self._files = []
+        self._lexicon = self._map(os.path.join(directory, f"{name}.lex"))
+        self._postings = self._map(os.path.join(directory, f"{name}.post"))
+        magic, version, self.term_count = _LEXICON_HEADER.unpack_from(self._lexicon, 0)
+        if magic != _MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported search index segment {name}")
+        self._blob_start = _LEXICON_HEADER.size + self.term_count * _LEXICON_ENTRY.size
+
+    def _map(self, path):
+        handle = open(path, "rb")
+        self._files.append(handle)
+        if os.path.getsize(path) == 0:
+            return b""
+        return mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close(self):
+        for mapped in (self._lexicon, self._postings):
+            if isinstance(mapped, mmap.mmap):
+                mapped.close()
+        for handle in self._files:
+            handle.close()
+
+    def _entry(self, index):
+        term_offset, term_length, count, post_offset = _LEXICON_ENTRY.unpack_from(
+            self._lexicon, _LEXICON_HEADER.size + index * _LEXICON_ENTRY.size
+        )
+        start = self._blob_start + term_offset
+        return self._lexicon[start:start + term_length], count, post_offset
+
+    def _read_postings(self, count, post_offset):
+        doc_ids = array("I")
+        frequencies = array("H")
+        doc_ids.frombytes(self._postings[post_offset:post_offset + count * doc_ids.itemsize])
+        tf_offset = post_offset + count * doc_ids.itemsize
+        frequencies.frombytes(self._postings[tf_offset:tf_offset + count * frequencies.itemsize])
+        return doc_ids, frequencies
+
+    def lookup(self, term):
+        """
+        Args:
+            term (bytes): UTF-8 encoded term
+
+        Returns:
+            tuple: (doc id array, term frequency array), or None when the term is absent
+        """
+        low, high = 0, self.term_count
+        while low < high:
+            middle = (low + high) // 2
+            candidate, count, post_offset = self._entry(middle)
+            if candidate < term:
+                low = middle + 1
+            elif candidate > term:
+                high = middle
+            else:
+                return self._read_postings(count, post_offset)
+        return None
+
+    def __iter__(self):
+        """Yield (term bytes, doc ids, term frequencies) in term order"""
+        for index in range(self.term_count):
+            term, count, post_offset = self._entry(index)
+            yield (term,) + self._read_postings(count, post_offset)
+
+class SearchIndex:
+    """
+    Incremental full-text index over meeting transcripts and summaries with BM25 ranking.
+
+    Every added meeting becomes a small immutable segment (a sorted lexicon plus
+    postings, both memory-mapped when searched). add_meeting() merges segments of
+    similar size once merge_factor of them pile up,
+    so the segment count grows only logarithmically with the number of meetings.
+    Meeting records (metadata and compressed text for snippets) live in an
+    append-only document store. One process writes at a time; any number may search.
+    """
+
+    def __init__(self, directory, merge_factor=10, k1=1.2, b=0.75, summary_weight=2):
+        """
+        Args:
+            directory (str): Index directory (created if missing)
+            merge_factor (int): Segments of one size tier that trigger a merge
+            k1 (float): BM25 term frequency saturation
+            b (float): BM25 document length normalization
+            summary_weight (int): How many times a summary term counts relative to a transcript term
+        """
+        self.directory = directory
+        self.merge_factor = max(2, merge_factor)
+        self.k1 = k1
+        self.b = b
+        self.summary_weight = summary_weight
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self.manifest_path = os.path.join(directory, MANIFEST_NAME)
+        self.manifest = _read_json(self.manifest_path, {
+            "version": FORMAT_VERSION, "next_segment": 0, "segments": [],
+            "documents": 0, "live_documents": 0, "total_length": 0, "deleted": []
+        })
+        self._segments = {}
+        self._doc_index = None
+        self._keys = None
+
+    def close(self):
+        for segment in self._segments.values():
+            segment.close()
+        self._segments = {}
+        self._close_doc_index()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _close_doc_index(self):
+        if self._doc_index is not None:
+            mapped, handle = self._doc_index
+            if isinstance(mapped, mmap.mmap):
+                mapped.close()
+            handle.close()
+            self._doc_index = None
+
+    def _segment(self, name):
+        if name not in self._segments:
+            self._segments[name] = _Segment(self.directory, name)
+        return self._segments[name]
+
+    def _doc_entries(self):
+        """Memory-mapped docs.idx, reopened when documents were added since it was mapped"""
+        path = os.path.join(self.directory, DOC_INDEX_NAME)
+        size = os.path.getsize(path) if os.path.isfile(path) else 0
+        if self._doc_index is None or len(self._doc_index[0]) != size:
+            self._close_doc_index()
+            handle = open(path, "rb") if size else open(os.devnull, "rb")
+            mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+            self._doc_index = (mapped, handle)
+        return self._doc_index[0]
+
+    def add_meeting(self, meeting_key, transcript, summary="", title=None, date=None, source=None):
+        """
+        Index one meeting, replacing any earlier version indexed under the same key
+
+        Args:
+            meeting_key (str): Stable id of the meeting (e.g. the recording's content hash)
+            transcript (str): Meeting transcript
+            summary (str): Meeting summary
+            title (str): Display name
+            date (str): Meeting date
+            source (str): Where the meeting came from (recording or output file path)
+
+        Returns:
+            int: The meeting's document id
+        """
+        frequencies = Counter(tokenize(transcript))
+        for term, count in Counter(tokenize(summary)).items():
+            frequencies[term] += count * self.summary_weight
+        length = sum(frequencies.values())
+
+        record = zlib.compress(json.dumps({
+            "key": meeting_key, "title": title, "date": date, "source": source,
+            "summary": summary or "", "transcript": transcript or ""
+        }, ensure_ascii=False).encode("utf-8"))
+
+        with self._lock:
+            keys_path = os.path.join(self.directory, KEYS_NAME)
+            if self._keys is None:
+                self._keys = _read_json(keys_path, {})
+            keys = self._keys
+            manifest = dict(self.manifest)
+            doc_id = manifest["documents"]
+
+            # Append the record and its docs.idx entry; a crash before the manifest
+            # is written leaves only unreferenced bytes behind
+            docs_path = os.path.join(self.directory, DOCS_NAME)
+            with open(docs_path, "ab") as docs_file:
+                offset = docs_file.tell()
+                docs_file.write(record)
+            with open(os.path.join(self.directory, DOC_INDEX_NAME), "r+b" if doc_id else "wb") as index_file:
+                index_file.seek(doc_id * _DOC_ENTRY.size)
+                index_file.write(_DOC_ENTRY.pack(offset, len(record), length))
+                index_file.truncate()
+
+            name = f"seg_{manifest['next_segment']:08d}"
+            postings = (
+                (term.encode("utf-8"), array("I", [doc_id]), array("H", [min(count, 65535)]))
+                for term, count in sorted(frequencies.items(), key=lambda item: item[0].encode("utf-8"))
+            )
+            _write_segment(self.directory, name, postings)
+
+            deleted = set(manifest["deleted"])
+            previous = keys.get(meeting_key)
+            if previous is not None and previous not in deleted:
+                deleted.add(previous)
+                manifest["live_documents"] -= 1
+                manifest["total_length"] -= self._doc_length(previous)
+
+            manifest.update(
+                next_segment=manifest["next_segment"] + 1,
+                segments=manifest["segments"] + [{"name": name, "documents": 1}],
+                documents=doc_id + 1,
+                live_documents=manifest["live_documents"] + 1,
+                total_length=manifest["total_length"] + length,
+                deleted=sorted(deleted)
+            )
+            keys[meeting_key] = doc_id
+            _write_json(keys_path, keys)
+            self._save_manifest(manifest)
+            self._maybe_merge()
+        return doc_id
+
+    def _save_manifest(self, manifest):
+        _write_json(self.manifest_path, manifest)
+        self.manifest = manifest
+
+    def _maybe_merge(self):
+        """Merge segments of the same size tier (powers of merge_factor) until no tier is full"""
+        while True:
+            tiers = {}
+            for segment in self.manifest["segments"]:
+                tiers.setdefault(self._tier(segment["documents"]), []).append(segment["name"])
+            full = next((names for _, names in sorted(tiers.items()) if len(names) >= self.merge_factor), None)
+            if full is None:
+                return
+            self._merge(full[:self.merge_factor])
+
+    def _tier(self, documents):
+        tier = 0
+        while documents >= self.merge_factor:
+            documents //= self.merge_factor
+            tier += 1
+        return tier
+
+    def _merge(self, names):
+        """Replace the named segments by one, dropping postings of deleted documents"""
+        deleted = set(self.manifest["deleted"])
+        sources = [_Segment(self.directory, name) for name in names]
+
+        def merged_postings():
+            streams = [iter(segment) for segment in sources]
+            current = None
+            pairs = []
+            for term, doc_ids, frequencies in heapq.merge(*streams, key=lambda posting: posting[0]):
+                if term != current:
+                    if pairs:
+                        yield self._posting_arrays(current, pairs)
+                    current, pairs = term, []
+                pairs.extend(pair for pair in zip(doc_ids, frequencies) if pair[0] not in deleted)
+            if pairs:
+                yield self._posting_arrays(current, pairs)
+
+        manifest = dict(self.manifest)
+        name = f"seg_{manifest['next_segment']:08d}"
+        try:
+            documents = _write_segment(self.directory, name, merged_postings())
+        finally:
+            for segment in sources:
+                segment.close()
+
+        remaining = [segment for segment in manifest["segments"] if segment["name"] not in names]
+        manifest.update(next_segment=manifest["next_segment"] + 1, segments=remaining + [{"name": name, "documents": documents}])
+        # Deleted documents whose postings were all merged away no longer need a tombstone
+        if len(remaining) == 0:
+            manifest["deleted"] = []
+        self._save_manifest(manifest)
+
+        for old in names:
+            cached = self._segments.pop(old, None)
+            if cached is not None:
+                cached.close()
+            for extension in ("lex", "post"):
+                path = os.path.join(self.directory, f"{old}.{extension}")
+                if os.path.exists(path):
+                    os.remove(path)
+
+    @staticmethod
+    def _posting_arrays(term, pairs):
+        pairs.sort()
+        return term, array("I", (doc_id for doc_id, _ in pairs)), array("H", (count for _, count in pairs))
+
+    def _doc_length(self, doc_id):
+        return _DOC_ENTRY.unpack_from(self._doc_entries(), doc_id * _DOC_ENTRY.size)[2]
+
+    def document(self, doc_id):
+        """
+        Args:
+            doc_id (int): Document id
+
+        Returns:
+            dict: The meeting record (key, title, date, source, summary, transcript)
+        """
+        offset, size, _ = _DOC_ENTRY.unpack_from(self._doc_entries(), doc_id * _DOC_ENTRY.size)
+        with open(os.path.join(self.directory, DOCS_NAME), "rb") as docs_file:
+            docs_file.seek(offset)
+            return json.loads(zlib.decompress(docs_file.read(size)).decode("utf-8"))
+
+    def search(self, query, limit=10, snippet_words=30):
+        """
+        Rank meetings against a free-text query with BM25
+
+        Args:
+            query (str): Search words
+            limit (int): Maximum number of meetings returned
+            snippet_words (int): Length of the snippet shown for each meeting
+
+        Returns:
+            list: {"score", "key", "title", "date", "source", "snippet"} dicts, best match first
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        try:
+            return self._search(terms, limit, snippet_words)
+        except FileNotFoundError:
+            # A writer merged segments away between reading the manifest and opening them
+            return self._search(terms, limit, snippet_words)
+
+    def _search(self, terms, limit, snippet_words):
+        manifest = self.manifest = _read_json(self.manifest_path, self.manifest)
+        live_documents = manifest["live_documents"]
+        if not terms or not live_documents:
+            return []
+
+        deleted = set(manifest["deleted"])
+        average_length = manifest["total_length"] / live_documents
+        doc_entries = self._doc_entries()
+        scores = {}
+
+        for term in terms:
+            encoded = term.encode("utf-8")
+            postings = [found for found in (self._segment(segment["name"]).lookup(encoded)
+                                             for segment in manifest["segments"]) if found]
+            # Postings of replaced meetings stay in their segments until a merge; they must not skew the IDF
+            if deleted:
+                document_frequency = sum(1 for doc_ids, _ in postings for doc_id in doc_ids if doc_id not in deleted)
+            else:
+                document_frequency = sum(len(doc_ids) for doc_ids, _ in postings)
+            if not document_frequency:
+                continue
+            idf = math.log(1 + (live_documents - document_frequency + 0.5) / (document_frequency + 0.5))
+            k1, b = self.k1, self.b
+            for doc_ids, frequencies in postings:
+                for doc_id, frequency in zip(doc_ids, frequencies):
+                    if doc_id in deleted:
+                        continue
+                    length = _DOC_ENTRY.unpack_from(doc_entries, doc_id * _DOC_ENTRY.size)[2]
+                    weight = frequency * (k1 + 1) / (frequency + k1 * (1 - b + b * length / average_length))
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * weight
+
+        results = []
+        for doc_id, score in heapq.nlargest(limit, scores.items(), key=lambda item: item[1]):
+            record = self.document(doc_id)
+            results.append({
+                "score": round(score, 4),
+                "key": record["key"],
+                "title": record["title"],
+                "date": record["date"],
+                "source": record["source"],
+                "snippet": make_snippet(record["summary"], record["transcript"], set(terms), snippet_words)
+            })
+        return results
+
+    def stats(self):
+        """
+        Returns:
+            dict: Indexed and live meeting counts and the current segment count
+        """
+        manifest = _read_json(self.manifest_path, self.manifest)
+        return {
+            "documents": manifest["documents"],
+            "live_documents": manifest["live_documents"],
+            "segments": len(manifest["segments"])
+        }
+
+def make_snippet(summary, transcript, terms, words=30):
+    """
+    Pick the passage with the most distinct query terms, preferring the summary,
+    and mark the matches with **bold**
+
+    Args:
+        summary (str): Meeting summary
+        transcript (str): Meeting transcript
+        terms (set): Query terms (as produced by tokenize())
+        words (int): Snippet length in words
+
+    Returns:
+        str: The snippet
+    """
+    # Find candidate words with one regex pass instead of tokenizing every word. A term
+    # ending in "y" may stand for an "-ies" plural, so only its stem is searched for;
+    # every candidate is then confirmed through tokenize()
+    stems = {term[:-1] if term.endswith("y") and len(term) > 2 else term for term in terms}
+    candidates = re.compile(r"[a-z0-9']*(?:" + "|".join(sorted(map(re.escape, stems), key=len, reverse=True)) + r")[a-z0-9']*")
+    best_count, best = 0, ""
+    for text in (summary, transcript):
+        # Markdown emphasis and heading marks would clash with the highlighting
+        text = re.sub(r"[*_`#]+", "", text or "")
+        spans = [match.span() for match in re.finditer(r"\S+", text)]
+        starts = [start for start, _ in spans]
+        hits = {}
+        for match in candidates.finditer(text.lower()):
+            found = [term for term in tokenize(match.group()) if term in terms]
+            if found:
+                hits[bisect_right(starts, match.start()) - 1] = found[0]
+        if not hits:
+            continue
+
+        # Slide a window over the hit positions only
+        positions = sorted(hits)
+        for first in positions:
+            start = max(0, first - words // 4)
+            matched = {hits[index] for index in positions if start <= index < start + words}
+            if len(matched) > best_count:
+                best_count = len(matched)
+                window = range(start, min(start + words, len(spans)))
+                marked = [f"**{text[spans[i][0]:spans[i][1]]}**" if i in hits else text[spans[i][0]:spans[i][1]]
+                          for i in window]
+                best = ("… " if start else "") + " ".join(marked) + (" …" if start + words < len(spans) else "")
+        if best_count == len(terms):
+            break
+    return best
@@ -0,0 +1,284 @@
+from array import array
+from collections import namedtuple
+from difflib import SequenceMatcher
+from utils.transcript import split_turns
+
+Segment = namedtuple("Segment", ["start", "end", "text"])
+
+def _field(segment, name):
+    return segment[name] if isinstance(segment, dict) else getattr(segment, name)
+
+class _SegmentData:
+    """Parallel arrays shared by a SegmentStore and every slice taken from it"""
+
+    __slots__ = ("starts", "ends", "bounds", "blob", "separator")
+
+    def __init__(self, starts, ends, texts, separator=" "):
+        self.starts = array("d", starts)
+        self.ends = array("d", ends)
+        # Segment texts live in one string, joined by a one-character separator; segment i
+        # is blob[bounds[i]:bounds[i + 1] - 1], so a run of segments is one substring
+        self.separator = separator
+        self.blob = separator.join(texts)
+        self.bounds = array("q", [0])
+        for text in texts:
+            self.bounds.append(self.bounds[-1] + len(text) + 1)
+
+class SegmentStore:
+    """
+    Timestamped transcript segments (start, end, text) in parallel arrays.
+
+    Times are float arrays and the texts share one string, so a meeting of
+    thousands of segments costs a few bytes per segment beyond its text instead
+    of a dict each. Slicing by index returns a view over the same arrays. The
+    plain transcript (`text`) is derived on first access.
+    """
+
+    __slots__ = ("_data", "_lo", "_hi", "_text")
+
+    def __init__(self, segments=(), separator=" "):
+        """
+        Args:
+            segments (iterable): (start, end, text) tuples, Segment tuples, dicts or
+                objects with start/end/text attributes (e.g. Whisper verbose_json segments)
+            separator (str): " " or "\n"; joins the segments into the plain transcript
+        """
+        if len(separator) != 1:
+            raise ValueError("separator must be a single character")
+        rows = []
+        for segment in segments:
+            if isinstance(segment, tuple):
+                start, end, text = segment
+            else:
+                start, end, text = _field(segment, "start"), _field(segment, "end"), _field(segment, "text")
+            text = " ".join((text or "").split())
+            if text:
+                rows.append((float(start), max(float(start), float(end)), text))
+        rows.sort(key=lambda row: row[0])
+        self._data = _SegmentData(
+            [row[0] for row in rows], [row[1] for row in rows], [row[2] for row in rows], separator
+        )
+        self._lo = 0
+        self._hi = len(rows)
+        self._text = None
+
+    @classmethod
+    def _view(cls, data, lo, hi):
+        view = cls.__new__(cls)
+        view._data = data
+        view._lo = lo
+        view._hi = max(lo, hi)
+        view._text = None
+        return view
+
+    @classmethod
+    def from_verbose_json(cls, response):
+        """
+        Build a store from a Whisper response_format="verbose_json" response
+
+        Args:
+            response: The SDK's verbose transcription object, or its JSON as a dict
+
+        Returns:
+            SegmentStore: One entry per Whisper segment (one segment spanning the whole
+                recording when the response carries none)
+        """
+        if isinstance(response, str):
+            return cls.from_text(response)
+        segments = _field(response, "segments") if isinstance(response, dict) or hasattr(response, "segments") else None
+        if segments:
+            # One line per segment, so chunking and compression keep the segment boundaries
+            return cls(segments, separator="\n")
+        text = _field(response, "text") if isinstance(response, dict) or hasattr(response, "text") else ""
+        duration = (response.get("duration") if isinstance(response, dict) else getattr(response, "duration", None)) or 0.0
+        return cls([(0.0, float(duration), text)])
+
+    @classmethod
+    def from_text(cls, text, words_per_second=2.5):
+        """
+        Build a store from an untimed transcript, one segment per speaker turn (kept on
+        separate lines), with times estimated from the word count (for mock mode and
+        old checkpoints)
+
+        Args:
+            text (str): Transcript text
+            words_per_second (float): Assumed speaking rate
+
+        Returns:
+            SegmentStore: Segments with estimated times
+        """
+        segments = []
+        position = 0.0
+        for turn in split_turns(text or ""):
+            length = len(turn.split()) / words_per_second
+            segments.append((position, position + length, turn))
+            position += length
+        return cls(segments, separator="\n")
+
+    @classmethod
+    def from_dict(cls, payload):
+        """Rebuild a store from to_dict() output"""
+        return cls(
+            zip(payload.get("start", []), payload.get("end", []), payload.get("text", [])),
+            separator=payload.get("separator", " ")
+        )
+
+    @classmethod
+    def coerce(cls, value):
+        """
+        Args:
+            value: A SegmentStore, its to_dict() form (e.g. from a checkpoint) or a plain transcript
+
+        Returns:
+            SegmentStore: The value as a store
+        """
+        if isinstance(value, cls):
+            return value
+        if isinstance(value, dict):
+            return cls.from_dict(value)
+        return cls.from_text(value)
+
+    def to_dict(self):
+        """JSON-serialisable form (parallel lists), e.g. for the stage cache and checkpoints"""
+        return {
+            "start": list(self._data.starts[self._lo:self._hi]),
+            "end": list(self._data.ends[self._lo:self._hi]),
+            "text": [self._segment_text(index) for index in range(self._lo, self._hi)],
+            "separator": self._data.separator
+        }
+
+    def __reduce__(self):
+        # Pickle only this view's segments, not the arrays it shares with its parent
+        return (self.__class__.from_dict, (self.to_dict(),))
+
+    def __len__(self):
+        return self._hi - self._lo
+
+    def __bool__(self):
+        return self._hi > self._lo
+
+    def __iter__(self):
+        for index in range(self._lo, self._hi):
+            yield self._segment(index)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            lo, hi, step = key.indices(len(self))
+            if step != 1:
+                raise ValueError("SegmentStore slices do not support a step")
+            return self._view(self._data, self._lo + lo, self._lo + hi)
+        if key < 0:
+            key += len(self)
+        if not 0 <= key < len(self):
+            raise IndexError("segment index out of range")
+        return self._segment(self._lo + key)
+
+    def __repr__(self):
+        return f"SegmentStore({len(self)} segments, {self.start:.1f}s-{self.end:.1f}s)"
+
+    def _segment_text(self, index):
+        bounds = self._data.bounds
+        return self._data.blob[bounds[index]:bounds[index + 1] - 1]
+
+    def _segment(self, index):
+        return Segment(self._data.starts[index], self._data.ends[index], self._segment_text(index))
+
+    @property
+    def text(self):
+        """The transcript as one string, taken from the shared text buffer on first access"""
+        if self._text is None:
+            bounds = self._data.bounds
+            self._text = self._data.blob[bounds[self._lo]:bounds[self._hi] - 1] if self else ""
+        return self._text
+
+    @property
+    def start(self):
+        return self._data.starts[self._lo] if self else 0.0
+
+    @property
+    def end(self):
+        # Segments can overlap slightly, so the last one does not always end latest
+        return max(self._data.ends[self._lo:self._hi]) if self else 0.0
+
+    @property
+    def duration(self):
+        return self.end - self.start
+
+    def map_times(self, convert):
+        """
+        Args:
+            convert (callable): Maps a time to another timeline, e.g. OffsetMap.original_time
+
+        Returns:
+            SegmentStore: New store with converted start and end times
+        """
+        return SegmentStore(
+            ((convert(segment.start), convert(segment.end), segment.text) for segment in self),
+            separator=self._data.separator
+        )
+
+    def with_text(self, text):
+        """
+        Re-time a corrected version of this transcript: its words are aligned with
+        the current ones, and each corrected word lands in the segment of the word
+        it replaced (inserted words join the segment before them)
+
+        Args:
+            text (str): Corrected transcript
+
+        Returns:
+            SegmentStore: Segments with the current times and the corrected text
+        """
+        old_words = []
+        owners = []
+        for index in range(self._lo, self._hi):
+            words = self._segment_text(index).split()
+            old_words.extend(words)
+            owners.extend([index] * len(words))
+        new_words = text.split()
+        if not owners:
+            return SegmentStore([(self.start, self.end, text)], separator=self._data.separator)
+
+        assigned = [None] * len(new_words)
+        matcher = SequenceMatcher(None, old_words, new_words, autojunk=False)
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == "equal" or tag == "replace":
+                for offset in range(j2 - j1):
+                    # Spread replacement words evenly over the words they replace
+                    source = i1 + (offset * (i2 - i1)) // (j2 - j1) if tag == "replace" else i1 + offset
+                    assigned[j1 + offset] = owners[min(source, i2 - 1)]
+        current = owners[0]
+        grouped = {}
+        for word, owner in zip(new_words, assigned):
+            current = owner if owner is not None else current
+            grouped.setdefault(current, []).append(word)
+
+        return SegmentStore(
+            ((self._data.starts[index], self._data.ends[index], " ".join(words)) for index, words in grouped.items()),
+            separator=self._data.separator
+        )
+
+def stitch_segments(chunks):
+    """
+    Join the segments of consecutive overlapping chunks into one timeline
+
+    Each overlap is cut at its midpoint: the earlier chunk keeps the segments
+    starting before it and the later chunk those starting after it, so speech
+    in the overlap is kept once.
+
+    Args:
+        chunks (list): (chunk_start, chunk_end, SegmentStore) tuples in timeline order,
+            with segment times relative to their chunk
+
+    Returns:
+        SegmentStore: Segments on the recording's timeline
+    """
+    segments = []
+    for index, (chunk_start, chunk_end, store) in enumerate(chunks):
+        cut_before = 0.0 if index == 0 else (chunk_start + chunks[index - 1][1]) / 2
+        cut_after = float("inf") if index == len(chunks) - 1 else (chunks[index + 1][0] + chunk_end) / 2
+        for segment in store:
+            start = segment.start + chunk_start
+            if cut_before <= start < cut_after:
+                segments.append((start, segment.end + chunk_start, segment.text))
+    return SegmentStore(segments, separator=chunks[0][2]._data.separator if chunks else " ")
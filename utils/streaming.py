@@ -0,0 +1,96 @@
+import sys
+import time
+import threading
+
+_console_lock = threading.Lock()
+
+class ConsoleSink:
+    """Writes streamed tokens straight to stdout under a one-line header"""
+
+    def __init__(self, header):
+        self.header = header
+        self._started = False
+
+    def write(self, text):
+        with _console_lock:
+            if not self._started:
+                sys.stdout.write(f"\n{self.header}\n" + "-" * 40 + "\n")
+                self._started = True
+            sys.stdout.write(text)
+            sys.stdout.flush()
+
+    def close(self):
+        if self._started:
+            with _console_lock:
+                sys.stdout.write("\n")
+                sys.stdout.flush()
+
+class FileSink:
+    """Writes streamed tokens to an output file as they arrive"""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+
+    def write(self, text):
+        if self._file is None:
+            self._file = open(self.path, "w", encoding="utf-8")
+        self._file.write(text)
+        self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+class TokenStream:
+    """
+    Fans the tokens of one streamed completion out to a set of sinks and
+    records the stage's time to first token
+    """
+
+    def __init__(self, stage, sinks=()):
+        self.stage = stage
+        self.sinks = list(sinks)
+        self.requested_at = None
+        self.finished_at = None
+        self.time_to_first_token = None
+        self.chunks = 0
+
+    def start(self):
+        """Mark the moment the request was sent"""
+        self.requested_at = time.perf_counter()
+
+    def write(self, text):
+        """Push one streamed fragment to every sink"""
+        if self.time_to_first_token is None and self.requested_at is not None:
+            self.time_to_first_token = time.perf_counter() - self.requested_at
+        self.chunks += 1
+        for sink in self.sinks:
+            sink.write(text)
+
+    def finish(self):
+        """Close the sinks once the completion is done"""
+        self.finished_at = time.perf_counter()
+        for sink in self.sinks:
+            sink.close()
+
+    def replay(self, text):
+        """Emit an already complete text (cache hit or mock response) as a single fragment"""
+        self.start()
+        self.write(text)
+        self.finish()
+
+    def metrics(self):
+        """
+        Returns:
+            dict: Time to first token, total streaming time and fragment count
+        """
+        duration = None
+        if self.requested_at is not None and self.finished_at is not None:
+            duration = self.finished_at - self.requested_at
+        return {
+            "time_to_first_token": self.time_to_first_token,
+            "duration": duration,
+            "chunks": self.chunks
+        }
@@ -0,0 +1,328 @@
+import re
+from difflib import SequenceMatcher
+
+_encoding = None
+_encoding_loaded = False
+
+def _get_encoding():
+    """Load the GPT-4o tokenizer on first use; loading it costs noticeable startup time"""
+    global _encoding, _encoding_loaded
+    if not _encoding_loaded:
+        try:
+            import tiktoken
+            _encoding = tiktoken.get_encoding("o200k_base")
+        except Exception:
+            # tiktoken is optional (or its encoding files may be unavailable offline);
+            # fall back to the usual four-characters-per-token estimate
+            _encoding = None
+        _encoding_loaded = True
+    return _encoding
+
+def _normalize_word(word):
+    return re.sub(r"[^\w']", "", word.lower())
+
+def merge_overlap(previous, current, window_words=80, min_match_words=3):
+    """
+    Join two transcript pieces whose audio overlapped, dropping the repeated words
+
+    The tail of the previous piece is aligned against the head of the current
+    one; text is kept from the previous piece up to the end of the longest
+    matching run and from the current piece after it.
+
+    Args:
+        previous (str): Transcript of the earlier chunk
+        current (str): Transcript of the later chunk
+        window_words (int): How many boundary words to compare on each side
+        min_match_words (int): Shortest run accepted as a real overlap
+
+    Returns:
+        str: The merged transcript
+    """
+    previous_words = previous.split()
+    current_words = current.split()
+    if not previous_words:
+        return current.strip()
+    if not current_words:
+        return previous.strip()
+
+    tail_offset = max(0, len(previous_words) - window_words)
+    tail = [_normalize_word(word) for word in previous_words[tail_offset:]]
+    head = [_normalize_word(word) for word in current_words[:window_words]]
+
+    match = SequenceMatcher(None, tail, head, autojunk=False).find_longest_match(0, len(tail), 0, len(head))
+    if match.size < min_match_words:
+        return " ".join(previous_words + current_words)
+
+    kept_previous = previous_words[:tail_offset + match.a + match.size]
+    kept_current = current_words[match.b + match.size:]
+    return " ".join(kept_previous + kept_current)
+
+def count_tokens(text):
+    """
+    Count the tokens in a piece of text with the GPT-4o tokenizer when available
+
+    Args:
+        text (str): Text to measure
+
+    Returns:
+        int: Token count (estimated when tiktoken is not installed)
+    """
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return (len(text) + 3) // 4
+
+# A speaker turn starts a line with a short name followed by a colon, e.g. "Lisa: ..."
+_SPEAKER_TURN = re.compile(r"^[ \t]*[A-Z][\w .'-]{0,40}:\s", re.MULTILINE)
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+def split_turns(text):
+    """
+    Split a transcript into speaker turns, falling back to paragraphs when no
+    speaker labels are present, and to lines (one Whisper segment per line)
+    when there is only one paragraph
+
+    Args:
+        text (str): The transcript
+
+    Returns:
+        list: Turn strings in order
+    """
+    starts = [match.start() for match in _SPEAKER_TURN.finditer(text)]
+    if not starts:
+        paragraphs = [paragraph.strip() for paragraph in re.split(r"\n\s*\n", text) if paragraph.strip()]
+        if len(paragraphs) == 1:
+            return [line.strip() for line in paragraphs[0].splitlines() if line.strip()]
+        return paragraphs
+
+    boundaries = ([0] if starts[0] > 0 else []) + starts + [len(text)]
+    turns = [text[start:end].strip() for start, end in zip(boundaries, boundaries[1:])]
+    return [turn for turn in turns if turn]
+
+def _chunk_pieces(text, max_tokens):
+    """Speaker turns, with turns larger than a whole chunk split into sentences"""
+    pieces = []
+    for turn in split_turns(text):
+        if count_tokens(turn) <= max_tokens:
+            pieces.append(turn)
+        else:
+            pieces.extend(sentence for sentence in _SENTENCE_END.split(turn) if sentence)
+    return pieces
+
+def _pack_pieces(pieces, max_tokens):
+    """Greedily pack consecutive pieces into chunks of at most max_tokens tokens"""
+    chunks = []
+    current = []
+    current_tokens = 0
+    for piece in pieces:
+        piece_tokens = count_tokens(piece)
+        if current and current_tokens + piece_tokens > max_tokens:
+            chunks.append("\n\n".join(current))
+            current = []
+            current_tokens = 0
+        current.append(piece)
+        current_tokens += piece_tokens
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+def chunk_transcript(text, max_tokens):
+    """
+    Pack speaker turns into chunks of at most max_tokens tokens. Turns are
+    never split unless a single turn is larger than a whole chunk, in which
+    case it is split on sentence boundaries.
+
+    Args:
+        text (str): The transcript
+        max_tokens (int): Token budget per chunk
+
+    Returns:
+        list: Chunk strings in order
+    """
+    return _pack_pieces(_chunk_pieces(text, max_tokens), max_tokens)
+
+def anchor_chunks(previous_chunks, text, max_tokens):
+    """
+    Chunk a revised transcript along the chunk boundaries of its previous version
+
+    Plain re-chunking lets one corrected word shift every later boundary.
+    Instead, the revised pieces are diffed against the previous chunks'
+    pieces: a previous chunk whose pieces all survived unchanged is kept
+    verbatim, and only the stretches between kept chunks are packed afresh.
+    Map-step outputs of the kept chunks can then be reused.
+
+    Args:
+        previous_chunks (list): Chunks of the previous version, in order
+        text (str): The revised transcript
+        max_tokens (int): Token budget per chunk
+
+    Returns:
+        list: Chunk strings in order
+    """
+    previous_units = []
+    chunk_ranges = []
+    for chunk in previous_chunks:
+        units = [unit for unit in chunk.split("\n\n") if unit]
+        chunk_ranges.append((len(previous_units), len(previous_units) + len(units), chunk))
+        previous_units.extend(units)
+    units = [unit for piece in _chunk_pieces(text, max_tokens) for unit in piece.split("\n\n") if unit]
+
+    # Map every previous unit inside an unchanged run to its position in the revision
+    new_position = {}
+    matcher = SequenceMatcher(None, previous_units, units, autojunk=False)
+    for block in matcher.get_matching_blocks():
+        for offset in range(block.size):
+            new_position[block.a + offset] = (block.b + offset, block.a)
+
+    chunks = []
+    position = 0
+    for start, end, chunk in chunk_ranges:
+        if start == end or start not in new_position or end - 1 not in new_position:
+            continue
+        new_start, block_start = new_position[start]
+        # Both ends in the same matching run means every unit in between matched too
+        if new_position[end - 1] != (new_start + end - 1 - start, block_start) or new_start < position:
+            continue
+        chunks.extend(_pack_pieces(units[position:new_start], max_tokens))
+        chunks.append(chunk)
+        position = new_start + end - start
+    chunks.extend(_pack_pieces(units[position:], max_tokens))
+    return chunks
+
+# Hesitations that carry no content; "you know" / "I mean" only when set off by commas
+_FILLERS = re.compile(
+    r"(?:,[ \t]*)?(?<!-)\b(?:um+|uh+|erm?|ah+|hmm+)\b(?!-),?"
+    r"|,[ \t]*(?:you know|i mean),",
+    re.IGNORECASE
+)
+# Stutters such as "I I think" or "the the the plan"; repeats never span a line break
+# or run into a speaker label
+_STUTTER = re.compile(r"\b(\w+)((?:[ \t]+\1\b(?!:))+)", re.IGNORECASE)
+# Doubled once, these are stutters; other words can double in real speech ("had had", "that that")
+_STUTTER_WORDS = frozenset((
+    "i", "a", "an", "the", "we", "you", "he", "she", "they", "it", "my", "our", "your",
+    "and", "but", "so", "to", "of", "for", "with", "in", "on"
+))
+_SPEAKER_LABEL = re.compile(r"^[ \t]*([A-Z][\w .'-]{0,40}):\s*", re.DOTALL)
+
+def strip_disfluencies(text):
+    """
+    Remove filler words and stuttered repeats
+
+    Args:
+        text (str): Transcript text
+
+    Returns:
+        tuple: (cleaned text, number of fillers and stutters removed)
+    """
+    text, fillers = _FILLERS.subn("", text)
+    stutters = 0
+
+    def collapse(match):
+        nonlocal stutters
+        # Three or more in a row is always a stutter; a single repeat only for function words
+        if len(match.group(2).split()) >= 2 or match.group(1).lower() in _STUTTER_WORDS:
+            stutters += 1
+            return match.group(1)
+        return match.group(0)
+
+    text = _STUTTER.sub(collapse, text)
+    # Tidy what the removals leave behind: stray spaces and punctuation
+    text = re.sub(r"(?<=\w)[ \t]+([,.!?])", r"\1", text)
+    text = re.sub(r"([.!?])[.,]+", r"\1", text)
+    text = re.sub(r"(^|\n|:[ \t])[,. \t]+", r"\1", text)
+    text = re.sub(r"[ \t]{2,}", " ", text)
+    return text, fillers + stutters
+
+def _sentence_key(sentence):
+    return " ".join(_normalize_word(word) for word in sentence.split())
+
+def _dedupe_sentences(text):
+    """Drop sentences that repeat the one before them (a common Whisper failure mode)"""
+    kept = []
+    removed = 0
+    for sentence in _SENTENCE_END.split(text):
+        if kept and _sentence_key(sentence) == _sentence_key(kept[-1]):
+            removed += 1
+            continue
+        kept.append(sentence)
+    return " ".join(kept), removed
+
+def collapse_turns(turns):
+    """
+    Merge consecutive turns of the same speaker and drop repeated turns and sentences
+
+    Args:
+        turns (list): Speaker turns from split_turns()
+
+    Returns:
+        tuple: (collapsed turns, number of turns and sentences removed)
+    """
+    collapsed = []
+    speakers = []
+    removed = 0
+    for turn in turns:
+        match = _SPEAKER_LABEL.match(turn)
+        speaker = match.group(1) if match else None
+        body = " ".join((turn[match.end():] if match else turn).split())
+        body, repeated = _dedupe_sentences(body)
+        removed += repeated
+        if not body.strip(" ,.!?"):
+            removed += 1
+            continue
+
+        if collapsed and speaker is not None and speaker == speakers[-1]:
+            previous_body = collapsed[-1]
+            if _sentence_key(body) == _sentence_key(previous_body):
+                removed += 1
+                continue
+            # One speaker's consecutive turns become one turn with a single label
+            collapsed[-1], repeated = _dedupe_sentences(f"{previous_body} {body}")
+            removed += 1 + repeated
+            continue
+
+        collapsed.append(body)
+        speakers.append(speaker)
+
+    return [f"{speaker}: {body}" if speaker else body for speaker, body in zip(speakers, collapsed)], removed
+
+def compress_transcript(text, remove_fillers=True, collapse_repeats=True):
+    """
+    Shrink a transcript before it is put into prompts: normalize whitespace,
+    strip disfluencies and collapse repeated turns. The verbatim transcript is
+    left untouched for the results.
+
+    Args:
+        text (str): Verbatim transcript
+        remove_fillers (bool): Strip filler words and stutters
+        collapse_repeats (bool): Merge same-speaker turns and drop repeated turns/sentences
+
+    Returns:
+        tuple: (compressed text, stats dict with original_tokens, compressed_tokens,
+            tokens_saved, fillers_removed and repeats_removed)
+    """
+    original_tokens = count_tokens(text)
+    fillers_removed = 0
+    repeats_removed = 0
+
+    compressed = text or ""
+    if remove_fillers:
+        compressed, fillers_removed = strip_disfluencies(compressed)
+
+    turns = split_turns(compressed)
+    if collapse_repeats:
+        turns, repeats_removed = collapse_turns(turns)
+    else:
+        turns = [" ".join(turn.split()) for turn in turns]
+    compressed = "\n".join(turns)
+
+    compressed_tokens = count_tokens(compressed)
+    return compressed, {
+        "original_tokens": original_tokens,
+        "compressed_tokens": compressed_tokens,
+        "tokens_saved": original_tokens - compressed_tokens,
+        "fillers_removed": fillers_removed,
+        "repeats_removed": repeats_removed
+    }